@@ -5,7 +5,7 @@ import requests
 from tqdm import tqdm
 from dotenv import load_dotenv
 from dataclasses import dataclass
-from typing import List, Dict, Any, Callable, Optional
+from typing import List, Dict, Any, Callable, Optional, AsyncIterator
 from requests.adapters import HTTPAdapter
 from urllib3.util import Retry
 import time
@@ -15,19 +15,49 @@ import asyncio
 import aiohttp
 import inspect
 import aiofiles
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import hashlib
 from tqdm.asyncio import tqdm as async_tqdm
 from concurrent.futures import ThreadPoolExecutor
-from functools import wraps
+from functools import wraps, partial
 import backoff
 from typing import Type, Union, Callable
 import sys
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, contextmanager, aclosing
 import argparse
 import gzip
-import io
 import concurrent.futures
+import math
+import re
+from collections import OrderedDict, deque
+import shutil
+import contextvars
+import itertools
+import threading
+import queue
+import heapq
+import bisect
+import sqlite3
+import fnmatch
+
+from api_snapshot import ApiSnapshot, snapshot_key
+from json_codec import json_codec, orjson
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet output is optional
+    pa = pq = None
+
+try:
+    import zstandard
+except ImportError:  # Cache compression falls back to lz4, then gzip
+    zstandard = None
+
+try:
+    import lz4.frame
+except ImportError:
+    lz4 = None
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -42,89 +72,520 @@ class Config:
     API_KEY_IDENTITY: str = os.getenv('OMEKA_KEY_IDENTITY')
     API_KEY_CREDENTIAL: str = os.getenv('OMEKA_KEY_CREDENTIAL')
     OUTPUT_DIR: str = os.path.join(os.path.dirname(__file__), 'CSV')
+    LOG_DIR: str = os.path.join(os.path.dirname(__file__), 'logs')  # Kept out of the published CSV directory
+
+class MemoryCache:
+    """Bounded in-memory LRU tier with per-entry TTL and byte-size accounting"""
+    def __init__(self, max_items: int = 5000, max_bytes: int = 256 * 1024 * 1024,
+                 ttl: timedelta = timedelta(hours=24)):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (value, size, expires_at)
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        value, size, expires_at = entry
+        if time.monotonic() > expires_at:
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, size: int, ttl: Optional[timedelta] = None):
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        expires_at = time.monotonic() + (ttl or self.ttl).total_seconds()
+        self._entries[key] = (value, size, expires_at)
+        self.current_bytes += size
+        # Evict least recently used entries until both budgets are respected
+        while len(self._entries) > self.max_items or self.current_bytes > self.max_bytes:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    def size_of(self, key: str) -> int:
+        entry = self._entries.get(key)
+        return entry[1] if entry else 0
+
+    def clear(self):
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def _remove(self, key: str):
+        _, size, _ = self._entries.pop(key)
+        self.current_bytes -= size
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': f"{self.hits / lookups:.1%}" if lookups else 'n/a',
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'entries': len(self._entries),
+            'size_mb': f"{self.current_bytes / (1024 * 1024):.1f} / {self.max_bytes / (1024 * 1024):.0f}",
+        }
+
+# Codec name -> (compress, decompress) of cache entry bodies, fastest available first
+CACHE_CODECS: Dict[str, tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {}
+if zstandard is not None:
+    CACHE_CODECS['zstd'] = (zstandard.ZstdCompressor(level=3).compress, zstandard.ZstdDecompressor().decompress)
+if lz4 is not None:
+    CACHE_CODECS['lz4'] = (lz4.frame.compress, lz4.frame.decompress)
+CACHE_CODECS['gzip'] = (partial(gzip.compress, compresslevel=1), gzip.decompress)
+
+class CacheEntry(dict):
+    """Cache entry read from disk whose 'data' is decompressed and decoded on first access."""
+    def __init__(self, header: Dict[str, Any], codec: str, payload: bytes):
+        super().__init__(header)
+        self._codec = codec
+        self._payload = payload
+
+    def __missing__(self, key: str) -> Any:
+        if key != 'data' or self._payload is None:
+            raise KeyError(key)
+        data = json_codec.loads(CACHE_CODECS[self._codec][1](self._payload))
+        self['data'] = data
+        self._payload = None
+        return data
+
+class FileCacheStore:
+    """Disk tier keeping one file per entry, named by the md5 of its key.
+
+    Entries written by older versions as .json.gz files are still read. Directory scans
+    (keys, stats, prune) run in a worker thread.
+    """
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _get_cache_path(self, key: str, legacy: bool = False) -> str:
+        # Create a hash of the key to use as filename
+        hashed_key = hashlib.md5(key.encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"{hashed_key}.json.gz" if legacy else f"{hashed_key}.entry")
+
+    def _find_cache_path(self, key: str) -> Optional[str]:
+        for legacy in (False, True):
+            cache_path = self._get_cache_path(key, legacy)
+            if os.path.exists(cache_path):
+                return cache_path
+        return None
+
+    async def read(self, key: str) -> Optional[tuple[bytes, float, bool]]:
+        """Return the stored bytes of an entry, when it was last written or revalidated and whether it is legacy."""
+        cache_path = self._find_cache_path(key)
+        if cache_path is None:
+            return None
+        async with aiofiles.open(cache_path, 'rb') as f:
+            content = await f.read()
+        # A 304 revalidation refreshes the file mtime instead of rewriting the entry
+        return content, os.path.getmtime(cache_path), cache_path.endswith('.json.gz')
+
+    async def write(self, key: str, content: bytes):
+        cache_path = self._get_cache_path(key)
+        # Concurrent writers of one key each replace the file whole
+        tmp_path = f"{cache_path}.{id(content)}.tmp"
+        async with aiofiles.open(tmp_path, 'wb') as f:
+            await f.write(content)
+        os.replace(tmp_path, cache_path)
+
+    async def keys(self) -> List[str]:
+        """Return the keys of the stored entries; legacy entries do not record theirs."""
+        return await asyncio.to_thread(self._keys)
+
+    def _keys(self) -> List[str]:
+        keys = []
+        for entry in self._files():
+            if entry.name.endswith('.entry'):
+                with open(entry.path, 'rb') as f:
+                    header = json_codec.loads(f.readline())
+                if 'key' in header:
+                    keys.append(header['key'])
+        return keys
+
+    async def touch(self, key: str):
+        cache_path = self._find_cache_path(key)
+        if cache_path is not None:
+            os.utime(cache_path)
+
+    def _files(self) -> List[os.DirEntry]:
+        return [entry for entry in os.scandir(self.cache_dir)
+                if entry.is_file() and entry.name.endswith(('.entry', '.json.gz'))]
+
+    async def stats(self) -> Dict[str, Any]:
+        return await asyncio.to_thread(self._stats)
+
+    def _stats(self) -> Dict[str, Any]:
+        files = self._files()
+        stamps = [entry.stat().st_mtime for entry in files]
+        return {
+            'backend': 'files',
+            'location': self.cache_dir,
+            'entries': len(files),
+            'legacy_entries': sum(entry.name.endswith('.json.gz') for entry in files),
+            'bytes': sum(entry.stat().st_size for entry in files),
+            'oldest': min(stamps, default=None),
+            'newest': max(stamps, default=None),
+        }
+
+    async def prune(self, max_bytes: Optional[int] = None, max_age: Optional[timedelta] = None) -> tuple[int, int]:
+        """Remove entries older than `max_age`, then the least recently written beyond `max_bytes`.
+
+        Returns the number of removed entries and the bytes freed.
+        """
+        return await asyncio.to_thread(self._prune, max_bytes, max_age)
+
+    def _prune(self, max_bytes: Optional[int], max_age: Optional[timedelta]) -> tuple[int, int]:
+        files = sorted(((entry.stat().st_mtime, entry.stat().st_size, entry.path) for entry in self._files()),
+                       reverse=True)
+        cutoff = time.time() - max_age.total_seconds() if max_age is not None else None
+        kept_bytes = removed = freed = 0
+        full = False
+        for stamp, size, path in files:
+            full = full or (max_bytes is not None and kept_bytes + size > max_bytes)
+            if full or (cutoff is not None and stamp < cutoff):
+                os.remove(path)
+                removed += 1
+                freed += size
+            else:
+                kept_bytes += size
+        return removed, freed
+
+    async def close(self):
+        pass
+
+class SQLiteCacheStore:
+    """Disk tier packing every entry into one SQLite database in WAL mode.
+
+    Lookups go through the primary key index and every write is a single atomic
+    statement. Access times are batched in memory and written on close, so that
+    `prune` can drop the least recently used entries. The connection is owned by a
+    single worker thread, which runs every statement off the event loop.
+    """
+    def __init__(self, cache_dir: str):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, 'cache.sqlite3')
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='cache-sqlite')
+        self._accessed = {}  # key -> access time not yet written
+        self._executor.submit(self._connect).result()
+
+    def _connect(self):
+        self.db = sqlite3.connect(self.path, isolation_level=None)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.execute(
+            'CREATE TABLE IF NOT EXISTS entries ('
+            'key TEXT PRIMARY KEY, content BLOB NOT NULL, size INTEGER NOT NULL, '
+            'stored REAL NOT NULL, accessed REAL NOT NULL)'
+        )
+
+    async def _run(self, function: Callable, *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    async def read(self, key: str) -> Optional[tuple[bytes, float, bool]]:
+        return await self._run(self._read, key)
+
+    def _read(self, key: str) -> Optional[tuple[bytes, float, bool]]:
+        row = self.db.execute('SELECT content, stored FROM entries WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        self._accessed[key] = time.time()
+        return row[0], row[1], False
+
+    async def write(self, key: str, content: bytes):
+        now = time.time()
+        await self._run(self.db.execute, 'INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)',
+                        (key, content, len(content), now, now))
+
+    async def keys(self) -> List[str]:
+        return await self._run(lambda: [key for key, in self.db.execute('SELECT key FROM entries')])
+
+    async def touch(self, key: str):
+        await self._run(self.db.execute, 'UPDATE entries SET stored = ? WHERE key = ?', (time.time(), key))
+
+    async def stats(self) -> Dict[str, Any]:
+        return await self._run(self._stats)
+
+    def _stats(self) -> Dict[str, Any]:
+        entries, size, oldest, newest = self.db.execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0), MIN(stored), MAX(stored) FROM entries').fetchone()
+        file_bytes = sum(os.path.getsize(path) for path in (self.path, f"{self.path}-wal") if os.path.exists(path))
+        return {
+            'backend': 'sqlite',
+            'location': self.path,
+            'entries': entries,
+            'bytes': size,
+            'file_bytes': file_bytes,
+            'oldest': oldest,
+            'newest': newest,
+        }
+
+    def _flush_accessed(self):
+        if self._accessed:
+            with self.db:
+                self.db.executemany('UPDATE entries SET accessed = ? WHERE key = ?',
+                                    [(stamp, key) for key, stamp in self._accessed.items()])
+            self._accessed.clear()
+
+    async def prune(self, max_bytes: Optional[int] = None, max_age: Optional[timedelta] = None) -> tuple[int, int]:
+        """Remove entries older than `max_age`, then the least recently used beyond `max_bytes`, and compact.
+
+        Returns the number of removed entries and the bytes freed.
+        """
+        return await self._run(self._prune, max_bytes, max_age)
+
+    def _prune(self, max_bytes: Optional[int], max_age: Optional[timedelta]) -> tuple[int, int]:
+        self._flush_accessed()
+        removed = freed = 0
+        with self.db:
+            if max_age is not None:
+                cutoff = time.time() - max_age.total_seconds()
+                count, size = self.db.execute(
+                    'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries WHERE stored < ?', (cutoff,)).fetchone()
+                self.db.execute('DELETE FROM entries WHERE stored < ?', (cutoff,))
+                removed, freed = removed + count, freed + size
+            total, = self.db.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()
+            if max_bytes is not None and total > max_bytes:
+                # Keep the most recently used entries whose running total fits the cap
+                evicted = self.db.execute(
+                    'SELECT key, size FROM (SELECT key, size, SUM(size) OVER (ORDER BY accessed DESC, key) AS total '
+                    'FROM entries) WHERE total > ?', (max_bytes,)).fetchall()
+                self.db.executemany('DELETE FROM entries WHERE key = ?', [(key,) for key, _ in evicted])
+                removed, freed = removed + len(evicted), freed + sum(size for _, size in evicted)
+        if removed:
+            self.db.execute('VACUUM')
+            self.db.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        return removed, freed
+
+    async def close(self):
+        await self._run(self._close)
+        self._executor.shutdown()
+
+    def _close(self):
+        self._flush_accessed()
+        self.db.close()
+
+CACHE_STORES = {'files': FileCacheStore, 'sqlite': SQLiteCacheStore}
+
+# Cache key pattern -> how long entries stay fresh; the first match wins, other keys use Cache.cache_duration
+CACHE_TTL_POLICY = [
+    ('resource_classes*', timedelta(days=30)),
+    ('resource_templates*', timedelta(days=30)),
+    # Pages of the full item set and media crawls, revalidated before each crawl (OmekaApiClient.revalidate_crawl)
+    ('item_sets:{"page": *', timedelta(days=7)),
+    ('media:{"page": *', timedelta(days=7)),
+    ('item_sets/*', timedelta(days=7)),
+    ('media/*', timedelta(days=7)),
+    ('media_data:*', timedelta(days=7)),
+]
 
 class Cache:
-    def __init__(self, cache_dir: str = None, use_cache: bool = True):
+    """Response cache in memory and on disk.
+
+    A stored entry holds a JSON header line (timestamp, validators, total results, codec)
+    followed by the response body as received, compressed with the first available of
+    CACHE_CODECS. The body is only decoded when the entry is used. The disk tier is one of
+    CACHE_STORES. How long an entry stays fresh depends on its key (CACHE_TTL_POLICY).
+    """
+    def __init__(self, cache_dir: str = None, use_cache: bool = True,
+                 memory_max_items: int = 5000, memory_max_bytes: int = 256 * 1024 * 1024,
+                 backend: str = 'files'):
         self.cache_dir = cache_dir or os.path.join(os.path.dirname(__file__), 'cache')
         self.use_cache = use_cache
-        if self.use_cache:
-            os.makedirs(self.cache_dir, exist_ok=True)
+        self.store = CACHE_STORES[backend](self.cache_dir) if self.use_cache else None
         self.cache_duration = timedelta(hours=24)
-        self.memory_cache = {}  # Add in-memory cache layer
-        self.memory_cache_max_size = 1000  # Maximum number of items to keep in memory
-
-    def _get_cache_path(self, key: str) -> str:
-        # Create a hash of the key to use as filename
-        hashed_key = hashlib.md5(key.encode()).hexdigest()
-        return os.path.join(self.cache_dir, f"{hashed_key}.json.gz")  # Use compression
+        self.ttl_policy = list(CACHE_TTL_POLICY)
+        self.refresh_margin = timedelta(0)  # Treat entries expiring within this margin as expired
+        self.memory_pages = True  # Keep list pages in the memory tier; streaming exports read each page once
+        self.invalidated = []  # (key pattern, time) pairs: matching entries stored before that time are expired
+        self.memory_cache = MemoryCache(memory_max_items, memory_max_bytes, self.cache_duration)
+        self.revalidations = 0  # Conditional requests sent for expired entries
+        self.not_modified = 0  # Revalidations answered with 304 Not Modified
+        self.fresh_hits = 0  # Lookups answered from the cache
+        self.stale_hits = 0  # Lookups that found an expired entry
+        self.misses = 0  # Lookups that found no entry
+        self.codec = next(iter(CACHE_CODECS))
+
+    def _decode(self, key: str, content: bytes, legacy: bool) -> Optional[tuple[Dict[str, Any], int]]:
+        """Return a stored entry and the size of its uncompressed body."""
+        if legacy:
+            try:
+                raw = gzip.decompress(content)
+            except gzip.BadGzipFile:
+                # Fallback for older non-compressed files
+                raw = content
+            return json_codec.loads(raw), len(raw)
+        header_end = content.index(b'\n')
+        header = json_codec.loads(content[:header_end])
+        codec, size = header.pop('codec'), header.pop('size')
+        header.pop('key', None)
+        if codec not in CACHE_CODECS:
+            logger.warning(f"Cache entry for key {key} uses {codec}, which is not installed")
+            return None
+        return CacheEntry(header, codec, content[header_end + 1:]), size
+
+    def _in_memory_tier(self, key: str) -> bool:
+        return self.memory_pages or '"page": ' not in key
+
+    def ttl_for(self, key: str) -> timedelta:
+        for pattern, ttl in self.ttl_policy:
+            if fnmatch.fnmatchcase(key, pattern):
+                return ttl
+        return self.cache_duration
+
+    def is_fresh(self, entry: Dict[str, Any], key: Optional[str] = None) -> bool:
+        cached_time = entry['timestamp']
+        if isinstance(cached_time, str):
+            cached_time = datetime.fromisoformat(cached_time)
+        ttl = self.ttl_for(key) if key is not None else self.cache_duration
+        if key is not None and any(cached_time < cutoff and fnmatch.fnmatchcase(key, pattern)
+                                   for pattern, cutoff in self.invalidated):
+            return False
+        return datetime.now() - cached_time <= ttl - self.refresh_margin
+
+    def invalidate(self, pattern: str):
+        """Expire the entries whose keys match `pattern` for the rest of the run."""
+        self.invalidated.append((pattern, datetime.now()))
 
     async def get(self, key: str) -> Optional[Any]:
+        entry = await self.get_entry(key)
+        if entry is None or not self.is_fresh(entry, key):
+            return None
+        return entry['data']
+
+    async def get_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for a key, including expired entries kept for revalidation."""
         if not self.use_cache:
             return None
         
         # First check memory cache
-        if key in self.memory_cache:
-            cached_item = self.memory_cache[key]
-            cached_time = cached_item['timestamp']
-            if isinstance(cached_time, str):
-                cached_time = datetime.fromisoformat(cached_time)
-            if datetime.now() - cached_time <= self.cache_duration:
-                return cached_item['data']
-            else:
-                # Expired item, remove from memory cache
-                del self.memory_cache[key]
+        cached_entry = self.memory_cache.get(key) if self._in_memory_tier(key) else None
+        if cached_entry is not None:
+            return cached_entry
             
-        cache_path = self._get_cache_path(key)
         try:
-            if not os.path.exists(cache_path):
+            stored = await self.store.read(key)
+            if stored is None:
                 return None
-
-            # Use gzip for compression
-            async with aiofiles.open(cache_path, 'rb') as f:
-                content = await f.read()
-                try:
-                    with gzip.open(io.BytesIO(content), 'rt', encoding='utf-8') as gz_f:
-                        cached_data = json.loads(gz_f.read())
-                except gzip.BadGzipFile:
-                    # Fallback for older non-compressed files
-                    cached_data = json.loads(content.decode('utf-8'))
-
-            # Check if cache has expired
-            cached_time = datetime.fromisoformat(cached_data['timestamp'])
-            if datetime.now() - cached_time > self.cache_duration:
+            content, stored_time, legacy = stored
+            decoded = self._decode(key, content, legacy)
+            if decoded is None:
                 return None
+            cached_data, size = decoded
+
+            # A 304 revalidation refreshes the stored time instead of rewriting the entry
+            revalidated_time = datetime.fromtimestamp(stored_time)
+            if revalidated_time > datetime.fromisoformat(cached_data['timestamp']):
+                cached_data['timestamp'] = revalidated_time.isoformat()
 
             # Add to memory cache
-            if len(self.memory_cache) < self.memory_cache_max_size:
-                self.memory_cache[key] = cached_data
+            if self._in_memory_tier(key):
+                self.memory_cache.set(key, cached_data, size)
                 
-            return cached_data['data']
+            return cached_data
         except Exception as e:
             logger.warning(f"Cache read error for key {key}: {str(e)}")
             return None
 
-    async def set(self, key: str, value: Any) -> None:
+    def record_lookup(self, entry: Optional[Dict[str, Any]], key: Optional[str] = None) -> bool:
+        """Count a lookup result as a fresh hit, stale hit or miss; return whether it is fresh."""
+        if entry is None:
+            self.misses += 1
+            return False
+        if self.is_fresh(entry, key):
+            self.fresh_hits += 1
+            return True
+        self.stale_hits += 1
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.fresh_hits + self.stale_hits + self.misses
+        ratio = lambda count: round(count / lookups, 3) if lookups else 0.0
+        return {
+            'lookups': lookups,
+            'hit_ratio': ratio(self.fresh_hits),
+            'stale_ratio': ratio(self.stale_hits),
+            'miss_ratio': ratio(self.misses),
+            **{f"memory_{name}": value for name, value in self.memory_cache.stats().items()},
+            'revalidations': self.revalidations,
+            'not_modified': self.not_modified,
+        }
+
+    async def close(self, max_bytes: Optional[int] = None):
+        """Shrink the disk tier to `max_bytes` if given, then close it."""
+        if self.store is None:
+            return
+        if max_bytes is not None:
+            removed, freed = await self.store.prune(max_bytes)
+            if removed:
+                logger.info(f"Cache over {max_bytes / 1024 / 1024:.0f} MB: removed {removed} entries ({freed / 1024 / 1024:.1f} MB)")
+        await self.store.close()
+
+    def conditional_headers(self, entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Build the conditional GET headers for an expired entry."""
+        validators = (entry or {}).get('validators') or {}
+        headers = {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+        return headers
+
+    async def mark_revalidated(self, key: str, entry: Dict[str, Any]) -> None:
+        """Extend the lifetime of an entry the server reported as not modified."""
+        entry['timestamp'] = datetime.now().isoformat()
+        if key in self.memory_cache:
+            self.memory_cache.set(key, entry, self.memory_cache.size_of(key))
+        try:
+            await self.store.touch(key)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Cache touch error for key {key}: {str(e)}")
+
+    async def set(self, key: str, value: Any, validators: Optional[Dict[str, str]] = None,
+                  total_results: Optional[int] = None, raw: Optional[bytes] = None) -> None:
+        """Cache `value`; `raw` is its JSON encoding as received, stored without re-encoding."""
         if not self.use_cache:
             return
             
-        cache_path = self._get_cache_path(key)
         try:
             cache_data = {
-                'timestamp': datetime.now().isoformat(),
-                'data': value
+                'timestamp': datetime.now().isoformat()
             }
+            if validators:
+                cache_data['validators'] = validators
+            if total_results is not None:
+                cache_data['total_results'] = total_results
+            if raw is None:
+                raw = json_codec.dumps_retained(value)
+            header = json_codec.dumps_retained({**cache_data, 'codec': self.codec, 'size': len(raw), 'key': key})
+            cache_data['data'] = value
             
             # Add to memory cache
-            if len(self.memory_cache) < self.memory_cache_max_size:
-                self.memory_cache[key] = cache_data
+            if self._in_memory_tier(key):
+                self.memory_cache.set(key, cache_data, len(raw))
             
-            # Use gzip for compression
-            compressed_data = io.BytesIO()
-            with gzip.open(compressed_data, 'wt', encoding='utf-8') as f:
-                f.write(json.dumps(cache_data))
-                
-            async with aiofiles.open(cache_path, 'wb') as f:
-                await f.write(compressed_data.getvalue())
+            await self.store.write(key, b''.join((header, b'\n', CACHE_CODECS[self.codec][0](raw))))
         except Exception as e:
             logger.warning(f"Cache write error for key {key}: {str(e)}")
 
@@ -134,14 +595,14 @@ class ConnectionManager:
         self._clients = {}
         self._lock = asyncio.Lock()
     
-    async def get_client(self, key: str = 'default') -> aiohttp.ClientSession:
+    async def get_client(self, key: str = 'default', limit_per_host: int = 8) -> aiohttp.ClientSession:
         """Get a client session, creating one if it doesn't exist"""
         async with self._lock:
             if key not in self._clients or self._clients[key].closed:
                 # Configure an optimal connection pool
                 conn = aiohttp.TCPConnector(
-                    limit=20,
-                    limit_per_host=8,
+                    limit=max(20, limit_per_host),
+                    limit_per_host=limit_per_host,
                     ssl=False,
                     ttl_dns_cache=300,
                 )
@@ -163,45 +624,164 @@ class ConnectionManager:
 # Global connection manager
 connection_manager = ConnectionManager()
 
+class Span:
+    """One timed operation; `parent_id` is the span that was active where it started."""
+    __slots__ = ('span_id', 'name', 'parent_id', 'args', 'lane', 'start', 'end')
+
+    def __init__(self, span_id: int, name: str, parent_id: Optional[int], args: Dict[str, Any], lane: Any):
+        self.span_id = span_id
+        self.name = name
+        self.parent_id = parent_id
+        self.args = args
+        self.lane = lane  # Key of the asyncio task or thread the span runs in
+        self.start = time.perf_counter()
+        self.end = None
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+# Span active in the current task; asyncio copies it into tasks created under it
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar('current_span', default=None)
+
 class Profiler:
-    """Simple profiler to track performance metrics"""
+    """Simple profiler to track performance metrics.
+
+    Timings are recorded as spans, so concurrent operations of the same name (such as
+    requests to one endpoint) are measured independently. With tracing enabled, finished
+    spans are kept and can be exported in Chrome trace-event format.
+    """
     def __init__(self):
         self.metrics = {}
-        self.start_times = {}
+        self.counter_sources = {}
         self.enabled = False
+        self.tracing = False
+        self.spans: List[Span] = []
+        self._span_ids = itertools.count(1)
+        self._origin = time.perf_counter()
     
     def enable(self):
         self.enabled = True
     
     def disable(self):
         self.enabled = False
+
+    def enable_tracing(self):
+        self.tracing = True
     
-    def start(self, name: str):
-        """Start timing an operation"""
-        if not self.enabled:
+    def register_counters(self, name: str, source: Callable[[], Dict[str, Any]]):
+        """Register a callable whose counters are included in the report"""
+        self.counter_sources[name] = source
+
+    @contextmanager
+    def span(self, name: str, **args: Any):
+        """Time the enclosed block as a child of the currently active span"""
+        if not self.enabled and not self.tracing:
+            yield None
             return
-        self.start_times[name] = time.time()
-    
-    def stop(self, name: str):
-        """Stop timing an operation and record the duration"""
-        if not self.enabled or name not in self.start_times:
+        parent = _current_span.get()
+        span = Span(next(self._span_ids), name, parent.span_id if parent else None, args, self._lane())
+        token = _current_span.set(span)
+        try:
+            yield span
+        finally:
+            span.end = time.perf_counter()
+            _current_span.reset(token)
+            self._record(span)
+
+    def trace(self, name: Optional[str] = None):
+        """Decorator timing every call of a function or coroutine function as a span"""
+        def decorator(func):
+            span_name = name or func.__qualname__
+            if inspect.iscoroutinefunction(func):
+                @wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    with self.span(span_name):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @staticmethod
+    def _lane() -> Any:
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        return ('task', id(task)) if task is not None else ('thread', threading.get_ident())
+
+    def _record(self, span: Span):
+        if self.tracing:
+            self.spans.append(span)
+        if not self.enabled:
             return
-        
-        duration = time.time() - self.start_times[name]
-        if name not in self.metrics:
-            self.metrics[name] = {
+        duration = span.duration
+        if span.name not in self.metrics:
+            self.metrics[span.name] = {
                 'count': 0,
                 'total_time': 0,
                 'min_time': float('inf'),
                 'max_time': 0
             }
         
-        self.metrics[name]['count'] += 1
-        self.metrics[name]['total_time'] += duration
-        self.metrics[name]['min_time'] = min(self.metrics[name]['min_time'], duration)
-        self.metrics[name]['max_time'] = max(self.metrics[name]['max_time'], duration)
-        
-        del self.start_times[name]
+        self.metrics[span.name]['count'] += 1
+        self.metrics[span.name]['total_time'] += duration
+        self.metrics[span.name]['min_time'] = min(self.metrics[span.name]['min_time'], duration)
+        self.metrics[span.name]['max_time'] = max(self.metrics[span.name]['max_time'], duration)
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Finished spans as Chrome trace events (chrome://tracing, Perfetto).
+
+        Spans of one task always nest, so each task is drawn on a track of its own; tasks
+        that do not overlap in time share a track to keep the timeline compact.
+        """
+        lanes = {}
+        for span in self.spans:
+            first, last = lanes.get(span.lane, (span.start, span.end))
+            lanes[span.lane] = (min(first, span.start), max(last, span.end))
+
+        # Greedy interval colouring: reuse the track that became free first
+        tracks = {}
+        free_tracks = []
+        for lane, (first, last) in sorted(lanes.items(), key=lambda x: x[1][0]):
+            if free_tracks and free_tracks[0][0] <= first:
+                _, track = heapq.heappop(free_tracks)
+            else:
+                track = len(free_tracks) + 1
+            tracks[lane] = track
+            heapq.heappush(free_tracks, (last, track))
+
+        pid = os.getpid()
+        events = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': track, 'args': {'name': f"track {track}"}}
+            for track in sorted(set(tracks.values()))
+        ]
+        for span in sorted(self.spans, key=lambda x: x.start):
+            events.append({
+                'name': span.name,
+                'cat': span.name.split('_')[0],
+                'ph': 'X',
+                'ts': round((span.start - self._origin) * 1e6, 1),
+                'dur': round((span.end - span.start) * 1e6, 1),
+                'pid': pid,
+                'tid': tracks[span.lane],
+                'args': {
+                    'span_id': span.span_id,
+                    'parent_id': span.parent_id,
+                    **{key: value for key, value in span.args.items() if value is not None}
+                }
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def save_trace(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f, default=str)
+        logger.info(f"Saved {len(self.spans)} spans to {path}")
     
     def report(self):
         """Generate a performance report"""
@@ -227,11 +807,232 @@ class Profiler:
             )
         
         report.append("-" * 80)
+
+        for source_name, source in self.counter_sources.items():
+            report.append(f"{source_name} counters:")
+            for counter, value in source().items():
+                report.append(f"  {counter:<38} | {value:>10}")
+            report.append("-" * 80)
         return "\n".join(report)
 
 # Global profiler instance
 profiler = Profiler()
 
+# URLs in error messages carry the API credentials in their query string
+URL_QUERY = re.compile(r'(https?://[^\s?\'"]+)\?[^\s\'"]*')
+CREDENTIAL = re.compile(r'(key_identity|key_credential)=[^&\s\'"]*')
+
+def redact(value: Any) -> Any:
+    """Strip URL query strings and API credentials from a logged message or context value."""
+    if isinstance(value, str):
+        return CREDENTIAL.sub(r'\1=<redacted>', URL_QUERY.sub(r'\1', value))
+    if isinstance(value, dict):
+        return {key: redact(item) for key, item in value.items() if key not in ('key_identity', 'key_credential')}
+    return value
+
+class ErrorLog:
+    """JSONL error sink, started afresh by every run.
+
+    `record` only appends to an in-memory buffer; a background task writes the buffer to
+    the log every `flush_interval` seconds, or as soon as it holds `max_buffer` entries, so
+    a run with thousands of failures spends no time rewriting its own error file. Messages
+    and context are redacted so that API credentials never reach the file.
+    """
+    def __init__(self, flush_interval: float = 1.0, max_buffer: int = 500):
+        self.path: Optional[str] = None
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.buffer: List[Dict[str, Any]] = []
+        self.recorded = 0
+        self.written = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flusher: Optional[asyncio.Task] = None
+
+    def open(self, path: str):
+        """Start a new log at `path`, keeping the previous run's as `path.1`; must be called from the running event loop."""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        if os.path.exists(path):
+            os.replace(path, f"{path}.1")
+        self.path = path
+        self._wakeup = asyncio.Event()
+        self._flusher = asyncio.create_task(self._flush_periodically())
+
+    def record(self, stage: str, endpoint: str, error_type: str, message: str, **context: Any):
+        """Buffer one error; `stage` is 'request', 'mapping' or 'run'."""
+        self.recorded += 1
+        if self.path is None:
+            return
+        self.buffer.append({
+            'time': datetime.now().isoformat(timespec='seconds'),
+            'stage': stage,
+            'endpoint': endpoint,
+            'error_type': error_type,
+            'error': redact(message),
+            **redact(context)
+        })
+        if len(self.buffer) >= self.max_buffer:
+            self._wakeup.set()
+
+    async def _flush_periodically(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self):
+        if not self.buffer:
+            return
+        entries, self.buffer = self.buffer, []
+        lines = ''.join(json.dumps(entry, ensure_ascii=False, default=str) + '\n' for entry in entries)
+        try:
+            await asyncio.to_thread(self._append, lines)
+            self.written += len(entries)
+        except OSError as e:
+            logger.error(f"Failed to write {len(entries)} errors to {self.path}: {str(e)}")
+
+    def _append(self, lines: str):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(lines)
+
+    async def close(self):
+        """Stop the background flusher and write the remaining entries."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        if self.path is not None:
+            await self.flush()
+            if self.written:
+                logger.info(f"Logged {self.written} errors to {self.path}")
+
+# Global error log instance
+error_log = ErrorLog()
+
+class Histogram:
+    """Fixed-bucket histogram; percentiles are interpolated within the bucket they fall in."""
+    BOUNDS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000, 60000)
+
+    def __init__(self, bounds: tuple = BOUNDS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # Last bucket holds values above the largest bound
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def percentile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                lower = self.bounds[i - 1] if i > 0 else 0.0
+                upper = self.bounds[i] if i < len(self.bounds) else self.max
+                value = lower + (upper - lower) * (rank - cumulative) / bucket_count
+                return min(max(value, self.min), self.max)
+            cumulative += bucket_count
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'mean': round(self.total / self.count, 3) if self.count else 0.0,
+            'min': round(self.min, 3) if self.count else 0.0,
+            'max': round(self.max, 3),
+            'p50': round(self.percentile(0.50), 3),
+            'p95': round(self.percentile(0.95), 3),
+            'p99': round(self.percentile(0.99), 3),
+            'buckets': {
+                (f"<={bound}" if i < len(self.bounds) else f">{self.bounds[-1]}"): count
+                for i, (bound, count) in enumerate(zip(self.bounds + (None,), self.counts)) if count
+            }
+        }
+
+class Metrics:
+    """Run-wide histograms and counters, each keyed by a metric name and a label such as the endpoint."""
+    def __init__(self):
+        self.histograms: Dict[str, Dict[str, Histogram]] = {}
+        self.counters: Dict[str, Dict[str, float]] = {}
+        self.started = time.time()
+
+    def observe(self, name: str, label: str, value: float):
+        histograms = self.histograms.setdefault(name, {})
+        if label not in histograms:
+            histograms[label] = Histogram()
+        histograms[label].observe(value)
+
+    def increment(self, name: str, label: str, amount: float = 1):
+        counters = self.counters.setdefault(name, {})
+        counters[label] = counters.get(label, 0) + amount
+
+    def latency_summary(self) -> Dict[str, str]:
+        """p50/p95/p99 request latency per endpoint, for the profiler report."""
+        return {
+            f"{endpoint} p50/p95/p99 ms": " / ".join(
+                f"{histogram.percentile(q):.0f}" for q in (0.50, 0.95, 0.99)
+            )
+            for endpoint, histogram in sorted(self.histograms.get('request_latency_ms', {}).items())
+        }
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            'histograms': {
+                name: {label: histogram.to_dict() for label, histogram in sorted(histograms.items())}
+                for name, histograms in self.histograms.items()
+            },
+            'counters': {name: dict(sorted(counters.items())) for name, counters in self.counters.items()},
+        }
+
+# Global metrics instance
+metrics = Metrics()
+
+def summarize_errors(path: str, examples: int = 1) -> str:
+    """Group the entries of an error log by error type and endpoint."""
+    groups = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            group = groups.setdefault((entry.get('error_type', ''), entry.get('endpoint', '')), {
+                'count': 0, 'stages': set(), 'first': entry.get('time', ''), 'last': '', 'examples': []
+            })
+            group['count'] += 1
+            group['stages'].add(entry.get('stage', ''))
+            group['last'] = entry.get('time', '')
+            if len(group['examples']) < examples and entry.get('error') not in group['examples']:
+                group['examples'].append(entry.get('error'))
+
+    if not groups:
+        return f"No errors logged in {path}"
+
+    report = [f"Error summary for {path}:"]
+    report.append("-" * 80)
+    report.append(f"{'Error type':<28} | {'Endpoint':<12} | {'Stage':<10} | {'Count':>8} | {'Last seen':<19}")
+    report.append("-" * 80)
+    for (error_type, endpoint), group in sorted(groups.items(), key=lambda x: x[1]['count'], reverse=True):
+        report.append(
+            f"{error_type[:27]:<28} | {endpoint[:11]:<12} | {','.join(sorted(group['stages']))[:9]:<10} | "
+            f"{group['count']:>8} | {group['last']:<19}"
+        )
+        for example in group['examples']:
+            report.append(f"    e.g. {str(example)[:140]}")
+    report.append("-" * 80)
+    report.append(f"{sum(group['count'] for group in groups.values())} errors in {len(groups)} groups")
+    return "\n".join(report)
+
 class ProcessingError(Exception):
     """Base class for processing errors"""
     pass
@@ -248,6 +1049,10 @@ class MappingError(ProcessingError):
     """Errors related to data mapping"""
     pass
 
+class RetryableAPIError(APIError):
+    """API errors caused by an overloaded server (timeouts, 429, 5xx) that are worth retrying"""
+    pass
+
 @asynccontextmanager
 async def error_context(context: str):
     """Context manager for error handling with proper cleanup"""
@@ -275,7 +1080,9 @@ def async_retry(
                     attempt += 1
                     if attempt == max_tries:
                         logger.error(f"Failed after {max_tries} attempts: {str(e)}")
+                        metrics.increment('retry_give_ups', func.__qualname__)
                         raise
+                    metrics.increment('retries', func.__qualname__)
                     wait_time = delay * (2 ** (attempt - 1))  # Exponential backoff
                     logger.warning(f"Attempt {attempt} failed, retrying in {wait_time}s: {str(e)}")
                     await asyncio.sleep(wait_time)
@@ -283,153 +1090,546 @@ def async_retry(
         return wrapper
     return decorator
 
+class TokenBucket:
+    """Async token bucket shared by every API request path.
+
+    Tokens refill at `rate` per second up to `burst`. Waiters are serialised by a lock,
+    so concurrent callers cannot all observe the same refill and fire together.
+    """
+    def __init__(self, rate: float = 10.0, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.acquired = 0
+        self.waits = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    async def acquire(self):
+        wait_start = time.monotonic()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    break
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+        waited = time.monotonic() - wait_start
+        metrics.observe('rate_limit_wait_ms', 'api', waited * 1000)
+        self.acquired += 1
+        if waited > 0.001:
+            self.waits += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'rate_per_s': self.rate,
+            'burst': self.burst,
+            'acquired': self.acquired,
+            'delayed': self.waits,
+            'total_wait_s': f"{self.total_wait:.2f}",
+            'avg_wait_ms': f"{self.total_wait / self.acquired * 1000:.1f}" if self.acquired else '0.0',
+            'max_wait_ms': f"{self.max_wait * 1000:.1f}",
+        }
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD limit on in-flight API requests.
+
+    The limit grows by roughly one request per round trip while the smoothed latency stays
+    within `latency_tolerance` of the baseline, and is cut by `decrease_factor` on timeouts,
+    5xx and 429 responses (at most once per cooldown, so one burst of failures counts once).
+    """
+    def __init__(self, initial: int = 10, min_limit: int = 1, max_limit: int = 32,
+                 latency_tolerance: float = 1.5, decrease_factor: float = 0.5,
+                 log_interval: float = 30.0):
+        self.limit = float(max(min_limit, min(initial, max_limit)))
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.decrease_factor = decrease_factor
+        self.log_interval = log_interval
+        self.in_flight = 0
+        self._waiters = deque()  # Futures of the requests waiting for a slot, oldest first
+        self.smoothed_latency = None
+        self.baseline_latency = None
+        self._last_decrease = 0.0
+        self._last_log = 0.0
+        self.increases = 0
+        self.decreases = 0
+        self.peak_limit = int(self.limit)
+        self.history = [(time.time(), int(self.limit))]  # (timestamp, limit) on every change
+
+    async def acquire(self):
+        wait_start = time.monotonic()
+        # New requests queue behind waiting ones instead of taking a freed slot first
+        if self._waiters or self.in_flight >= int(self.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.cancelled():
+                    if waiter in self._waiters:
+                        self._waiters.remove(waiter)
+                else:
+                    # The slot was handed over just before the cancellation
+                    await self.release()
+                raise
+        else:
+            self.in_flight += 1
+        metrics.observe('concurrency_wait_ms', 'api', (time.monotonic() - wait_start) * 1000)
+
+    async def release(self):
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self):
+        """Hand the free slots under the limit to the waiting requests, oldest first."""
+        while self.in_flight < int(self.limit) and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def on_success(self, latency: float):
+        """Record a 2xx or 304 response and grow the limit while latency stays flat."""
+        if self.smoothed_latency is None:
+            self.smoothed_latency = self.baseline_latency = latency
+        else:
+            self.smoothed_latency = 0.8 * self.smoothed_latency + 0.2 * latency
+            # The baseline follows improvements immediately and degradations slowly
+            if self.smoothed_latency < self.baseline_latency:
+                self.baseline_latency = self.smoothed_latency
+            else:
+                self.baseline_latency = 0.99 * self.baseline_latency + 0.01 * self.smoothed_latency
+
+        if self.smoothed_latency <= self.baseline_latency * self.latency_tolerance:
+            self._set_limit(min(self.max_limit, self.limit + 1 / self.limit))
+
+    def on_overload(self, reason: str):
+        """Back off after a timeout, 5xx or 429 response."""
+        now = time.monotonic()
+        cooldown = max(1.0, self.smoothed_latency or 0)
+        if now - self._last_decrease < cooldown:
+            return
+        self._last_decrease = now
+        self._set_limit(max(self.min_limit, self.limit * self.decrease_factor))
+        logger.warning(f"Server overloaded ({reason}), reducing concurrency to {int(self.limit)}")
+
+    def _set_limit(self, new_limit: float):
+        old_level, new_level = int(self.limit), int(new_limit)
+        self.limit = new_limit
+        if new_level == old_level:
+            return
+        if new_level > old_level:
+            self.increases += 1
+            self.peak_limit = max(self.peak_limit, new_level)
+        else:
+            self.decreases += 1
+        self.history.append((time.time(), new_level))
+        # Wake up waiters that fit under the raised limit
+        if new_level > old_level:
+            self._wake()
+        now = time.monotonic()
+        if now - self._last_log >= self.log_interval:
+            self._last_log = now
+            latency_ms = (self.smoothed_latency or 0) * 1000
+            logger.info(f"Concurrency level: {new_level} (in flight: {self.in_flight}, latency: {latency_ms:.0f} ms)")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'current_limit': int(self.limit),
+            'peak_limit': self.peak_limit,
+            'increases': self.increases,
+            'decreases': self.decreases,
+            'baseline_latency_ms': f"{(self.baseline_latency or 0) * 1000:.0f}",
+        }
+
+class ItemSetIndex:
+    """Item sets from a single crawl, indexed by id.
+
+    Provides both the public records that are exported and the titles of every item set,
+    which are used to resolve `o:item_set` references.
+    """
+    def __init__(self, item_sets: List[Dict[str, Any]]):
+        self.records: Dict[int, Dict[str, Any]] = {s['o:id']: s for s in item_sets}
+        self.titles: Dict[int, str] = {s['o:id']: s.get('o:title', '') for s in item_sets}
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def record(self, item_set_id: Any) -> Optional[Dict[str, Any]]:
+        """Public item set with this id; private ones are not exported, so None is returned for them."""
+        item_set = self.records.get(_to_int_id(item_set_id))
+        return item_set if item_set is not None and item_set.get('o:is_public') else None
+
+    def title(self, item_set_id: Any) -> str:
+        return self.titles.get(_to_int_id(item_set_id), '')
+
+    def public(self) -> List[Dict[str, Any]]:
+        """Public item sets, the ones that are exported."""
+        return [s for s in self.records.values() if s.get('o:is_public')]
+
+    def changed(self, stamps: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Public item sets whose stamp differs from the one recorded in the manifest."""
+        return [s for s in self.public() if stamps.get(str(s['o:id'])) != get_resource_stamp(s)]
+
+def _to_int_id(value: Any) -> Optional[int]:
+    """Resource id as an int, accepting ids and id strings."""
+    if isinstance(value, int):
+        return value
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
 class OmekaApiClient:
-    def __init__(self, config: Config, use_cache: bool = True):
+    def __init__(self, config: Config, use_cache: bool = True, cache_backend: str = 'files'):
         self.config = config
-        self.cache = Cache(use_cache=use_cache)
-        self.request_semaphore = asyncio.Semaphore(10)  # Limit concurrent requests
-        self.last_request_time = 0
-        self.min_request_interval = 0.1  # 100ms minimum between requests
+        self.cache = Cache(use_cache=use_cache, backend=cache_backend)
+        self.concurrency = AdaptiveConcurrencyLimiter()  # Limit concurrent requests
+        self.page_window = 8  # Maximum in-flight page requests per paginated crawl
+        self.rate_limiter = TokenBucket(rate=10.0, burst=1)  # 100ms average spacing between requests
+        self.media_index = {}  # Public media records from the bulk media fetch, keyed by o:id
+        self.media_index_hits = 0
+        self.media_fallbacks = 0
+        self.item_set_index: Optional[ItemSetIndex] = None
+        self.checkpoint: Optional['CheckpointJournal'] = None  # Journal of fetched pages for --resume
+        self.snapshot: Optional[ApiSnapshot] = None  # Responses recorded for, or replayed from, a snapshot
+        self.pending_requests: Dict[str, asyncio.Future] = {}  # Cache key -> fetch shared by concurrent callers
+        self.coalesced_requests = 0  # Callers served by another caller's in-flight fetch
     
     async def _create_session(self):
-        # Use the global connection manager
-        return await connection_manager.get_client('omeka_api')
-
-    async def _wait_for_rate_limit(self):
-        """Implement simple rate limiting"""
-        current_time = time.time()
-        elapsed = current_time - self.last_request_time
-        if elapsed < self.min_request_interval:
-            await asyncio.sleep(self.min_request_interval - elapsed)
-        self.last_request_time = time.time()
+        # Use the global connection manager, sized for the adaptive concurrency ceiling
+        return await connection_manager.get_client('omeka_api', self.concurrency.max_limit)
 
     async def _close_session(self):
         # We don't need to do anything here as connection_manager will handle cleanup
         pass
 
-    @async_retry(max_tries=5, exceptions=(aiohttp.ClientError, asyncio.TimeoutError))
-    async def _make_request(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    async def _make_request(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                            with_total: bool = False, use_cache: bool = True
+                            ) -> Union[List[Dict[str, Any]], tuple[Any, Optional[int]]]:
+        """Fetch an endpoint, returning `(data, total_results)` instead of `data` when `with_total` is set.
+
+        `total_results` comes from the `Omeka-S-Total-Results` header of list responses.
+        Concurrent calls for the same cache key share a single fetch. Without `use_cache`
+        the response is neither read from nor written to the cache.
+        """
         if params is None:
             params = {}
         
-        cache_key = f"{endpoint}:{json.dumps(params, sort_keys=True)}"
+        cache_key = self.cache_key(endpoint, params)
+        # Uncached callers must not be handed the result of a cached lookup
+        pending_key = cache_key if use_cache else f"{cache_key}:uncached"
+
+        fetch = self.pending_requests.get(pending_key)
+        if fetch is None:
+            fetch = asyncio.ensure_future(self._fetch(endpoint, params, cache_key, use_cache))
+            self.pending_requests[pending_key] = fetch
+            fetch.add_done_callback(partial(self._finish_request, pending_key))
+        else:
+            self.coalesced_requests += 1
+            metrics.increment('coalesced_requests', endpoint.split('/')[0])
+        # A cancelled caller must not cancel the fetch the other callers are waiting on
+        data, total = await asyncio.shield(fetch)
+        return (data, total) if with_total else data
+
+    @staticmethod
+    def cache_key(endpoint: str, params: Dict[str, Any]) -> str:
+        return f"{endpoint}:{json.dumps(params, sort_keys=True)}"
+
+    def _finish_request(self, cache_key: str, fetch: asyncio.Future):
+        self.pending_requests.pop(cache_key, None)
+        if not fetch.cancelled():
+            fetch.exception()  # Retrieved here in case every caller was cancelled
+
+    @async_retry(max_tries=5, exceptions=(aiohttp.ClientError, asyncio.TimeoutError, RetryableAPIError))
+    async def _fetch(self, endpoint: str, params: Dict[str, Any], cache_key: str,
+                     use_cache: bool = True) -> tuple[Any, Optional[int]]:
+        """Return `(data, total_results)` of an endpoint from a replayed snapshot, the journal, the cache or the API."""
+        if self.snapshot is not None and self.snapshot.mode == 'r':
+            replayed = self.snapshot.replay(snapshot_key(endpoint, params))
+            if replayed is None:
+                raise APIError(f"Request to {endpoint} with {params} is not in snapshot {self.snapshot.path}")
+            return json_codec.loads(replayed[0]), replayed[1]
+
+        def result(data, total, raw=None):
+            # List pages are journaled so that an interrupted run can resume from them
+            if self.checkpoint is not None and 'page' in params:
+                self.checkpoint.record_page(cache_key, data, total, raw)
+            if self.snapshot is not None:
+                # Responses served from the cache are recorded too, so that the snapshot is complete
+                self.snapshot.record(snapshot_key(endpoint, params), raw if raw is not None else json_codec.dumps_retained(data), total)
+            return data, total
+
+        if self.checkpoint is not None:
+            journaled = self.checkpoint.get_page(cache_key)
+            if journaled is not None:
+                if self.snapshot is not None:
+                    self.snapshot.record(snapshot_key(endpoint, params), json_codec.dumps_retained(journaled['data']),
+                                         journaled.get('total'))
+                return journaled['data'], journaled.get('total')
         
-        try:
-            # Start profiling
-            profiler.start(f"api_request_{endpoint.split('/')[0]}")
-            
-            # Try cache first
-            cached_data = await self.cache.get(cache_key)
-            if cached_data is not None:
-                profiler.stop(f"api_request_{endpoint.split('/')[0]}")
-                return cached_data
-
-            # Apply rate limiting
-            await self._wait_for_rate_limit()
+        # Concurrent requests each get their own span
+        with profiler.span(f"api_request_{endpoint.split('/')[0]}", endpoint=endpoint, page=params.get('page')):
+            try:
+                # Try cache first
+                cached_entry = await self.cache.get_entry(cache_key) if use_cache else None
+                if use_cache and self.cache.use_cache and self.cache.record_lookup(cached_entry, cache_key):
+                    return result(cached_entry['data'], cached_entry.get('total_results'))
+
+                # Expired entries with validators are revalidated with a conditional GET
+                headers = self.cache.conditional_headers(cached_entry)
+
+                # Apply rate limiting
+                await self.rate_limiter.acquire()
             
-            # Use semaphore to limit concurrent requests
-            async with self.request_semaphore:
-                # Make API request
-                params.update({
-                    'key_identity': self.config.API_KEY_IDENTITY,
-                    'key_credential': self.config.API_KEY_CREDENTIAL
-                })
-                url = f"{self.config.API_URL}/{endpoint}"
+                # Adaptive limit on concurrent requests
+                await self.concurrency.acquire()
+                try:
+                    # Make API request
+                    request_params = {
+                        **params,
+                        'key_identity': self.config.API_KEY_IDENTITY,
+                        'key_credential': self.config.API_KEY_CREDENTIAL
+                    }
+                    url = f"{self.config.API_URL}/{endpoint}"
                 
-                async with error_context(f"API request to {endpoint}"):
-                    session = await self._create_session()
-                    async with session.get(url, params=params) as response:
-                        response.raise_for_status()
-                        data = await response.json()
-                        await self.cache.set(cache_key, data)
-                        profiler.stop(f"api_request_{endpoint.split('/')[0]}")
-                        return data
-
-        except aiohttp.ClientError as e:
-            profiler.stop(f"api_request_{endpoint.split('/')[0]}")
-            raise APIError(f"API request failed: {str(e)}") from e
-        except json.JSONDecodeError as e:
-            profiler.stop(f"api_request_{endpoint.split('/')[0]}")
-            raise APIError(f"Invalid JSON response: {str(e)}") from e
-        except Exception as e:
-            profiler.stop(f"api_request_{endpoint.split('/')[0]}")
-            raise ProcessingError(f"Unexpected error: {str(e)}") from e
-
-    async def fetch_items_page(self, resource_class_id: int, page: int, per_page: int) -> List[Dict[str, Any]]:
-        return await self._make_request('items', {
-            'resource_class_id': resource_class_id,
-            'page': page,
-            'per_page': per_page
-        })
-
-    async def fetch_items(self, resource_class_id: int) -> List[Dict[str, Any]]:
-        items = []
-        per_page = 100
-        
-        # First request to get initial data and potentially total count
-        first_page = await self.fetch_items_page(resource_class_id, 1, per_page)
+                    async with error_context(f"API request to {endpoint}"):
+                        session = await self._create_session()
+                        if headers:
+                            self.cache.revalidations += 1
+                        request_start = time.monotonic()
+                        async with session.get(url, params=request_params, headers=headers) as response:
+                            latency = time.monotonic() - request_start
+                            metrics.observe('request_latency_ms', endpoint.split('/')[0], latency * 1000)
+                            metrics.increment('responses', f"{endpoint.split('/')[0]} {response.status}")
+                            if response.status == 429 or response.status >= 500:
+                                self.concurrency.on_overload(f"HTTP {response.status}")
+                                raise RetryableAPIError(f"API request to {endpoint} failed with HTTP {response.status}")
+                            if response.status < 300 or response.status == 304:
+                                self.concurrency.on_success(latency)
+                            if response.status == 304 and headers:
+                                self.cache.not_modified += 1
+                                await self.cache.mark_revalidated(cache_key, cached_entry)
+                                return result(cached_entry['data'], cached_entry.get('total_results'))
+                            response.raise_for_status()
+                            body = await response.read()
+                            metrics.increment('response_bytes', endpoint.split('/')[0], len(body))
+                            data = json_codec.loads(body)
+                            validators = {
+                                'etag': response.headers.get('ETag'),
+                                'last_modified': response.headers.get('Last-Modified')
+                            }
+                            total_header = response.headers.get('Omeka-S-Total-Results')
+                            total = int(total_header) if total_header and total_header.isdigit() else None
+                            if use_cache:
+                                await self.cache.set(cache_key, data, {k: v for k, v in validators.items() if v}, total, body)
+                            return result(data, total, body)
+                finally:
+                    await self.concurrency.release()
+
+            except RetryableAPIError as e:
+                error_log.record('request', endpoint.split('/')[0], type(e).__name__, str(e), params=params)
+                raise
+            except asyncio.TimeoutError as e:
+                self.concurrency.on_overload("timeout")
+                error_log.record('request', endpoint.split('/')[0], 'TimeoutError', f"API request to {endpoint} timed out",
+                                 params=params)
+                raise RetryableAPIError(f"API request to {endpoint} timed out") from e
+            except aiohttp.ClientError as e:
+                error_log.record('request', endpoint.split('/')[0], type(e).__name__, str(e), params=params)
+                raise APIError(f"API request failed: {redact(str(e))}") from e
+            except json.JSONDecodeError as e:
+                error_log.record('request', endpoint.split('/')[0], type(e).__name__, str(e), params=params)
+                raise APIError(f"Invalid JSON response: {str(e)}") from e
+            except Exception as e:
+                error_log.record('request', endpoint.split('/')[0], type(e).__name__, str(e), params=params)
+                raise ProcessingError(f"Unexpected error: {str(e)}") from e
+
+    async def revalidate_crawl(self, endpoint: str, per_page: int = 100) -> Optional[Dict[str, Any]]:
+        """Check whether the cached pages of a long-lived full crawl still match the endpoint.
+
+        Two one-record requests give the total, the newest modification stamp and the highest
+        id of the endpoint. When they differ from those saved with the cached crawl, its
+        pages are expired for this run. Returns the fingerprint to save once the crawl has
+        completed, or None for crawls that are not long-lived.
+        """
+        if not self.cache.use_cache or \
+                self.cache.ttl_for(self.cache_key(endpoint, {'page': 1, 'per_page': per_page})) <= self.cache.cache_duration:
+            return None
+        (newest, total), last = await asyncio.gather(
+            self._make_request(endpoint, {'sort_by': 'modified', 'sort_order': 'desc', 'per_page': 1},
+                               with_total=True, use_cache=False),
+            self._make_request(endpoint, {'sort_by': 'id', 'sort_order': 'desc', 'per_page': 1}, use_cache=False)
+        )
+        fingerprint = {
+            'total': total,
+            'modified': get_resource_stamp(newest[0]) if newest else None,
+            'last_id': last[0].get('o:id') if last else None,
+        }
+        saved = await self.cache.get_entry(f"{endpoint}:crawl")
+        if saved is None or saved['data'] != fingerprint:
+            if saved is not None:
+                logger.info(f"The {endpoint} endpoint changed since it was cached; refetching its pages")
+            self.cache.invalidate(f"{endpoint}:*")
+        return fingerprint
+
+    async def iter_pages(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                         per_page: int = 100, desc: Optional[str] = None, budget: Optional['PageBudget'] = None,
+                         priority: bool = False) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield the pages of a list endpoint in order.
+
+        Full crawls of long-lived endpoints are revalidated first (see revalidate_crawl).
+        """
+        fingerprint = await self.revalidate_crawl(endpoint, per_page) if not params else None
+        async with aclosing(self._iter_pages(endpoint, params, per_page, desc, budget, priority)) as pages:
+            async for page in pages:
+                yield page
+        if fingerprint is not None:
+            await self.cache.set(f"{endpoint}:crawl", fingerprint)
+
+    async def _iter_pages(self, endpoint: str, params: Optional[Dict[str, Any]], per_page: int,
+                          desc: Optional[str], budget: Optional['PageBudget'],
+                          priority: bool) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield the pages of a list endpoint in order.
+
+        The first response's `Omeka-S-Total-Results` header gives the exact page count; the
+        remaining pages are fetched through a sliding window of `page_window` in-flight
+        requests, refilled as soon as any page completes. Without the header, pages are
+        fetched one at a time until an empty page is returned.
+
+        With a `budget`, every page takes a slot of it before its request is sent; the
+        slot of a yielded page passes to the caller, which releases it once the page is
+        processed.
+        """
+        params = dict(params or {})
+        fetch_page = lambda page: self._make_request(endpoint, {**params, 'page': page, 'per_page': per_page})
+
+        if budget is not None:
+            await budget.acquire(priority)
+        first_page, total = await self._make_request(
+            endpoint, {**params, 'page': 1, 'per_page': per_page}, with_total=True
+        )
         if not first_page:
-            return []
-            
-        items.extend(first_page)
-        
-        # If there might be more pages
-        if len(first_page) == per_page:
-            # For better concurrency, estimate the number of pages and fetch them all at once
-            # We'll estimate conservatively based on the first page size
-            max_concurrent_requests = 5  # Adjust based on API limitations
-            
-            page = 2
+            if budget is not None:
+                budget.release()
+            return
+
+        pbar = tqdm(total=total, desc=desc, unit="item") if desc else None
+        try:
+            if pbar:
+                pbar.update(len(first_page))
+            yield first_page
+
+            page, data = 2, first_page
+            if total is not None:
+                last_page = math.ceil(total / per_page)
+                in_flight = {}  # page -> task
+                completed = {}  # page -> data, waiting to be yielded in order
+                next_page = page
+                try:
+                    while page <= last_page:
+                        # Keep the window full; buffered pages also count against it
+                        while next_page <= last_page and len(in_flight) < self.page_window \
+                                and len(in_flight) + len(completed) < 2 * self.page_window:
+                            if budget is not None and not budget.try_acquire(priority):
+                                # Only wait for the budget while holding no pages, or crawls could block each other
+                                if in_flight or completed:
+                                    break
+                                await budget.acquire(priority)
+                            in_flight[next_page] = asyncio.create_task(fetch_page(next_page))
+                            next_page += 1
+                        if page not in completed:
+                            done, _ = await asyncio.wait(in_flight.values(), return_when=asyncio.FIRST_COMPLETED)
+                            for done_page in [p for p, task in in_flight.items() if task in done]:
+                                completed[done_page] = in_flight.pop(done_page).result()
+                            continue
+                        data = completed.pop(page)
+                        page += 1
+                        if data:
+                            if pbar:
+                                pbar.update(len(data))
+                            yield data
+                        elif budget is not None:
+                            budget.release()
+                finally:
+                    for task in in_flight.values():
+                        task.cancel()
+                # Resources added during the crawl can spill over the expected last page
+                if not data or len(data) < per_page:
+                    return
+
             while True:
-                # Create a batch of concurrent requests
-                batch_tasks = []
-                for i in range(max_concurrent_requests):
-                    current_page = page + i
-                    batch_tasks.append(self.fetch_items_page(resource_class_id, current_page, per_page))
-                
-                # Execute the batch of requests concurrently
-                batch_results = await asyncio.gather(*batch_tasks)
-                
-                # Process the results
-                has_more_pages = False
-                for i, page_items in enumerate(batch_results):
-                    if page_items:
-                        items.extend(page_items)
-                        if len(page_items) == per_page:
-                            has_more_pages = True
-                
-                # Update page counter
-                page += max_concurrent_requests
-                
-                # If no more pages with data, break
-                if not has_more_pages:
+                if budget is not None:
+                    await budget.acquire(priority)
+                data = await fetch_page(page)
+                if not data:
+                    if budget is not None:
+                        budget.release()
                     break
+                if pbar:
+                    pbar.update(len(data))
+                yield data
+                page += 1
+        finally:
+            if pbar:
+                pbar.close()
+
+    async def _paginate(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                        desc: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Fetch every page of a list endpoint into a single list."""
+        results = []
+        async for page_data in self.iter_pages(endpoint, params, desc=desc):
+            results.extend(page_data)
+        return results
+
+    async def fetch_items(self, resource_class_id: int, since: Optional[str] = None,
+                          stamps: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+        if since is not None:
+            items = await self.fetch_changed_since('items', {'resource_class_id': resource_class_id}, since, stamps)
+            logger.info(f"Fetched {len(items)} changed {self.get_item_type_name(resource_class_id)}")
+            return items
+
+        items = await self._paginate('items', {'resource_class_id': resource_class_id})
 
         item_type = self.get_item_type_name(resource_class_id)
         logger.info(f"Fetched {len(items)} {item_type}")
         return items
 
-    async def fetch_all_items(self) -> tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
-        logger.info("Starting to fetch all items...")
+    async def fetch_all_items(self, since: Optional[str] = None, stamps: Optional[Dict[str, str]] = None
+                              ) -> tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Fetch every exported resource, or only those changed after `since` in delta mode."""
+        if since is None:
+            logger.info("Starting to fetch all items...")
+        else:
+            logger.info(f"Starting to fetch items changed since {since}...")
         
         # Fetch different types concurrently
         tasks = [
-            self.fetch_items(49),  # documents
-            self.fetch_items(38),  # audio_visual
-            self.fetch_items(58),  # images
+            self.fetch_items(49, since, stamps),  # documents
+            self.fetch_items(38, since, stamps),  # audio_visual
+            self.fetch_items(58, since, stamps),  # images
         ]
         
         # Add index items tasks
         for resource_class_id in [244, 54, 9, 96, 94]:
-            tasks.append(self.fetch_items(resource_class_id))
+            tasks.append(self.fetch_items(resource_class_id, since, stamps))
             
         # Add other tasks
         tasks.extend([
-            self.fetch_items(60),  # issues
-            self.fetch_items(36),  # newspaper_articles
-            self.fetch_item_sets(),
-            self.fetch_media(),
-            self.fetch_references()
+            self.fetch_items(60, since, stamps),  # issues
+            self.fetch_items(36, since, stamps),  # newspaper_articles
+            self.fetch_item_sets(since, stamps),
+            self.fetch_media(since, stamps),
+            self.fetch_references(since, stamps)
         ])
         
         # Wait for all tasks to complete
@@ -481,55 +1681,40 @@ class OmekaApiClient:
         }
         return item_type_map.get(resource_class_id, f"items (class {resource_class_id})")
 
-    async def fetch_item_sets(self) -> List[Dict[str, Any]]:
-        item_sets = []
-        page = 1
-        per_page = 100
-
-        logger.info("Starting to fetch item sets...")
-
-        with tqdm(desc="Fetching item sets", unit="item") as pbar:
-            while True:
-                data = await self._make_request('item_sets', {
-                    'page': page,
-                    'per_page': per_page
-                })
-                if not data:
-                    break
-                item_sets.extend([item for item in data if item.get('o:is_public')])
-                pbar.update(len(data))
-                page += 1
-
-        logger.info(f"Fetched {len(item_sets)} item sets")
-        return item_sets
-
-    async def fetch_media(self) -> List[Dict[str, Any]]:
-        media = []
-        page = 1
-        per_page = 100
+    async def fetch_item_sets(self, since: Optional[str] = None,
+                              stamps: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+        """Public item sets to export, taken from the item set index."""
+        index = await self.fetch_item_set_index()
+        if since is not None:
+            # The index already holds every item set, so no sorted delta crawl is needed
+            changed = index.changed(stamps or {})
+            logger.info(f"Found {len(changed)} changed item sets")
+            return changed
+        return index.public()
+
+    async def fetch_media(self, since: Optional[str] = None,
+                          stamps: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+        if since is not None:
+            changed = await self.fetch_changed_since('media', {}, since, stamps)
+            logger.info(f"Fetched {len(changed)} changed media items")
+            return [item for item in changed if item.get('o:is_public')]
 
         logger.info("Starting to fetch media...")
 
-        with tqdm(desc="Fetching media", unit="item") as pbar:
-            while True:
-                data = await self._make_request('media', {
-                    'page': page,
-                    'per_page': per_page
-                })
-                if not data:
-                    break
-                media.extend([item for item in data if item.get('o:is_public')])
-                pbar.update(len(data))
-                page += 1
+        media = [
+            item for item in await self._paginate('media', desc="Fetching media")
+            if item.get('o:is_public')
+        ]
 
         logger.info(f"Fetched {len(media)} media items")
         return media
 
-    async def fetch_references(self) -> List[Dict[str, Any]]:
+    async def fetch_references(self, since: Optional[str] = None,
+                               stamps: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
         reference_classes = [35, 43, 88, 40, 82, 178, 52, 77, 305]
         references = []
         # Create tasks for all reference classes
-        tasks = [self.fetch_items(resource_class_id) for resource_class_id in reference_classes]
+        tasks = [self.fetch_items(resource_class_id, since, stamps) for resource_class_id in reference_classes]
         # Wait for all tasks to complete
         results = await asyncio.gather(*tasks)
         # Combine results
@@ -537,34 +1722,67 @@ class OmekaApiClient:
             references.extend(result)
         return references
 
-    async def fetch_item_set_titles(self) -> Dict[int, str]:
-        item_set_titles = {}
-        page = 1
+    async def fetch_changed_since(self, endpoint: str, params: Dict[str, Any], since: str,
+                                  stamps: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+        """Fetch resources created or modified at or after `since`.
+
+        Omeka S sets `o:modified` only on update, so newly created resources are found with a
+        second crawl sorted by `o:created`. Both crawls are sorted newest first and stop at the
+        first page that reaches `since`. Resources whose stamp matches the one recorded in the
+        manifest (`stamps`) were already exported and are skipped. The sorted pages change with
+        every edit, so they always come from the API, never from the cache.
+        """
+        stamps = stamps or {}
+        since_time = parse_omeka_datetime(since)
+        changed = {}
         per_page = 100
 
-        logger.info("Fetching item set titles...")
+        for sort_field in ('modified', 'created'):
+            page = 1
+            while True:
+                data = await self._make_request(endpoint, {
+                    **params,
+                    'sort_by': sort_field,
+                    'sort_order': 'desc',
+                    'page': page,
+                    'per_page': per_page
+                }, use_cache=False)
+                if not data:
+                    break
 
-        while True:
-            data = await self._make_request('item_sets', {
-                'page': page,
-                'per_page': per_page
-            })
-            if not data:
-                break
-            for item_set in data:
-                item_set_id = item_set['o:id']
-                item_set_titles[item_set_id] = item_set.get('o:title', '')
-            page += 1
+                reached_since = False
+                for resource in data:
+                    stamp_value = (resource.get(f'o:{sort_field}') or {}).get('@value')
+                    # Unmodified resources sort last and carry no `o:modified` stamp
+                    if not stamp_value or parse_omeka_datetime(stamp_value) < since_time:
+                        reached_since = True
+                        break
+                    if stamps.get(str(resource['o:id'])) != get_resource_stamp(resource):
+                        changed[resource['o:id']] = resource
+
+                if reached_since or len(data) < per_page:
+                    break
+                page += 1
+
+        return list(changed.values())
 
-        logger.info(f"Fetched {len(item_set_titles)} item set titles")
-        return item_set_titles
+    async def fetch_item_set_index(self) -> ItemSetIndex:
+        """Crawl the item_sets endpoint once; later calls return the same index."""
+        if self.item_set_index is None:
+            logger.info("Starting to fetch item sets...")
+            self.item_set_index = ItemSetIndex(await self._paginate('item_sets', desc="Fetching item sets"))
+            logger.info(
+                f"Fetched {len(self.item_set_index)} item sets "
+                f"({len(self.item_set_index.public())} public)"
+            )
+        return self.item_set_index
 
     async def fetch_media_data(self, media_id: str) -> Dict[str, Any]:
         endpoint = f'media/{media_id}'
         cache_key = f"media_data:{media_id}"
         
-        # Try to get from cache first
-        cached_data = await self.cache.get(cache_key)
+        # Try to get from cache first; a recorded snapshot needs the request itself
+        cached_data = await self.cache.get(cache_key) if self.snapshot is None else None
         if cached_data is not None:
             return cached_data
             
@@ -574,6 +1792,66 @@ class OmekaApiClient:
             await self.cache.set(cache_key, data)
         return data
 
+    def register_media(self, media: List[Dict[str, Any]], compact: bool = False):
+        """Index bulk-fetched media records so mappers can resolve them without a request.
+
+        With `compact`, only the original URL is kept so the index stays small when the
+        media records themselves are not retained (streaming mode).
+        """
+        if compact:
+            self.media_index.update((m['o:id'], {'o:original_url': m.get('o:original_url', '')}) for m in media)
+        else:
+            self.media_index.update((m['o:id'], m) for m in media)
+
+    async def fetch_primary_media(self, items: List[Dict[str, Any]], batch_size: int = 100):
+        """Index the primary media of `items` that are missing from the media index.
+
+        Private media, and in delta runs every unchanged media, are not in the bulk fetch;
+        they are requested `batch_size` ids at a time with one `id[]` query per batch.
+        """
+        media_ids = {item['o:primary_media']['@id'].split('/')[-1] for item in items if item.get('o:primary_media')}
+        missing = sorted({int(media_id) for media_id in media_ids if media_id.isdigit()} - self.media_index.keys())
+        if not missing:
+            return
+        batches = [missing[start:start + batch_size] for start in range(0, len(missing), batch_size)]
+        pages = await asyncio.gather(*(self._make_request('media', {'id[]': batch, 'per_page': batch_size})
+                                       for batch in batches))
+        for page in pages:
+            self.register_media(page)
+        logger.info(f"Fetched {sum(len(page) for page in pages)} of {len(missing)} primary media "
+                    f"missing from the media index ({len(batches)} batched requests of up to {batch_size} ids)")
+
+    async def get_primary_media_url(self, item: Dict[str, Any]) -> str:
+        """Return the original URL of an item's primary media.
+
+        The media index is checked first; only media missing from it (see
+        fetch_primary_media) are requested individually.
+        """
+        primary_media = item.get('o:primary_media')
+        if not primary_media:
+            return ''
+        media_id = primary_media['@id'].split('/')[-1]
+        media_data = self.media_index.get(int(media_id)) if media_id.isdigit() else None
+        if media_data is not None:
+            self.media_index_hits += 1
+        else:
+            self.media_fallbacks += 1
+            media_data = await self.fetch_media_data(media_id)
+        return (media_data or {}).get('o:original_url', '')
+
+    def request_stats(self) -> Dict[str, Any]:
+        return {
+            'in_flight': len(self.pending_requests),
+            'coalesced': self.coalesced_requests,
+        }
+
+    def media_lookup_stats(self) -> Dict[str, Any]:
+        return {
+            'indexed_media': len(self.media_index),
+            'index_hits': self.media_index_hits,
+            'network_fallbacks': self.media_fallbacks,
+        }
+
 class ProgressTracker:
     def __init__(self):
         self.start_time = None
@@ -627,19 +1905,24 @@ class ProgressTracker:
 class DataProcessor:
     def __init__(self, raw_data: List[Dict[str, Any]], item_sets: List[Dict[str, Any]], 
                  media: List[Dict[str, Any]], references: List[Dict[str, Any]], 
-                 item_set_titles: Dict[int, str], api_client: OmekaApiClient, config: Config):
+                 item_set_index: ItemSetIndex, api_client: OmekaApiClient, config: Config):
         self.raw_data = raw_data
         self.item_sets = item_sets
         self.media = media
         self.references = references
-        self.item_set_titles = item_set_titles
+        self.item_set_index = item_set_index
         self.api_client = api_client
         self.config = config
         self.processed_data = None
-        self.batch_size = 50
+        self.batch_size = 50  # Items per batch for async mappers (bounded by API concurrency)
+        self.chunk_size = 500  # Items per executor task for synchronous mappers
+        self.mapper_backend = 'thread'  # 'thread', 'process' or 'inline'
+        self.mapper_workers = os.cpu_count() or 1
+        self._executor = None
+        self.checkpoint: Optional[CheckpointJournal] = None  # Journal of mapped rows for --resume
         # Create mapping caches
         self._media_cache = {m['o:id']: m for m in media}
-        self._item_set_cache = {s['o:id']: s for s in item_sets}
+        self.api_client.register_media(media)
         self.progress = ProgressTracker()
 
     def determine_item_type(self, item: Dict[str, Any]) -> str:
@@ -715,9 +1998,9 @@ class DataProcessor:
 
                     # Process other data types
                     tasks.extend([
-                        tg.create_task(self._process_item_sets(processed_data)),
-                        tg.create_task(self._process_media(processed_data)),
-                        tg.create_task(self._process_references(processed_data))
+                        tg.create_task(self._process_pool('item_sets', self.item_sets, processed_data)),
+                        tg.create_task(self._process_pool('media', self.media, processed_data)),
+                        tg.create_task(self._process_pool('references', self.references, processed_data))
                     ])
 
                 self.progress.status = "Processing completed"
@@ -725,8 +2008,8 @@ class DataProcessor:
                 return processed_data
         except Exception as e:
             logger.critical(f"Critical error in processing pipeline: {str(e)}", exc_info=True)
-            # Attempt to save any processed data before exiting
-            self._save_partial_results()
+            if self.checkpoint is not None:
+                logger.info("Mapped items are checkpointed; run again with --resume to continue")
             raise
         finally:
             await self._cleanup()
@@ -735,82 +2018,112 @@ class DataProcessor:
                           processed_data: Dict[str, List[Dict[str, Any]]]):
         """Process a pool of items with progress tracking."""
         self.progress.status = f"Processing {item_type}"
-        
-        pbar = tqdm(total=len(items), desc=f"Processing {item_type}", unit="items")
-        for i in range(0, len(items), self.batch_size):
-            batch = items[i:i + self.batch_size]
-            batch_results = await self._process_batch(item_type, batch)
-            processed_data[item_type].extend(batch_results)
-            
-            items_processed = len(batch)
-            self.progress.update(items_processed)
-            pbar.update(items_processed)
+
+        # Items mapped by an interrupted run are taken from the checkpoint journal
+        mapped = self.checkpoint.mapped_rows(item_type) if self.checkpoint is not None else {}
+        pending = [item for item in items if str(item.get('o:id')) not in mapped]
+        rows = []
+
+        pbar = tqdm(total=len(items), initial=len(items) - len(pending),
+                    desc=f"Processing {item_type}", unit="items")
+        self.progress.update(len(items) - len(pending))
+        if item_type in SYNC_MAPPERS:
+            # Synchronous mappers: submit every chunk at once so all workers stay busy
+            async def process_chunk(chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+                chunk_results = await self._process_batch(item_type, chunk)
+                if self.checkpoint is not None:
+                    self.checkpoint.record_rows(item_type, chunk_results)
+                self.progress.update(len(chunk))
+                pbar.update(len(chunk))
+                return chunk_results
+
+            chunk_results = await asyncio.gather(*[
+                process_chunk(pending[i:i + self.chunk_size]) for i in range(0, len(pending), self.chunk_size)
+            ])
+            for results in chunk_results:
+                rows.extend(results)
+        else:
+            for i in range(0, len(pending), self.batch_size):
+                batch = pending[i:i + self.batch_size]
+                batch_results = await self._process_batch(item_type, batch)
+                if self.checkpoint is not None:
+                    self.checkpoint.record_rows(item_type, batch_results)
+                rows.extend(batch_results)
+                
+                items_processed = len(batch)
+                self.progress.update(items_processed)
+                pbar.update(items_processed)
         pbar.close()
 
+        if mapped:
+            # Merge journaled and new rows back into the order of the items
+            new_rows = iter(rows)
+            rows = [mapped.get(str(item.get('o:id'))) or next(new_rows) for item in items]
+        processed_data[item_type].extend(rows)
+
+    def _get_executor(self) -> Optional[concurrent.futures.Executor]:
+        """Return the persistent executor of the configured mapper backend."""
+        if self.mapper_backend == 'inline':
+            return None
+        if self._executor is None:
+            if self.mapper_backend == 'process':
+                self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.mapper_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.mapper_workers)
+        return self._executor
+
+    async def _run_sync_mapper(self, item_type: str, batch: List[Dict[str, Any]]) -> List[tuple]:
+        executor = self._get_executor()
+        if executor is None:
+            return map_chunk(item_type, batch)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, map_chunk, item_type, batch)
+
     async def _process_batch(self, item_type: str, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Process a batch of items with error handling."""
-        mapping_functions = {
+        async_mapping_functions = {
             'documents': map_document,
             'issues': map_issue,
-            'newspaper_articles': map_newspaper_article,
-            'audio_visual_documents': map_audio_visual_document,
-            'images': map_image,
-            'index': map_index
+            'newspaper_articles': map_newspaper_article
         }
 
-        mapper = mapping_functions[item_type]
-        is_async = asyncio.iscoroutinefunction(mapper)
         results = []
-        errors = []
-
-        async with error_context(f"Processing batch of {item_type}"):
-            # Optimize: Process batch items concurrently instead of sequentially
-            if is_async:
-                # For async mappers, use gather with tasks
-                tasks = []
-                for item in batch:
-                    tasks.append(asyncio.create_task(mapper(item, self.api_client)))
-                
-                # Process all tasks with proper error handling
-                for i, task in enumerate(asyncio.as_completed(tasks)):
-                    try:
-                        result = await task
-                        results.append(result)
-                    except Exception as e:
-                        item = batch[i]
-                        logger.error(f"Error processing {item_type} item {item.get('o:id', 'unknown')}: {str(e)}")
-                        errors.append({
-                            'item_type': item_type,
-                            'item_id': item.get('o:id', 'unknown'),
-                            'error': str(e)
-                        })
-                        # Add a placeholder result to maintain data integrity
-                        results.append(self._create_error_placeholder(item_type, item))
-            else:
-                # For synchronous mappers, use thread pool
-                with ThreadPoolExecutor(max_workers=min(os.cpu_count() * 2, len(batch))) as executor:
-                    future_to_item = {executor.submit(mapper, item): item for item in batch}
-                    for future in concurrent.futures.as_completed(future_to_item):
-                        item = future_to_item[future]
-                        try:
-                            result = future.result()
-                            results.append(result)
-                        except Exception as e:
-                            logger.error(f"Error processing {item_type} item {item.get('o:id', 'unknown')}: {str(e)}")
-                            errors.append({
-                                'item_type': item_type,
-                                'item_id': item.get('o:id', 'unknown'),
-                                'error': str(e)
-                            })
-                            # Add a placeholder result to maintain data integrity
-                            results.append(self._create_error_placeholder(item_type, item))
-
-            # Log batch processing summary
-            if errors:
-                logger.warning(f"Batch processing completed with {len(errors)} errors")
-                self._save_errors(errors)
-
-            return results
+        errors = 0
+
+        with profiler.span(f"map_{item_type}", items=len(batch)):
+            async with error_context(f"Processing batch of {item_type}"):
+                if item_type in async_mapping_functions:
+                    # Async mappers run concurrently on the event loop; gather keeps input order
+                    mapper = async_mapping_functions[item_type]
+                    outcomes = await asyncio.gather(
+                        *[mapper(item, self.api_client) for item in batch], return_exceptions=True
+                    )
+                    outcomes = [
+                        (False, (type(outcome).__name__, str(outcome))) if isinstance(outcome, Exception)
+                        else (True, outcome)
+                        for outcome in outcomes
+                    ]
+                else:
+                    # Synchronous mappers run as one chunk on the configured backend
+                    outcomes = await self._run_sync_mapper(item_type, batch)
+
+                for item, (ok, value) in zip(batch, outcomes):
+                    if ok:
+                        results.append(value)
+                        continue
+                    error_type, message = value
+                    logger.error(f"Error processing {item_type} item {item.get('o:id', 'unknown')}: {message}")
+                    errors += 1
+                    error_log.record('mapping', ENDPOINT_OF_CATEGORY.get(item_type, 'items'), error_type, message,
+                                     item_type=item_type, item_id=item.get('o:id', 'unknown'))
+                    # Add a placeholder result to maintain data integrity
+                    results.append(self._create_error_placeholder(item_type, item))
+
+                # Log batch processing summary
+                if errors:
+                    logger.warning(f"Batch processing completed with {errors} errors")
+
+                return results
 
     def _create_error_placeholder(self, item_type: str, item: Dict[str, Any]) -> Dict[str, Any]:
         """Create a placeholder for failed items."""
@@ -821,86 +2134,13 @@ class DataProcessor:
         # Add minimum required fields based on item type
         return base_placeholder
 
-    def _save_errors(self, errors: List[Dict[str, Any]]):
-        """Save processing errors to a file for later analysis."""
-        error_file = os.path.join(self.config.OUTPUT_DIR, 'processing_errors.json')
-        try:
-            existing_errors = []
-            if os.path.exists(error_file):
-                with open(error_file, 'r') as f:
-                    existing_errors = json.load(f)
-            
-            existing_errors.extend(errors)
-            
-            with open(error_file, 'w') as f:
-                json.dump(existing_errors, f, indent=2)
-        except Exception as e:
-            logger.error(f"Failed to save errors to file: {str(e)}")
-
-    async def _process_item_sets(self, processed_data: Dict[str, List[Dict[str, Any]]]):
-        """Process item sets with progress tracking."""
-        self.progress.status = "Processing item sets"
-        
-        pbar = tqdm(total=len(self.item_sets), desc="Processing item sets", unit="sets")
-        for i in range(0, len(self.item_sets), self.batch_size):
-            batch = self.item_sets[i:i + self.batch_size]
-            batch_tasks = [
-                asyncio.to_thread(map_item_set, item_set)
-                for item_set in batch
-            ]
-            batch_results = await asyncio.gather(*batch_tasks)
-            processed_data['item_sets'].extend(batch_results)
-            
-            items_processed = len(batch)
-            self.progress.update(items_processed)
-            pbar.update(items_processed)
-        pbar.close()
-
-    async def _process_media(self, processed_data: Dict[str, List[Dict[str, Any]]]):
-        """Process media items with progress tracking."""
-        self.progress.status = "Processing media items"
-        
-        pbar = tqdm(total=len(self.media), desc="Processing media items", unit="items")
-        for i in range(0, len(self.media), self.batch_size):
-            batch = self.media[i:i + self.batch_size]
-            batch_tasks = [
-                asyncio.to_thread(map_media, media_item)
-                for media_item in batch
-            ]
-            batch_results = await asyncio.gather(*batch_tasks)
-            processed_data['media'].extend(batch_results)
-            
-            items_processed = len(batch)
-            self.progress.update(items_processed)
-            pbar.update(items_processed)
-        pbar.close()
-
-    async def _process_references(self, processed_data: Dict[str, List[Dict[str, Any]]]):
-        """Process references with progress tracking."""
-        self.progress.status = "Processing references"
-        
-        pbar = tqdm(total=len(self.references), desc="Processing references", unit="refs")
-        for i in range(0, len(self.references), self.batch_size):
-            batch = self.references[i:i + self.batch_size]
-            batch_tasks = [
-                asyncio.to_thread(map_reference, reference)
-                for reference in batch
-            ]
-            batch_results = await asyncio.gather(*batch_tasks)
-            processed_data['references'].extend(batch_results)
-            
-            items_processed = len(batch)
-            self.progress.update(items_processed)
-            pbar.update(items_processed)
-        pbar.close()
-
     def get_media_data(self, media_id: str) -> Optional[Dict[str, Any]]:
         """Get media data from cache."""
         return self._media_cache.get(media_id)
 
     def get_item_set_data(self, item_set_id: str) -> Optional[Dict[str, Any]]:
-        """Get item set data from cache."""
-        return self._item_set_cache.get(item_set_id)
+        """Get item set data from the item set index."""
+        return self.item_set_index.record(item_set_id)
 
     async def process_item_sets(self):
         """Public method to process item sets."""
@@ -917,7 +2157,7 @@ class DataProcessor:
                 'references': []
             }
         
-        await self._process_item_sets(self.processed_data)
+        await self._process_pool('item_sets', self.item_sets, self.processed_data)
         
         # Process item set titles
         if 'item_sets' in self.processed_data:
@@ -928,32 +2168,220 @@ class DataProcessor:
                     for url in item_set_urls:
                         item_set_id = url.split('/')[-1]
                         if item_set_id.isdigit():
-                            item_set_names.append(self.item_set_titles.get(int(item_set_id), ''))
+                            item_set_names.append(self.item_set_index.title(item_set_id))
                     item['o:item_set'] = '|'.join(filter(None, item_set_names))
 
-    def _save_partial_results(self):
-        """Save any processed data in case of critical failure."""
-        if self.processed_data:
-            partial_results_file = os.path.join(self.config.OUTPUT_DIR, 'partial_results.json')
-            try:
-                with open(partial_results_file, 'w') as f:
-                    json.dump(self.processed_data, f, indent=2)
-                logger.info(f"Saved partial results to {partial_results_file}")
-            except Exception as e:
-                logger.error(f"Failed to save partial results: {str(e)}")
-
     async def _cleanup(self):
         """Cleanup resources in case of errors."""
         try:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
             if hasattr(self, 'api_client'):
                 await self.api_client._close_session()
         except Exception as e:
             logger.error(f"Error during cleanup: {str(e)}")
 
+class ExportManifest:
+    """Run manifest used by delta exports.
+
+    Stores when the last export started and the stamp of every exported resource, so the
+    next run only has to fetch resources changed since then. The start time is used rather
+    than the newest stamp seen: the crawls run concurrently, so a resource edited during a
+    run can carry an older stamp than one another crawl already returned. Deleted resources
+    cannot be detected this way; run a full export to drop them.
+    """
+    CLOCK_SKEW = timedelta(minutes=10)  # Margin for clock differences with the Omeka server
+
+    def __init__(self, path: str):
+        self.path = path
+        self.last_export: Optional[str] = None
+        self.items: Dict[str, str] = {}
+        self.run_started = datetime.now(timezone.utc)
+
+    @property
+    def exists(self) -> bool:
+        return self.last_export is not None
+
+    def load(self) -> 'ExportManifest':
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.last_export = data.get('last_export')
+                self.items = data.get('items', {})
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not read export manifest {self.path}: {str(e)}")
+        return self
+
+    def record(self, resources: List[Dict[str, Any]]):
+        """Record the modification stamps of exported resources."""
+        for resource in resources:
+            stamp = get_resource_stamp(resource)
+            if stamp:
+                self.items[str(resource['o:id'])] = stamp
+
+    def save(self):
+        """Save the manifest of a completed run; the next delta starts from this run's start."""
+        # Resources changed in the margin are fetched again and skipped by their recorded stamps
+        self.last_export = (self.run_started - self.CLOCK_SKEW).isoformat(timespec='seconds')
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'last_export': self.last_export, 'items': self.items}, f)
+        os.replace(tmp_path, self.path)
+        logger.info(f"Saved export manifest with {len(self.items)} resources to {self.path}")
+
+class CheckpointJournal:
+    """Append-only journal of the fetched pages and mapped rows of a run, used by `--resume`.
+
+    Every list page is journaled under its request key as soon as it is fetched, and mapped
+    rows are journaled per batch. A resumed run answers journaled requests from the journal
+    and only maps items that have no journaled row; rows of failed items are not journaled,
+    so those items are retried. The journal is removed once a run completes.
+
+    Entries are encoded and written by a writer thread, which writes everything queued
+    since its last write in one go and flushes once per batch.
+    """
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.path = os.path.join(directory, 'journal.jsonl')
+        self.pages: Dict[str, Dict[str, Any]] = {}
+        self.rows: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._file = None
+        self._queue: queue.Queue = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+
+    def load(self) -> 'CheckpointJournal':
+        if not os.path.exists(self.path):
+            return self
+        with open(self.path, 'rb') as f:
+            for line in f:
+                try:
+                    entry = json_codec.loads(line)
+                except ValueError:
+                    # The last line of a killed run may be incomplete
+                    continue
+                if entry.get('type') == 'page':
+                    self.pages[entry['key']] = {'data': entry['data'], 'total': entry.get('total')}
+                elif entry.get('type') == 'rows':
+                    category_rows = self.rows.setdefault(entry['category'], {})
+                    for row in entry['rows']:
+                        category_rows[str(row.get('o:id'))] = row
+        logger.info(
+            f"Resuming from checkpoint: {len(self.pages)} pages fetched, "
+            f"{sum(len(rows) for rows in self.rows.values())} items mapped"
+        )
+        return self
+
+    def open(self):
+        """Start appending to the journal, discarding it unless it was loaded."""
+        os.makedirs(self.directory, exist_ok=True)
+        mode = 'a' if self.pages or self.rows else 'w'
+        self._file = open(self.path, mode + 'b')
+        self._writer = threading.Thread(target=self._write_batches, name='checkpoint-journal', daemon=True)
+        self._writer.start()
+
+    def get_page(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.pages.get(key)
+
+    def record_page(self, key: str, data: Any, total: Optional[int], raw: Optional[bytes] = None):
+        """Journal a fetched page; `raw` is the response body, written as is when it fits on one line."""
+        if key in self.pages:
+            return
+        self.pages[key] = {'data': data, 'total': total}
+        if self._writer is not None:
+            # Pages are never modified once fetched, so the writer thread encodes them
+            self._queue.put((key, data, total, raw))
+
+    def mapped_rows(self, category: str) -> Dict[str, Dict[str, Any]]:
+        """Journaled rows of a category, keyed by o:id."""
+        return self.rows.get(category, {})
+
+    def record_rows(self, category: str, rows: List[Dict[str, Any]]):
+        rows = [row for row in rows if 'processing_error' not in row]
+        if rows and self._writer is not None:
+            # Encoded here: the rows are kept, and may still change, until the files are written
+            self._queue.put(json_codec.dumps_retained({'type': 'rows', 'category': category, 'rows': rows}))
+
+    @staticmethod
+    def _encode(entry: Union[bytes, tuple]) -> bytes:
+        if isinstance(entry, bytes):
+            return entry
+        key, data, total, raw = entry
+        if raw is not None and b'\n' not in raw:
+            return json_codec.dumps_embedding({'type': 'page', 'key': key, 'total': total}, 'data', raw)
+        return json_codec.dumps_retained({'type': 'page', 'key': key, 'data': data, 'total': total})
+
+    def _write_batches(self):
+        closed = False
+        while not closed:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            closed = batch[-1] is None
+            entries = [entry for entry in batch if entry is not None]
+            try:
+                self._file.write(b''.join(self._encode(entry) + b'\n' for entry in entries))
+                self._file.flush()
+            except (OSError, ValueError, TypeError) as e:
+                logger.error(f"Failed to write {len(entries)} checkpoint entries to {self.path}: {str(e)}")
+
+    def close(self):
+        """Write the queued entries and close the journal."""
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def remove(self):
+        """Delete the journal of a completed run."""
+        self.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+# Columns holding '|'-joined values, stored as list columns in Parquet output
+MULTI_VALUE_FIELDS = {
+    'o:item_set', 'o:media/file', 'dcterms:creator', 'dcterms:publisher', 'dcterms:contributor',
+    'dcterms:subject', 'dcterms:spatial', 'dcterms:type', 'dcterms:relation', 'dcterms:replaces',
+    'dcterms:isReplacedBy', 'bibo:authorList', 'bibo:editorList', 'bibo:reviewOf',
+}
+
+def parquet_schema(fieldnames: List[str]) -> 'pa.Schema':
+    """Build the explicit Parquet schema for a category's columns."""
+    fields = []
+    for name in fieldnames:
+        if name == 'o:id':
+            fields.append(pa.field(name, pa.int64()))
+        elif name in MULTI_VALUE_FIELDS:
+            fields.append(pa.field(name, pa.list_(pa.string())))
+        else:
+            fields.append(pa.field(name, pa.string()))
+    return pa.schema(fields)
+
+def rows_to_arrow(rows: List[Dict[str, Any]], schema: 'pa.Schema') -> 'pa.Table':
+    """Convert mapped rows to an Arrow table, splitting multi-value columns."""
+    columns = {}
+    for field in schema:
+        values = [row.get(field.name, '') for row in rows]
+        if field.name == 'o:id':
+            columns[field.name] = [int(v) if str(v).isdigit() else None for v in values]
+        elif field.name in MULTI_VALUE_FIELDS:
+            columns[field.name] = [str(v).split('|') if v else [] for v in values]
+        else:
+            columns[field.name] = [str(v) if v not in (None, '') else None for v in values]
+    return pa.Table.from_pydict(columns, schema=schema)
+
 class FileGenerator:
-    def __init__(self, processed_data: Dict[str, List[Dict[str, Any]]], output_dir: str):
+    def __init__(self, processed_data: Dict[str, List[Dict[str, Any]]], output_dir: str,
+                 formats: tuple = ('csv',)):
         self.processed_data = processed_data
         self.output_dir = output_dir
+        self.formats = formats
         self.chunk_size = 1000  # Process in chunks to reduce memory pressure
 
     def generate_all_files(self):
@@ -964,12 +2392,114 @@ class FileGenerator:
         
         for item_type, items in self.processed_data.items():
             if items:  # Only generate files for non-empty data
-                filepath = os.path.join(self.output_dir, f"{item_type}.csv")
-                self._write_csv_in_chunks(filepath, items)
-                logger.info(f"Generated {filepath} with {len(items)} items")
+                if 'csv' in self.formats:
+                    filepath = os.path.join(self.output_dir, f"{item_type}.csv")
+                    self._write_csv_in_chunks(filepath, items)
+                    logger.info(f"Generated {filepath} with {len(items)} items")
+                if 'parquet' in self.formats:
+                    filepath = os.path.join(self.output_dir, f"{item_type}.parquet")
+                    self._write_parquet(filepath, items)
+                    logger.info(f"Generated {filepath} with {len(items)} items")
             else:
                 logger.warning(f"No data to generate file for {item_type}")
+
+    @profiler.trace("write_parquet")
+    def _write_parquet(self, filepath: str, items: List[Dict[str, Any]]):
+        """Write a category as Parquet, one row group per chunk"""
+        fieldnames = list(items[0].keys())
+        for item in items:
+            fieldnames.extend(key for key in item if key not in fieldnames)
+        schema = parquet_schema(fieldnames)
+        tmp_path = f"{filepath}.tmp"
+        with pq.ParquetWriter(tmp_path, schema, compression='zstd') as writer:
+            for i in range(0, len(items), self.chunk_size):
+                writer.write_table(rows_to_arrow(items[i:i + self.chunk_size], schema))
+        os.replace(tmp_path, filepath)
     
+    def patch_files(self):
+        """Merge changed rows into the existing export files instead of rewriting them from scratch.
+
+        Rows are matched on `o:id`: an existing row is replaced where it stands, a new row is
+        appended, and a row whose item moved to another category is removed from its old file.
+        The existing rows are read from the first requested format that is on disk, and
+        only the requested formats are written.
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        changed_ids = {str(row['o:id']) for rows in self.processed_data.values() for row in rows}
+        if not changed_ids:
+            logger.info("No changed rows to patch")
+            return
+
+        existing_files = {
+            os.path.splitext(name)[0] for name in os.listdir(self.output_dir)
+            if os.path.splitext(name)[1].lstrip('.') in self.formats
+        }
+        for item_type in sorted(existing_files | set(self.processed_data)):
+            updates = {str(row['o:id']): row for row in self.processed_data.get(item_type, [])}
+            existing = self._read_existing(item_type) if item_type in existing_files else None
+            if existing is None:
+                if updates:
+                    self._write_files(item_type, None, list(updates.values()))
+                    logger.info(f"Generated {item_type} files with {len(updates)} items")
+                continue
+
+            fieldnames, existing_rows = existing
+            rows = []
+            replaced = removed = 0
+            for row in existing_rows:
+                row_id = row.get('o:id')
+                if row_id in updates:
+                    rows.append(updates.pop(row_id))
+                    replaced += 1
+                elif row_id in changed_ids:
+                    removed += 1
+                else:
+                    rows.append(row)
+
+            if not replaced and not removed and not updates:
+                continue
+
+            rows.extend(updates.values())
+            self._write_files(item_type, fieldnames, rows)
+            logger.info(
+                f"Patched {item_type} files: {replaced} updated, {len(updates)} added, {removed} removed"
+            )
+
+    def _read_existing(self, item_type: str) -> Optional[tuple[List[str], List[Dict[str, Any]]]]:
+        """Return the column names and rows, as CSV strings, of a category's existing export."""
+        for export_format in self.formats:
+            filepath = os.path.join(self.output_dir, f"{item_type}.{export_format}")
+            if not os.path.exists(filepath):
+                continue
+            if export_format == 'csv':
+                # Full article texts can exceed the csv module's default 128 KiB field limit
+                csv.field_size_limit(sys.maxsize)
+                with open(filepath, 'r', newline='', encoding='utf-8') as csvfile:
+                    reader = csv.DictReader(csvfile)
+                    return list(reader.fieldnames or []), list(reader)
+            table = pq.read_table(filepath)
+            as_csv = lambda value: '|'.join(value) if isinstance(value, list) else '' if value is None else str(value)
+            return table.column_names, [{name: as_csv(value) for name, value in row.items()}
+                                        for row in table.to_pylist()]
+        return None
+
+    def _write_files(self, item_type: str, fieldnames: Optional[List[str]], rows: List[Dict[str, Any]]):
+        """Replace a category's files in the requested formats with `rows`."""
+        fieldnames = list(fieldnames or [])
+        for row in rows:
+            fieldnames.extend(key for key in row if key not in fieldnames)
+        if 'csv' in self.formats:
+            filepath = os.path.join(self.output_dir, f"{item_type}.csv")
+            tmp_path = f"{filepath}.tmp"
+            with open(tmp_path, 'w', newline='', encoding='utf-8') as csvfile:
+                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+                writer.writeheader()
+                writer.writerows(rows)
+            os.replace(tmp_path, filepath)
+        if 'parquet' in self.formats and rows:
+            self._write_parquet(os.path.join(self.output_dir, f"{item_type}.parquet"), rows)
+
+    @profiler.trace("write_csv")
     def _write_csv_in_chunks(self, filepath: str, items: List[Dict[str, Any]]):
         """Write CSV file in chunks to reduce memory usage"""
         total_items = len(items)
@@ -998,6 +2528,251 @@ class FileGenerator:
                     
                     pbar.update(len(chunk))
 
+def parse_omeka_datetime(value: str) -> datetime:
+    """Parse an Omeka S xsd:dateTime value into an aware datetime."""
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+def get_resource_stamp(item: Dict[str, Any]) -> str:
+    """Return the last modification stamp of a resource, falling back to its creation date."""
+    stamp = item.get('o:modified') or item.get('o:created') or {}
+    return stamp.get('@value', '')
+
+class StreamingFileWriter:
+    """Incremental per-category CSV/Parquet writer for the streaming export.
+
+    Rows are written to `<category>.<ext>.tmp` as they arrive; `close` moves the finished
+    files into place so an interrupted run leaves the previous output files untouched.
+    Parquet rows are buffered into row groups of `chunk_size` rows.
+    """
+    def __init__(self, output_dir: str, formats: tuple = ('csv',), chunk_size: int = 1000):
+        self.output_dir = output_dir
+        self.formats = formats
+        self.chunk_size = chunk_size
+        self._files = {}
+        self._writers = {}
+        self._parquet_writers = {}
+        self._parquet_buffers = {}
+        self.row_counts = {}
+
+    @profiler.trace("write_rows")
+    def write_rows(self, category: str, rows: List[Dict[str, Any]]):
+        if not rows:
+            return
+        if category not in self.row_counts:
+            # Error placeholders carry fewer columns than regular rows
+            header_row = next((row for row in rows if 'processing_error' not in row), rows[0])
+            fieldnames = list(header_row.keys())
+            if 'csv' in self.formats:
+                csvfile = open(self._tmp_path(category, 'csv'), 'w', newline='', encoding='utf-8')
+                writer = csv.DictWriter(csvfile, fieldnames=fieldnames, extrasaction='ignore')
+                writer.writeheader()
+                self._files[category] = csvfile
+                self._writers[category] = writer
+            if 'parquet' in self.formats:
+                self._parquet_writers[category] = pq.ParquetWriter(
+                    self._tmp_path(category, 'parquet'), parquet_schema(fieldnames), compression='zstd'
+                )
+                self._parquet_buffers[category] = []
+            self.row_counts[category] = 0
+        if category in self._writers:
+            self._writers[category].writerows(rows)
+        if category in self._parquet_writers:
+            buffer = self._parquet_buffers[category]
+            buffer.extend(rows)
+            if len(buffer) >= self.chunk_size:
+                self._flush_parquet(category)
+        self.row_counts[category] += len(rows)
+
+    def _tmp_path(self, category: str, extension: str) -> str:
+        return os.path.join(self.output_dir, f"{category}.{extension}.tmp")
+
+    def _flush_parquet(self, category: str):
+        writer = self._parquet_writers[category]
+        buffer = self._parquet_buffers[category]
+        if buffer:
+            writer.write_table(rows_to_arrow(buffer, writer.schema))
+            buffer.clear()
+
+    def close(self):
+        for category in self._parquet_writers:
+            self._flush_parquet(category)
+        self._close_all()
+        for category, count in self.row_counts.items():
+            for extension in self.formats:
+                filepath = os.path.join(self.output_dir, f"{category}.{extension}")
+                os.replace(self._tmp_path(category, extension), filepath)
+                logger.info(f"Generated {filepath} with {count} items")
+        self.row_counts.clear()
+
+    def abort(self):
+        self._close_all()
+        for category in self.row_counts:
+            for extension in self.formats:
+                try:
+                    os.remove(self._tmp_path(category, extension))
+                except OSError:
+                    pass
+        self.row_counts.clear()
+
+    def _close_all(self):
+        for csvfile in self._files.values():
+            csvfile.close()
+        for writer in self._parquet_writers.values():
+            writer.close()
+        self._files.clear()
+        self._writers.clear()
+        self._parquet_writers.clear()
+        self._parquet_buffers.clear()
+
+class PageBudget:
+    """Number of pages a streaming export may hold at once, shared by all of its crawls.
+
+    A page holds a slot from before its request is sent until it has been mapped and
+    written. While `reserved` is set, that many slots are kept for priority crawls.
+    """
+    def __init__(self, pages: int, reserved: int = 0):
+        self.free = pages
+        self.reserved = reserved
+        self._waiters = []
+
+    def try_acquire(self, priority: bool = False) -> bool:
+        if self.free > (0 if priority else self.reserved):
+            self.free -= 1
+            return True
+        return False
+
+    async def acquire(self, priority: bool = False):
+        while not self.try_acquire(priority):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+    def release(self):
+        self.free += 1
+        self._wake()
+
+    def unreserve(self):
+        self.reserved = 0
+        self._wake()
+
+    def _wake(self):
+        # Waiters check the budget again when they resume
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        self._waiters.clear()
+
+class StreamingExporter:
+    """Bounded-memory export: pages flow through a queue into the mappers and CSV writers.
+
+    Producers crawl each endpoint page by page and put `(category, page)` pairs on a
+    queue; consumers map each page and append the rows to the category's CSV. Every
+    fetched page holds a slot of one PageBudget of `queue_depth` pages until it is
+    written, so peak memory is bounded by the queue depth, not by the corpus size, and
+    mapping/writing overlap with network I/O. Item crawls start alongside the media
+    crawl but only hand their pages over once every media is indexed, so that primary
+    media URLs resolve from a compact in-process index; half of the budget is reserved
+    for the media crawl until then.
+    """
+    def __init__(self, api_client: OmekaApiClient, config: Config, item_set_index: ItemSetIndex,
+                 queue_depth: int = 16, workers: int = 4, formats: tuple = ('csv',),
+                 mapper_backend: str = 'thread'):
+        self.api_client = api_client
+        self.config = config
+        self.queue_depth = queue_depth
+        self.workers = workers
+        self.item_set_index = item_set_index
+        self.processor = DataProcessor([], [], [], [], item_set_index, api_client, config)
+        self.processor.mapper_backend = mapper_backend
+        self.writer = StreamingFileWriter(config.OUTPUT_DIR, formats)
+        self.manifest: Optional[ExportManifest] = None
+
+    async def run(self, manifest: Optional[ExportManifest] = None):
+        self.manifest = manifest
+        # The budget bounds the queue; streamed pages are read once and must not pile up in the memory cache
+        self.budget = PageBudget(self.queue_depth, reserved=max(1, self.queue_depth // 2))
+        self.media_indexed = asyncio.Event()
+        self.api_client.cache.memory_pages = False
+        queue = asyncio.Queue()
+        consumers = [asyncio.create_task(self._consume(queue)) for _ in range(self.workers)]
+        try:
+            await asyncio.gather(
+                self._produce(queue, 'media', {}, public_only=True),
+                *[self._produce(queue, 'items', {'resource_class_id': class_id})
+                  for class_id in [49, 38, 58, 244, 54, 9, 96, 94, 60, 36]],
+                *[self._produce(queue, 'items', {'resource_class_id': class_id}, category='references')
+                  for class_id in [35, 43, 88, 40, 82, 178, 52, 77, 305]],
+                self._produce_item_sets(queue)
+            )
+            await queue.join()
+            self.writer.close()
+        except BaseException:
+            self.writer.abort()
+            raise
+        finally:
+            for consumer in consumers:
+                consumer.cancel()
+            await asyncio.gather(*consumers, return_exceptions=True)
+            await self.processor._cleanup()
+            self.api_client.cache.memory_pages = True
+
+    async def _produce(self, queue: asyncio.Queue, endpoint: str, params: Dict[str, Any],
+                       category: Optional[str] = None, public_only: bool = False):
+        media = endpoint == 'media'
+        try:
+            async for page in self.api_client.iter_pages(endpoint, params, budget=self.budget, priority=media):
+                if public_only:
+                    page = [resource for resource in page if resource.get('o:is_public')]
+                if media:
+                    self.api_client.register_media(page, compact=True)
+                else:
+                    await self.media_indexed.wait()
+                if self.manifest is not None:
+                    self.manifest.record(page)
+                queue.put_nowait((category or endpoint, page))
+        finally:
+            if media:
+                self.media_indexed.set()
+                self.budget.unreserve()
+
+    async def _produce_item_sets(self, queue: asyncio.Queue, per_page: int = 100):
+        # Item sets were crawled once for the index; queue its public records in pages
+        item_sets = self.item_set_index.public()
+        for start in range(0, len(item_sets), per_page):
+            page = item_sets[start:start + per_page]
+            await self.budget.acquire()
+            if self.manifest is not None:
+                self.manifest.record(page)
+            queue.put_nowait(('item_sets', page))
+
+    async def _consume(self, queue: asyncio.Queue):
+        while True:
+            category, page = await queue.get()
+            try:
+                if category == 'items':
+                    # Item pages of one resource class map to a single category
+                    pools = {}
+                    for item in page:
+                        pools.setdefault(self.processor.determine_item_type(item), []).append(item)
+                else:
+                    pools = {category: page}
+                for item_type, items in pools.items():
+                    if item_type == 'other':
+                        continue
+                    rows = await self.processor._process_batch(item_type, items)
+                    self.writer.write_rows(item_type, rows)
+            except Exception as e:
+                logger.error(f"Failed to export a page of {category}: {str(e)}", exc_info=True)
+                error_log.record('mapping', ENDPOINT_OF_CATEGORY.get(category, 'items'), type(e).__name__, str(e),
+                                 item_type=category, items=len(page))
+            finally:
+                self.budget.release()
+                queue.task_done()
+
 def get_value(item: Dict[str, Any], field: str, subfield: str = None) -> str:
     """Utility function to safely get a value from an item."""
     if field not in item or item[field] is None:
@@ -1042,128 +2817,384 @@ def join_values(item: Dict[str, Any], field: str, subfield: str) -> str:
     values = [str(val.get('@value', '')) for val in item[field] if isinstance(val, dict) and '@value' in val]
     return '|'.join(filter(None, values))
 
+# Declarative column specifications of every export category.
+# Each column is (name, kind, argument):
+#   value        get_value() of a property
+#   join         join_values() of a property
+#   fr           French values of a property, falling back to get_value()
+#   const        a fixed value
+#   url          public site URL of the resource; the argument is the URL path segment
+#   media_ids    get_media_ids() of the item
+#   primary      primary media URL resolved by the async mappers
+#   class_map    o:resource_class id mapped through the argument dict
+#   titles       '|'-joined display titles of a property
+#   media_item   public site URL of the item a media belongs to
+INDEX_RESOURCE_CLASSES = {
+    244: 'fabio:AuthorityFile',
+    54: 'bibo:Event',
+    9: 'dcterms:Location',
+    96: 'foaf:Organization',
+    94: 'foaf:Person'
+}
+
+REFERENCE_RESOURCE_CLASSES = {
+    35: "bibo:AcademicArticle",
+    43: "bibo:Chapter",
+    88: "bibo:Thesis",
+    40: "bibo:Book",
+    82: "bibo:Report",
+    178: "fabio:BookReview",
+    52: "bibo:EditedBook",
+    77: "bibo:PersonalCommunication",
+    305: "fabio:BlogPost"
+}
+
+FIELD_SPECS = {
+    'documents': [
+        ('o:id', 'value', 'o:id'),
+        ('url', 'url', 'item'),
+        ('dcterms:identifier', 'value', 'dcterms:identifier'),
+        ('o:resource_class', 'const', 'bibo:Document'),
+        ('o:item_set', 'join', 'o:item_set'),
+        ('o:media/file', 'media_ids', None),
+        ('o:primary_media', 'primary', None),
+        ('dcterms:title', 'value', 'dcterms:title'),
+        ('dcterms:creator', 'join', 'dcterms:creator'),
+        ('dcterms:date', 'value', 'dcterms:date'),
+        ('dcterms:abstract', 'value', 'dcterms:abstract'),
+        ('bibo:numPages', 'value', 'bibo:numPages'),
+        ('dcterms:subject', 'join', 'dcterms:subject'),
+        ('dcterms:spatial', 'join', 'dcterms:spatial'),
+        ('dcterms:rights', 'value', 'dcterms:rights'),
+        ('dcterms:rightsHolder', 'value', 'dcterms:rightsHolder'),
+        ('dcterms:language', 'value', 'dcterms:language'),
+        ('dcterms:source', 'value', 'dcterms:source'),
+        ('dcterms:contributor', 'join', 'dcterms:contributor'),
+        ('bibo:content', 'value', 'bibo:content'),
+    ],
+    'audio_visual_documents': [
+        ('o:id', 'value', 'o:id'),
+        ('url', 'url', 'item'),
+        ('dcterms:identifier', 'value', 'dcterms:identifier'),
+        ('o:resource_class', 'const', 'bibo:AudioVisualDocument'),
+        ('o:item_set', 'join', 'o:item_set'),
+        ('o:media/file', 'media_ids', None),
+        ('dcterms:title', 'value', 'dcterms:title'),
+        ('dcterms:creator', 'join', 'dcterms:creator'),
+        ('dcterms:publisher', 'join', 'dcterms:publisher'),
+        ('dcterms:description', 'value', 'dcterms:description'),
+        ('dcterms:date', 'value', 'dcterms:date'),
+        ('bibo:volume', 'value', 'bibo:volume'),
+        ('bibo:issue', 'value', 'bibo:issue'),
+        ('dcterms:isPartOf', 'value', 'dcterms:isPartOf'),
+        ('dcterms:extent', 'value', 'dcterms:extent'),
+        ('dcterms:medium', 'value', 'dcterms:medium'),
+        ('dcterms:subject', 'join', 'dcterms:subject'),
+        ('dcterms:spatial', 'join', 'dcterms:spatial'),
+        ('dcterms:rights', 'value', 'dcterms:rights'),
+        ('dcterms:rightsHolder', 'value', 'dcterms:rightsHolder'),
+        ('dcterms:language', 'value', 'dcterms:language'),
+        ('dcterms:source', 'value', 'dcterms:source'),
+        ('dcterms:contributor', 'join', 'dcterms:contributor'),
+        ('bibo:content', 'value', 'bibo:content'),
+    ],
+    'images': [
+        ('o:id', 'value', 'o:id'),
+        ('url', 'url', 'item'),
+        ('dcterms:identifier', 'value', 'dcterms:identifier'),
+        ('o:resource_class', 'const', 'bibo:Image'),
+        ('o:item_set', 'join', 'o:item_set'),
+        ('o:media/file', 'media_ids', None),
+        ('dcterms:title', 'value', 'dcterms:title'),
+        ('dcterms:creator', 'join', 'dcterms:creator'),
+        ('dcterms:date', 'value', 'dcterms:date'),
+        ('dcterms:description', 'value', 'dcterms:description'),
+        ('dcterms:subject', 'join', 'dcterms:subject'),
+        ('dcterms:rights', 'value', 'dcterms:rights'),
+        ('dcterms:source', 'value', 'dcterms:source'),
+        ('dcterms:spatial', 'join', 'dcterms:spatial'),
+        ('coordinates', 'value', 'curation:coordinates'),
+    ],
+    'index': [
+        ('o:id', 'value', 'o:id'),
+        ('url', 'url', 'item'),
+        ('dcterms:identifier', 'value', 'dcterms:identifier'),
+        ('o:resource_class', 'class_map', INDEX_RESOURCE_CLASSES),
+        ('o:item_set', 'join', 'o:item_set'),
+        ('o:media/file', 'media_ids', None),
+        ('dcterms:title', 'fr', 'dcterms:title'),
+        ('dcterms:alternative', 'fr', 'dcterms:alternative'),
+        ('dcterms:created', 'value', 'dcterms:created'),
+        ('dcterms:date', 'value', 'dcterms:date'),
+        ('dcterms:description', 'value', 'dcterms:description'),
+        ('dcterms:relation', 'join', 'dcterms:relation'),
+        ('dcterms:isReplacedBy', 'join', 'dcterms:isReplacedBy'),
+        ('dcterms:replaces', 'join', 'dcterms:replaces'),
+        ('dcterms:isPartOf', 'value', 'dcterms:isPartOf'),
+        ('dcterms:hasPart', 'value', 'dcterms:hasPart'),
+        ('dcterms:spatial', 'join', 'dcterms:spatial'),
+        ('dcterms:type', 'titles', 'dcterms:type'),
+        ('foaf:firstName', 'value', 'foaf:firstName'),
+        ('foaf:lastName', 'value', 'foaf:lastName'),
+        ('foaf:gender', 'value', 'foaf:gender'),
+        ('foaf:birthday', 'value', 'foaf:birthday'),
+        ('coordinates', 'value', 'curation:coordinates'),
+    ],
+    'issues': [
+        # Basic identification fields
+        ('o:id', 'value', 'o:id'),
+        ('url', 'url', 'item'),
+        ('dcterms:identifier', 'value', 'dcterms:identifier'),
+        ('o:resource_class', 'const', 'bibo:Issue'),
+        # Collection and media information
+        ('o:item_set', 'join', 'o:item_set'),
+        ('o:media/file', 'media_ids', None),
+        ('o:primary_media', 'primary', None),
+        # Core bibliographic metadata
+        ('dcterms:title', 'value', 'dcterms:title'),
+        ('dcterms:creator', 'join', 'dcterms:creator'),
+        ('dcterms:publisher', 'join', 'dcterms:publisher'),
+        ('dcterms:date', 'value', 'dcterms:date'),
+        ('dcterms:type', 'value', 'dcterms:type'),
+        # Issue-specific metadata
+        ('bibo:issue', 'value', 'bibo:issue'),
+        ('dcterms:abstract', 'value', 'dcterms:abstract'),
+        ('bibo:numPages', 'value', 'bibo:numPages'),
+        # Subject and geographic metadata
+        ('dcterms:subject', 'join', 'dcterms:subject'),
+        ('dcterms:spatial', 'join', 'dcterms:spatial'),
+        # Rights and attribution
+        ('dcterms:rights', 'value', 'dcterms:rights'),
+        ('dcterms:rightsHolder', 'value', 'dcterms:rightsHolder'),
+        # Additional metadata
+        ('dcterms:language', 'value', 'dcterms:language'),
+        ('dcterms:source', 'value', 'dcterms:source'),
+        ('dcterms:contributor', 'join', 'dcterms:contributor'),
+        # External references
+        ('fabio:hasURL', 'value', 'fabio:hasURL'),
+        ('bibo:content', 'value', 'bibo:content'),
+    ],
+    'newspaper_articles': [
+        ('o:id', 'value', 'o:id'),
+        ('url', 'url', 'item'),
+        ('dcterms:identifier', 'value', 'dcterms:identifier'),
+        ('o:resource_class', 'const', 'bibo:Article'),
+        ('o:item_set', 'join', 'o:item_set'),
+        ('o:media/file', 'media_ids', None),
+        ('o:primary_media', 'primary', None),
+        ('dcterms:title', 'value', 'dcterms:title'),
+        ('dcterms:creator', 'join', 'dcterms:creator'),
+        ('dcterms:publisher', 'join', 'dcterms:publisher'),
+        ('dcterms:date', 'value', 'dcterms:date'),
+        ('dcterms:type', 'value', 'dcterms:type'),
+        ('dcterms:abstract', 'value', 'dcterms:abstract'),
+        ('bibo:pages', 'value', 'bibo:pages'),
+        ('bibo:numPages', 'value', 'bibo:numPages'),
+        ('dcterms:subject', 'join', 'dcterms:subject'),
+        ('dcterms:spatial', 'join', 'dcterms:spatial'),
+        ('dcterms:rights', 'value', 'dcterms:rights'),
+        ('dcterms:rightsHolder', 'value', 'dcterms:rightsHolder'),
+        ('dcterms:language', 'value', 'dcterms:language'),
+        ('dcterms:source', 'value', 'dcterms:source'),
+        ('dcterms:contributor', 'join', 'dcterms:contributor'),
+        ('fabio:hasURL', 'value', 'fabio:hasURL'),
+        ('bibo:content', 'value', 'bibo:content'),
+    ],
+    'item_sets': [
+        ('o:id', 'value', 'o:id'),
+        ('url', 'url', 'item-set'),
+        ('dcterms:identifier', 'value', 'dcterms:identifier'),
+        ('o:resource_class', 'const', 'o:ItemSet'),
+        ('o:title', 'value', 'o:title'),
+        ('dcterms:description', 'fr', 'dcterms:description'),
+        ('dcterms:creator', 'join', 'dcterms:creator'),
+        ('dcterms:date', 'value', 'dcterms:date'),
+        ('dcterms:replaces', 'join', 'dcterms:replaces'),
+        ('dcterms:isReplacedBy', 'join', 'dcterms:isReplacedBy'),
+        ('dcterms:spatial', 'join', 'dcterms:spatial'),
+        ('dcterms:language', 'value', 'dcterms:language'),
+        ('dcterms:rights', 'value', 'dcterms:rights'),
+        ('dcterms:rightsHolder', 'value', 'dcterms:rightsHolder'),
+        ('dcterms:source', 'value', 'dcterms:source'),
+        ('dcterms:contributor', 'join', 'dcterms:contributor'),
+    ],
+    'media': [
+        ('o:id', 'value', 'o:id'),
+        ('url', 'url', 'media'),
+        ('o:resource_class', 'const', 'o:Media'),
+        ('o:media_type', 'value', 'o:media_type'),
+        ('o:item', 'media_item', None),
+        ('o:original_url', 'value', 'o:original_url'),
+    ],
+    'references': [
+        ('o:id', 'value', 'o:id'),
+        ('url', 'url', 'item'),
+        ('dcterms:identifier', 'value', 'dcterms:identifier'),
+        ('o:resource_class', 'class_map', REFERENCE_RESOURCE_CLASSES),
+        ('o:item_set', 'join', 'o:item_set'),
+        ('o:media/file', 'media_ids', None),
+        ('dcterms:title', 'value', 'dcterms:title'),
+        ('bibo:authorList', 'join', 'bibo:authorList'),
+        ('bibo:editorList', 'join', 'bibo:editorList'),
+        ('bibo:reviewOf', 'join', 'bibo:reviewOf'),
+        ('dcterms:publisher', 'join', 'dcterms:publisher'),
+        ('dcterms:date', 'value', 'dcterms:date'),
+        ('dcterms:type', 'value', 'dcterms:type'),
+        ('dcterms:alternative', 'value', 'dcterms:alternative'),
+        ('bibo:chapter', 'value', 'bibo:chapter'),
+        ('bibo:volume', 'value', 'bibo:volume'),
+        ('bibo:issue', 'value', 'bibo:issue'),
+        ('dcterms:abstract', 'value', 'dcterms:abstract'),
+        ('bibo:edition', 'value', 'bibo:edition'),
+        ('bibo:numPages', 'value', 'bibo:numPages'),
+        ('bibo:pageStart', 'value', 'bibo:pageStart'),
+        ('bibo:pageEnd', 'value', 'bibo:pageEnd'),
+        ('dcterms:extent', 'value', 'dcterms:extent'),
+        ('dcterms:isPartOf', 'value', 'dcterms:isPartOf'),
+        ('dcterms:provenance', 'value', 'dcterms:provenance'),
+        ('dcterms:subject', 'join', 'dcterms:subject'),
+        ('dcterms:spatial', 'join', 'dcterms:spatial'),
+        ('dcterms:language', 'value', 'dcterms:language'),
+        ('bibo:doi', 'value', 'bibo:doi'),
+        ('fabio:hasURL', 'value', 'fabio:hasURL'),
+        ('bibo:content', 'value', 'bibo:content'),
+    ],
+}
+
+SITE_URL = "https://islam.zmo.de/s/afrique_ouest"
+
+def get_media_ids(item: Dict[str, Any]) -> str:
+    if 'o:media' in item and isinstance(item['o:media'], list):
+        return '|'.join([str(media.get('o:id', '')) for media in item['o:media']])
+    return ''
+
+# Specialised extractors used by the compiled row builders. Each one reproduces a single
+# branch of get_value/join_values so the special cases are resolved once, at import.
+def _extract_value(value: Any) -> str:
+    """get_value() for a property without special handling."""
+    if value is None:
+        return ''
+    if isinstance(value, list):
+        display_titles = []
+        values = []
+        for v in value:
+            if 'display_title' in v:
+                display_titles.append(str(v.get('display_title', '')))
+            elif not display_titles and '@value' in v:
+                values.append(str(v.get('@value', '')))
+        return '|'.join(filter(None, display_titles or values))
+    return str(value)
+
+def _extract_label(value: Any) -> str:
+    """get_value() for dcterms:rights and bibo:doi."""
+    if value and isinstance(value, list):
+        return str(value[0].get('o:label', '') or value[0].get('@value', ''))
+    return ''
+
+def _extract_link(value: Any) -> str:
+    """get_value() for fabio:hasURL."""
+    if value and isinstance(value, list):
+        return str(value[0].get('@id', ''))
+    return ''
+
+def _extract_joined(values: List[Any]) -> str:
+    """join_values() for a property other than o:item_set."""
+    display_titles = []
+    literals = []
+    for val in values:
+        if isinstance(val, dict):
+            if 'display_title' in val:
+                display_titles.append(str(val['display_title']))
+            elif not display_titles and '@value' in val:
+                literals.append(str(val['@value']))
+    return '|'.join(filter(None, display_titles or literals))
+
+def _extract_item_set_ids(values: List[Any]) -> str:
+    """join_values() for o:item_set."""
+    return '|'.join([str(val.get('@id', '')) for val in values])
+
+def _extract_french(values: List[Any]) -> str:
+    """French values of a property, falling back to get_value()."""
+    fr_values = [v['@value'] for v in values if v.get('@language') == 'fr']
+    return '|'.join(fr_values) if fr_values else _extract_value(values)
+
+def _extract_titles(values: List[Any]) -> str:
+    display_titles = [t.get('display_title', '') for t in values if t.get('display_title')]
+    return '|'.join(filter(None, display_titles))
+
+def _extract_media_item_url(item: Dict[str, Any]) -> str:
+    # Get the item ID, handling the case where it might be nested
+    item_id = item.get('o:item', {}).get('o:id', '')
+    if not item_id:
+        item_id = get_value(item, 'o:item')
+    # Construct the item URL only if we have a valid item ID
+    return f"{SITE_URL}/item/{item_id}" if item_id else ""
+
+def _column_extractor(kind: str, argument: Any) -> Callable[[Dict[str, Any], str, str], str]:
+    """Return the function computing one column from `(item, o:id, primary media URL)`."""
+    if kind == 'value':
+        if argument == 'o:id':
+            return lambda item, item_id, primary_media: item_id
+        extractor = {
+            'dcterms:rights': _extract_label,
+            'bibo:doi': _extract_label,
+            'fabio:hasURL': _extract_link,
+        }.get(argument, _extract_value)
+
+        def extract_value(item, item_id, primary_media):
+            value = item.get(argument)
+            return extractor(value) if value is not None else ''
+        return extract_value
+    if kind == 'join':
+        extractor = _extract_item_set_ids if argument == 'o:item_set' else _extract_joined
+        return lambda item, item_id, primary_media: extractor(item[argument]) if argument in item else ''
+    if kind == 'fr':
+        return lambda item, item_id, primary_media: _extract_french(item.get(argument, []))
+    if kind == 'const':
+        return lambda item, item_id, primary_media: argument
+    if kind == 'url':
+        prefix = f"{SITE_URL}/{argument}/"
+        return lambda item, item_id, primary_media: prefix + item_id
+    if kind == 'media_ids':
+        return lambda item, item_id, primary_media: get_media_ids(item)
+    if kind == 'primary':
+        return lambda item, item_id, primary_media: primary_media
+    if kind == 'class_map':
+        return lambda item, item_id, primary_media: argument.get(item.get('o:resource_class', {}).get('o:id'), '')
+    if kind == 'titles':
+        return lambda item, item_id, primary_media: _extract_titles(item.get(argument, []))
+    if kind == 'media_item':
+        return lambda item, item_id, primary_media: _extract_media_item_url(item)
+    raise ValueError(f"Unknown column kind: {kind}")
+
+def compile_row_builder(specs: List[tuple]) -> Callable[..., Dict[str, Any]]:
+    """Compile a column specification into a single function building one row.
+
+    Each column is resolved once into a `(name, extractor)` pair, so building a row
+    computes `o:id` once and calls only the extractor each column needs.
+    """
+    columns = tuple((column, _column_extractor(kind, argument)) for column, kind, argument in specs)
+
+    def build_row(item: Dict[str, Any], primary_media: str = '') -> Dict[str, Any]:
+        item_id = _extract_value(item.get('o:id'))
+        return {column: extract(item, item_id, primary_media) for column, extract in columns}
+    build_row.columns = columns
+    return build_row
+
+ROW_BUILDERS = {category: compile_row_builder(specs) for category, specs in FIELD_SPECS.items()}
+
 async def map_document(item: Dict[str, Any], api_client: OmekaApiClient) -> Dict[str, Any]:
-    primary_media_url = ''
-    if 'o:primary_media' in item and item['o:primary_media']:
-        media_id = item['o:primary_media']['@id'].split('/')[-1]
-        media_data = await api_client.fetch_media_data(media_id)
-        primary_media_url = media_data.get('o:original_url', '')
-
-    return {
-        'o:id': get_value(item, 'o:id'),
-        'url': f"https://islam.zmo.de/s/afrique_ouest/item/{get_value(item, 'o:id')}",
-        'dcterms:identifier': get_value(item, 'dcterms:identifier'),
-        'o:resource_class': 'bibo:Document',
-        'o:item_set': join_values(item, 'o:item_set', ''),
-        'o:media/file': get_media_ids(item),
-        'o:primary_media': primary_media_url,
-        'dcterms:title': get_value(item, 'dcterms:title'),
-        'dcterms:creator': join_values(item, 'dcterms:creator', ''),
-        'dcterms:date': get_value(item, 'dcterms:date'),
-        'dcterms:abstract': get_value(item, 'dcterms:abstract'),
-        'bibo:numPages': get_value(item, 'bibo:numPages'),
-        'dcterms:subject': join_values(item, 'dcterms:subject', ''),
-        'dcterms:spatial': join_values(item, 'dcterms:spatial', ''),
-        'dcterms:rights': get_value(item, 'dcterms:rights'),
-        'dcterms:rightsHolder': get_value(item, 'dcterms:rightsHolder'),
-        'dcterms:language': get_value(item, 'dcterms:language'),
-        'dcterms:source': get_value(item, 'dcterms:source'),
-        'dcterms:contributor': join_values(item, 'dcterms:contributor', ''),
-        'bibo:content': get_value(item, 'bibo:content'),
-    }
+    primary_media_url = await api_client.get_primary_media_url(item)
+    return ROW_BUILDERS['documents'](item, primary_media_url)
 
 def map_audio_visual_document(item: Dict[str, Any]) -> Dict[str, Any]:
-    return {
-        'o:id': get_value(item, 'o:id'),
-        'url': f"https://islam.zmo.de/s/afrique_ouest/item/{get_value(item, 'o:id')}",
-        'dcterms:identifier': get_value(item, 'dcterms:identifier'),
-        'o:resource_class': 'bibo:AudioVisualDocument',
-        'o:item_set': join_values(item, 'o:item_set', ''),
-        'o:media/file': get_media_ids(item),
-        'dcterms:title': get_value(item, 'dcterms:title'),
-        'dcterms:creator': join_values(item, 'dcterms:creator', ''),
-        'dcterms:publisher': join_values(item, 'dcterms:publisher', ''),
-        'dcterms:description': get_value(item, 'dcterms:description'),
-        'dcterms:date': get_value(item, 'dcterms:date'),
-        'bibo:volume': get_value(item, 'bibo:volume'),
-        'bibo:issue': get_value(item, 'bibo:issue'),
-        'dcterms:isPartOf': get_value(item, 'dcterms:isPartOf'),
-        'dcterms:extent': get_value(item, 'dcterms:extent'),
-        'dcterms:medium': get_value(item, 'dcterms:medium'),
-        'dcterms:subject': join_values(item, 'dcterms:subject', ''),
-        'dcterms:spatial': join_values(item, 'dcterms:spatial', ''),
-        'dcterms:rights': get_value(item, 'dcterms:rights'),
-        'dcterms:rightsHolder': get_value(item, 'dcterms:rightsHolder'),
-        'dcterms:language': get_value(item, 'dcterms:language'),
-        'dcterms:source': get_value(item, 'dcterms:source'),
-        'dcterms:contributor': join_values(item, 'dcterms:contributor', ''),
-        'bibo:content': get_value(item, 'bibo:content'),
-    }
+    return ROW_BUILDERS['audio_visual_documents'](item)
 
 def map_image(item: Dict[str, Any]) -> Dict[str, Any]:
-    return {
-        'o:id': get_value(item, 'o:id'),
-        'url': f"https://islam.zmo.de/s/afrique_ouest/item/{get_value(item, 'o:id')}",
-        'dcterms:identifier': get_value(item, 'dcterms:identifier'),
-        'o:resource_class': 'bibo:Image',
-        'o:item_set': join_values(item, 'o:item_set', ''),
-        'o:media/file': get_media_ids(item),
-        'dcterms:title': get_value(item, 'dcterms:title'),
-        'dcterms:creator': join_values(item, 'dcterms:creator', ''),
-        'dcterms:date': get_value(item, 'dcterms:date'),
-        'dcterms:description': get_value(item, 'dcterms:description'),
-        'dcterms:subject': join_values(item, 'dcterms:subject', ''),
-        'dcterms:rights': get_value(item, 'dcterms:rights'),
-        'dcterms:source': get_value(item, 'dcterms:source'),
-        'dcterms:spatial': join_values(item, 'dcterms:spatial', ''),
-        'coordinates': get_value(item, 'curation:coordinates'),
-    }
+    return ROW_BUILDERS['images'](item)
 
 def map_index(item: Dict[str, Any]) -> Dict[str, Any]:
-    resource_class_id = item.get('o:resource_class', {}).get('o:id')
-    resource_class_map = {
-        244: 'fabio:AuthorityFile',
-        54: 'bibo:Event',
-        9: 'dcterms:Location',
-        96: 'foaf:Organization',
-        94: 'foaf:Person'
-    }
-
-    def get_fr_value(field: str) -> str:
-        values = item.get(field, [])
-        fr_values = [v['@value'] for v in values if v.get('@language') == 'fr']
-        return '|'.join(fr_values) if fr_values else get_value(item, field)
-
-    # Get type display titles
-    type_values = item.get('dcterms:type', [])
-    type_display_titles = [t.get('display_title', '') for t in type_values if t.get('display_title')]
-    type_string = '|'.join(filter(None, type_display_titles))
-
-    return {
-        'o:id': get_value(item, 'o:id'),
-        'url': f"https://islam.zmo.de/s/afrique_ouest/item/{get_value(item, 'o:id')}",
-        'dcterms:identifier': get_value(item, 'dcterms:identifier'),
-        'o:resource_class': resource_class_map.get(resource_class_id, ''),
-        'o:item_set': join_values(item, 'o:item_set', ''),
-        'o:media/file': get_media_ids(item),
-        'dcterms:title': get_fr_value('dcterms:title'),
-        'dcterms:alternative': get_fr_value('dcterms:alternative'),
-        'dcterms:created': get_value(item, 'dcterms:created'),
-        'dcterms:date': get_value(item, 'dcterms:date'),
-        'dcterms:description': get_value(item, 'dcterms:description'),
-        'dcterms:relation': join_values(item, 'dcterms:relation', ''),
-        'dcterms:isReplacedBy': join_values(item, 'dcterms:isReplacedBy', ''),
-        'dcterms:replaces': join_values(item, 'dcterms:replaces', ''),
-        'dcterms:isPartOf': get_value(item, 'dcterms:isPartOf'),
-        'dcterms:hasPart': get_value(item, 'dcterms:hasPart'),
-        'dcterms:spatial': join_values(item, 'dcterms:spatial', ''),
-        'dcterms:type': type_string,
-        'foaf:firstName': get_value(item, 'foaf:firstName'),
-        'foaf:lastName': get_value(item, 'foaf:lastName'),
-        'foaf:gender': get_value(item, 'foaf:gender'),
-        'foaf:birthday': get_value(item, 'foaf:birthday'),
-        'coordinates': get_value(item, 'curation:coordinates'),
-    }
+    return ROW_BUILDERS['index'](item)
 
 """Maps an Omeka-S issue item to a standardized dictionary format.
 
@@ -1187,206 +3218,275 @@ Returns:
         - Content and URL references
 """
 async def map_issue(item: Dict[str, Any], api_client: OmekaApiClient) -> Dict[str, Any]:
-    # Fetch the primary media URL if available
-    primary_media_url = ''
-    if 'o:primary_media' in item and item['o:primary_media']:
-        media_id = item['o:primary_media']['@id'].split('/')[-1]
-        media_data = await api_client.fetch_media_data(media_id)
-        primary_media_url = media_data.get('o:original_url', '')
-
-    return {
-        # Basic identification fields
-        'o:id': get_value(item, 'o:id'),
-        'url': f"https://islam.zmo.de/s/afrique_ouest/item/{get_value(item, 'o:id')}",
-        'dcterms:identifier': get_value(item, 'dcterms:identifier'),
-        'o:resource_class': 'bibo:Issue',  # Fixed value for issues
-        
-        # Collection and media information
-        'o:item_set': join_values(item, 'o:item_set', ''),  # Collection memberships
-        'o:media/file': get_media_ids(item),  # Associated media files
-        'o:primary_media': primary_media_url,  # URL of the primary media
-        
-        # Core bibliographic metadata
-        'dcterms:title': get_value(item, 'dcterms:title'),  # Issue title
-        'dcterms:creator': join_values(item, 'dcterms:creator', ''),  # Authors/creators
-        'dcterms:publisher': join_values(item, 'dcterms:publisher', ''),  # Publishers
-        'dcterms:date': get_value(item, 'dcterms:date'),  # Publication date
-        'dcterms:type': get_value(item, 'dcterms:type'),  # Resource type
-        
-        # Issue-specific metadata
-        'bibo:issue': get_value(item, 'bibo:issue'),  # Issue number
-        'dcterms:abstract': get_value(item, 'dcterms:abstract'),  # Abstract/summary
-        'bibo:numPages': get_value(item, 'bibo:numPages'),  # Number of pages
-        
-        # Subject and geographic metadata
-        'dcterms:subject': join_values(item, 'dcterms:subject', ''),  # Subject terms
-        'dcterms:spatial': join_values(item, 'dcterms:spatial', ''),  # Geographic coverage
-        
-        # Rights and attribution
-        'dcterms:rights': get_value(item, 'dcterms:rights'),  # Rights statement
-        'dcterms:rightsHolder': get_value(item, 'dcterms:rightsHolder'),  # Rights holder
-        
-        # Additional metadata
-        'dcterms:language': get_value(item, 'dcterms:language'),  # Language
-        'dcterms:source': get_value(item, 'dcterms:source'),  # Original source
-        'dcterms:contributor': join_values(item, 'dcterms:contributor', ''),  # Contributors
-        
-        # External references
-        'fabio:hasURL': get_value(item, 'fabio:hasURL'),  # External URL
-        'bibo:content': get_value(item, 'bibo:content'),  # Full text content
-    }
+    # Resolve the primary media URL if available
+    primary_media_url = await api_client.get_primary_media_url(item)
+    return ROW_BUILDERS['issues'](item, primary_media_url)
 
 async def map_newspaper_article(item: Dict[str, Any], api_client: OmekaApiClient) -> Dict[str, Any]:
-    primary_media_url = ''
-    if 'o:primary_media' in item and item['o:primary_media']:
-        media_id = item['o:primary_media']['@id'].split('/')[-1]
-        media_data = await api_client.fetch_media_data(media_id)
-        primary_media_url = media_data.get('o:original_url', '')
-
-    return {
-        'o:id': get_value(item, 'o:id'),
-        'url': f"https://islam.zmo.de/s/afrique_ouest/item/{get_value(item, 'o:id')}",
-        'dcterms:identifier': get_value(item, 'dcterms:identifier'),
-        'o:resource_class': 'bibo:Article',
-        'o:item_set': join_values(item, 'o:item_set', ''),
-        'o:media/file': get_media_ids(item),
-        'o:primary_media': primary_media_url,
-        'dcterms:title': get_value(item, 'dcterms:title'),
-        'dcterms:creator': join_values(item, 'dcterms:creator', ''),
-        'dcterms:publisher': join_values(item, 'dcterms:publisher', ''),
-        'dcterms:date': get_value(item, 'dcterms:date'),
-        'dcterms:type': get_value(item, 'dcterms:type'),
-        'dcterms:abstract': get_value(item, 'dcterms:abstract'),
-        'bibo:pages': get_value(item, 'bibo:pages'),
-        'bibo:numPages': get_value(item, 'bibo:numPages'),
-        'dcterms:subject': join_values(item, 'dcterms:subject', ''),
-        'dcterms:spatial': join_values(item, 'dcterms:spatial', ''),
-        'dcterms:rights': get_value(item, 'dcterms:rights'),
-        'dcterms:rightsHolder': get_value(item, 'dcterms:rightsHolder'),
-        'dcterms:language': get_value(item, 'dcterms:language'),
-        'dcterms:source': get_value(item, 'dcterms:source'),
-        'dcterms:contributor': join_values(item, 'dcterms:contributor', ''),
-        'fabio:hasURL': get_value(item, 'fabio:hasURL'),
-        'bibo:content': get_value(item, 'bibo:content'),
-    }
+    primary_media_url = await api_client.get_primary_media_url(item)
+    return ROW_BUILDERS['newspaper_articles'](item, primary_media_url)
 
 def map_item_set(item: Dict[str, Any]) -> Dict[str, Any]:
-    def get_fr_value(field: str) -> str:
-        values = item.get(field, [])
-        fr_values = [v['@value'] for v in values if v.get('@language') == 'fr']
-        return '|'.join(fr_values) if fr_values else get_value(item, field)
-
-    return {
-        'o:id': get_value(item, 'o:id'),
-        'url': f"https://islam.zmo.de/s/afrique_ouest/item-set/{get_value(item, 'o:id')}",
-        'dcterms:identifier': get_value(item, 'dcterms:identifier'),
-        'o:resource_class': 'o:ItemSet',
-        'o:title': get_value(item, 'o:title'),
-        'dcterms:description': get_fr_value('dcterms:description'),
-        'dcterms:creator': join_values(item, 'dcterms:creator', ''),
-        'dcterms:date': get_value(item, 'dcterms:date'),
-        'dcterms:replaces': join_values(item, 'dcterms:replaces', ''),
-        'dcterms:isReplacedBy': join_values(item, 'dcterms:isReplacedBy', ''),
-        'dcterms:spatial': join_values(item, 'dcterms:spatial', ''),
-        'dcterms:language': get_value(item, 'dcterms:language'),
-        'dcterms:rights': get_value(item, 'dcterms:rights'),
-        'dcterms:rightsHolder': get_value(item, 'dcterms:rightsHolder'),
-        'dcterms:source': get_value(item, 'dcterms:source'),
-        'dcterms:contributor': join_values(item, 'dcterms:contributor', ''),
-    }
+    return ROW_BUILDERS['item_sets'](item)
 
 def map_media(item: Dict[str, Any]) -> Dict[str, Any]:
-    # Get the item ID, handling the case where it might be nested
-    item_id = item.get('o:item', {}).get('o:id', '')
-    if not item_id:
-        item_id = get_value(item, 'o:item')
-    
-    # Construct the item URL only if we have a valid item ID
-    item_url = f"https://islam.zmo.de/s/afrique_ouest/item/{item_id}" if item_id else ""
-
-    return {
-        'o:id': get_value(item, 'o:id'),
-        'url': f"https://islam.zmo.de/s/afrique_ouest/media/{get_value(item, 'o:id')}",
-        'o:resource_class': 'o:Media',
-        'o:media_type': get_value(item, 'o:media_type'),
-        'o:item': item_url,
-        'o:original_url': get_value(item, 'o:original_url'),
-    }
+    return ROW_BUILDERS['media'](item)
 
 def map_reference(item: Dict[str, Any]) -> Dict[str, Any]:
-    resource_class_map = {
-        35: "bibo:AcademicArticle",
-        43: "bibo:Chapter",
-        88: "bibo:Thesis",
-        40: "bibo:Book",
-        82: "bibo:Report",
-        178: "fabio:BookReview",
-        52: "bibo:EditedBook",
-        77: "bibo:PersonalCommunication",
-        305: "fabio:BlogPost"
-    }
-    resource_class_id = item.get('o:resource_class', {}).get('o:id')
-    
-    return {
-        'o:id': get_value(item, 'o:id'),
-        'url': f"https://islam.zmo.de/s/afrique_ouest/item/{get_value(item, 'o:id')}",
-        'dcterms:identifier': get_value(item, 'dcterms:identifier'),
-        'o:resource_class': resource_class_map.get(resource_class_id, ''),
-        'o:item_set': join_values(item, 'o:item_set', ''),
-        'o:media/file': get_media_ids(item),
-        'dcterms:title': get_value(item, 'dcterms:title'),
-        'bibo:authorList': join_values(item, 'bibo:authorList', ''),
-        'bibo:editorList': join_values(item, 'bibo:editorList', ''),
-        'bibo:reviewOf': join_values(item, 'bibo:reviewOf', ''),
-        'dcterms:publisher': join_values(item, 'dcterms:publisher', ''),
-        'dcterms:date': get_value(item, 'dcterms:date'),
-        'dcterms:type': get_value(item, 'dcterms:type'),
-        'dcterms:alternative': get_value(item, 'dcterms:alternative'),
-        'bibo:chapter': get_value(item, 'bibo:chapter'),
-        'bibo:volume': get_value(item, 'bibo:volume'),
-        'bibo:issue': get_value(item, 'bibo:issue'),
-        'dcterms:abstract': get_value(item, 'dcterms:abstract'),
-        'bibo:edition': get_value(item, 'bibo:edition'),
-        'bibo:numPages': get_value(item, 'bibo:numPages'),
-        'bibo:pageStart': get_value(item, 'bibo:pageStart'),
-        'bibo:pageEnd': get_value(item, 'bibo:pageEnd'),
-        'dcterms:extent': get_value(item, 'dcterms:extent'),
-        'dcterms:isPartOf': get_value(item, 'dcterms:isPartOf'),
-        'dcterms:provenance': get_value(item, 'dcterms:provenance'),
-        'dcterms:subject': join_values(item, 'dcterms:subject', ''),
-        'dcterms:spatial': join_values(item, 'dcterms:spatial', ''),
-        'dcterms:language': get_value(item, 'dcterms:language'),
-        'bibo:doi': get_value(item, 'bibo:doi'),
-        'fabio:hasURL': get_value(item, 'fabio:hasURL'),
-        'bibo:content': get_value(item, 'bibo:content'),
-    }
+    return ROW_BUILDERS['references'](item)
+
+# API endpoint each export category is fetched from
+ENDPOINT_OF_CATEGORY = {'item_sets': 'item_sets', 'media': 'media'}
+
+# Mappers that need no API access and can run in worker threads or processes
+SYNC_MAPPERS = {
+    'audio_visual_documents': map_audio_visual_document,
+    'images': map_image,
+    'index': map_index,
+    'item_sets': map_item_set,
+    'media': map_media,
+    'references': map_reference,
+}
+
+def map_chunk(item_type: str, items: List[Dict[str, Any]]) -> List[tuple]:
+    """Map a chunk of items, returning `(True, row)` or `(False, (error type, message))` per item.
+
+    Module-level so it can be sent to process-pool workers; errors are returned rather
+    than raised so one bad item does not discard the whole chunk.
+    """
+    mapper = SYNC_MAPPERS[item_type]
+    outcomes = []
+    for item in items:
+        try:
+            outcomes.append((True, mapper(item)))
+        except Exception as e:
+            outcomes.append((False, (type(e).__name__, str(e))))
+    return outcomes
+
+def log_run_summary(api_client: OmekaApiClient):
+    """Log the request-level statistics of a finished export."""
+    logger.info(
+        f"Primary media resolved from the media index: {api_client.media_index_hits}, "
+        f"fetched individually: {api_client.media_fallbacks}"
+    )
+    limiter_stats = api_client.rate_limiter.stats()
+    logger.info(
+        f"Rate limiter: {limiter_stats['delayed']}/{limiter_stats['acquired']} requests delayed, "
+        f"total wait {limiter_stats['total_wait_s']}s, max wait {limiter_stats['max_wait_ms']} ms"
+    )
+    if api_client.coalesced_requests:
+        logger.info(f"Request coalescing: {api_client.coalesced_requests} duplicate requests shared an in-flight fetch")
+    concurrency_levels = ', '.join(str(level) for _, level in api_client.concurrency.history[-20:])
+    logger.info(f"Concurrency levels over the run (latest 20 changes): {concurrency_levels}")
+    if api_client.cache.revalidations:
+        logger.info(
+            f"Cache revalidation: {api_client.cache.revalidations} conditional requests, "
+            f"{api_client.cache.not_modified} answered 304 Not Modified"
+        )
 
-def get_media_ids(item: Dict[str, Any]) -> str:
-    if 'o:media' in item and isinstance(item['o:media'], list):
-        return '|'.join([str(media.get('o:id', '')) for media in item['o:media']])
-    return ''
+# Endpoints crawled whole; --warm-cache prefetches those whose pages outlive a day
+WARM_ENDPOINTS = ('item_sets', 'media')
+
+async def warm_cache(api_client: OmekaApiClient) -> Dict[str, int]:
+    """Prefetch the long-lived crawls and refetch the cached single records that expire before the next run.
+
+    Returns the number of records crawled and entries refreshed per endpoint.
+    """
+    cache = api_client.cache
+    # Entries expiring within a day would be stale by the next nightly run
+    cache.refresh_margin = cache.cache_duration
+    endpoints = [endpoint for endpoint in WARM_ENDPOINTS
+                 if cache.ttl_for(api_client.cache_key(endpoint, {'page': 1, 'per_page': 100})) > cache.cache_duration]
+    crawls = await asyncio.gather(*(api_client._paginate(endpoint, desc=f"Warming {endpoint}") for endpoint in endpoints))
+    refreshed = {endpoint: len(records) for endpoint, records in zip(endpoints, crawls)}
+    long_lived = [key for key in await cache.store.keys()
+                  if cache.ttl_for(key) > cache.cache_duration and key.split(':')[0] not in WARM_ENDPOINTS]
+
+    async def refresh(key: str):
+        entry = await cache.get_entry(key)
+        if entry is not None and cache.is_fresh(entry, key):
+            return
+        endpoint, _, params = key.partition(':')
+        if endpoint == 'media_data':
+            await api_client.fetch_media_data(params)
+        else:
+            await api_client._make_request(endpoint, json.loads(params))
+        endpoint = endpoint.split('/')[0]
+        refreshed[endpoint] = refreshed.get(endpoint, 0) + 1
+
+    await asyncio.gather(*(refresh(key) for key in long_lived))
+    return refreshed
+
+def write_metrics_report(path: str, api_client: OmekaApiClient, status: str):
+    """Write the run's metrics as JSON, for comparing runs and catching regressions."""
+    report = {
+        'generated': datetime.now().isoformat(timespec='seconds'),
+        'status': status,
+        'duration_s': round(time.time() - metrics.started, 3),
+        **metrics.report(),
+        'cache': api_client.cache.stats(),
+        'components': {name: source() for name, source in profiler.counter_sources.items() if name != 'cache'},
+    }
+    if profiler.enabled:
+        report['operations'] = {
+            name: {'count': stats['count'], 'total_s': round(stats['total_time'], 3)}
+            for name, stats in profiler.metrics.items()
+        }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, default=str)
+    os.replace(tmp_path, path)
+    logger.info(f"Saved metrics report to {path}")
+
+async def run_cache_command(args: argparse.Namespace) -> str:
+    """Run `cache stats` or `cache prune` on the disk tier selected by --cache-backend."""
+    cache = Cache(backend=args.cache_backend)
+    try:
+        if args.cache_command == 'prune':
+            max_age = timedelta(days=args.older_than_days) if args.older_than_days is not None else None
+            max_bytes = int(args.max_mb * 1024 * 1024) if args.max_mb is not None else None
+            removed, freed = await cache.store.prune(max_bytes, max_age)
+            return f"Removed {removed} entries ({freed / 1024 / 1024:.1f} MB) from {(await cache.store.stats())['location']}"
+        stats = await cache.store.stats()
+        stamp = lambda value: datetime.fromtimestamp(value).isoformat(timespec='seconds') if value else '-'
+        lines = [
+            f"Backend: {stats['backend']} ({stats['location']})",
+            f"Entries: {stats['entries']}" + (f" ({stats['legacy_entries']} legacy .json.gz)" if stats.get('legacy_entries') else ''),
+            f"Size: {stats['bytes'] / 1024 / 1024:.1f} MB"
+            + (f" ({stats['file_bytes'] / 1024 / 1024:.1f} MB on disk)" if 'file_bytes' in stats else ''),
+            f"Oldest entry: {stamp(stats['oldest'])}",
+            f"Newest entry: {stamp(stats['newest'])}",
+        ]
+        return '\n'.join(lines)
+    finally:
+        await cache.close()
 
 async def async_main():
+    api_client = None
+    status = 'failed'
     try:
         # Parse command line arguments
         parser = argparse.ArgumentParser(description='Export data from Omeka API to CSV files')
         parser.add_argument('--cache', choices=['yes', 'no'], default=None, 
                             help='Use cached data if available (yes/no)')
+        parser.add_argument('--cache-backend', choices=sorted(CACHE_STORES), default='files',
+                            help='Disk tier of the cache: one file per entry or a single SQLite pack')
+        parser.add_argument('--cache-max-mb', type=float, default=1024,
+                            help='Prune the least recently used cache entries beyond this size after a run (0: no cap)')
+        parser.add_argument('--cache-ttl', type=str, nargs='+', default=None, metavar='PATTERN=HOURS',
+                            help='Override the cache TTL of keys matching a pattern, e.g. "media/*=336"')
+        parser.add_argument('--warm-cache', action='store_true',
+                            help='Only prefetch the item set and media crawls and refresh long-lived entries expiring within a day, then exit')
+        snapshot_group = parser.add_mutually_exclusive_group()
+        snapshot_group.add_argument('--record-snapshot', type=str, default=None, metavar='SNAPSHOT.zip',
+                                    help='Record every API response of the run into a snapshot archive')
+        snapshot_group.add_argument('--replay-snapshot', type=str, default=None, metavar='SNAPSHOT.zip',
+                                    help='Answer every API request from a recorded snapshot, without network')
         parser.add_argument('--profile', action='store_true', 
                             help='Enable performance profiling')
+        parser.add_argument('--trace', type=str, default=None, metavar='OUT.json',
+                            help='Record spans and save them in Chrome trace-event format')
+        parser.add_argument('--metrics-file', type=str, default=None,
+                            help='Where to write the JSON metrics report (default: export_metrics.json in the output directory)')
         parser.add_argument('--concurrent-requests', type=int, default=10,
-                            help='Maximum number of concurrent API requests')
+                            help='Initial number of concurrent API requests (adjusted to server load)')
+        parser.add_argument('--max-concurrent-requests', type=int, default=32,
+                            help='Upper bound for the adaptive number of concurrent API requests')
         parser.add_argument('--output-dir', type=str, default=None,
                             help='Directory to store output CSV files')
         parser.add_argument('--resource-classes', type=str, nargs='+',
                             help='Specific resource classes to fetch (space-separated IDs)')
+        parser.add_argument('--rate-limit', type=float, default=10.0,
+                            help='Average number of API requests per second')
+        parser.add_argument('--burst', type=int, default=1,
+                            help='Number of API requests that may be sent back to back before rate limiting applies')
+        parser.add_argument('--memory-cache-mb', type=int, default=256,
+                            help='Memory budget of the in-memory cache tier in megabytes')
+        parser.add_argument('--memory-cache-items', type=int, default=5000,
+                            help='Maximum number of entries in the in-memory cache tier')
+        parser.add_argument('--delta', action='store_true',
+                            help='Only fetch resources changed since the last export and patch the existing CSV files')
+        parser.add_argument('--mapper-backend', choices=['thread', 'process', 'inline'], default='thread',
+                            help='Where synchronous mappers run: persistent thread pool, process pool or event loop')
+        parser.add_argument('--mapper-workers', type=int, default=None,
+                            help='Number of mapper threads/processes (default: CPU count)')
+        parser.add_argument('--format', choices=['csv', 'parquet', 'both'], default='csv',
+                            help='Output file format (Parquet requires pyarrow)')
+        parser.add_argument('--json-codec', choices=['auto', 'orjson', 'json'], default='json',
+                            help='JSON codec for responses, cache and checkpoint (auto: orjson if installed)')
+        parser.add_argument('--stream', action='store_true',
+                            help='Map and write pages as they are fetched to bound memory use')
+        parser.add_argument('--resume', action='store_true',
+                            help='Continue an interrupted export from its checkpoint journal')
+        parser.add_argument('--queue-depth', type=int, default=16,
+                            help='Maximum number of pages fetched or in flight but not yet written in streaming mode')
+        subparsers = parser.add_subparsers(dest='command', help='Maintenance commands (default: run the export)')
+        errors_parser = subparsers.add_parser('errors', help='Inspect the error log of previous runs')
+        errors_subparsers = errors_parser.add_subparsers(dest='errors_command', required=True)
+        summarize_parser = errors_subparsers.add_parser('summarize', help='Group logged errors by type and endpoint')
+        summarize_parser.add_argument('--file', type=str, default=None,
+                                      help='Error log to summarize (default: Metadata/logs/processing_errors.jsonl)')
+        summarize_parser.add_argument('--examples', type=int, default=1,
+                                      help='Number of example messages shown per group')
+        cache_parser = subparsers.add_parser('cache', help='Inspect or prune the response cache')
+        cache_subparsers = cache_parser.add_subparsers(dest='cache_command', required=True)
+        cache_subparsers.add_parser('stats', help='Show the number, size and age of cached entries')
+        prune_parser = cache_subparsers.add_parser('prune', help='Remove old entries and shrink the cache to a size')
+        prune_parser.add_argument('--max-mb', type=float, default=None,
+                                  help='Remove the least recently used entries beyond this size')
+        prune_parser.add_argument('--older-than-days', type=float, default=None,
+                                  help='Remove entries written or revalidated longer ago than this')
         
         args = parser.parse_args()
+
+        if args.command == 'errors':
+            error_file = args.file or os.path.join(Config().LOG_DIR, 'processing_errors.jsonl')
+            if not os.path.exists(error_file):
+                print(f"No error log found at {error_file}")
+            else:
+                print(summarize_errors(error_file, args.examples))
+            return
+        if args.command == 'cache':
+            if args.cache_command == 'prune' and args.max_mb is None and args.older_than_days is None:
+                parser.error("cache prune needs --max-mb and/or --older-than-days")
+            print(await run_cache_command(args))
+            return
+        formats = ('csv', 'parquet') if args.format == 'both' else (args.format,)
+        if 'parquet' in formats and pa is None:
+            parser.error("Parquet output requires pyarrow (pip install pyarrow)")
+        if args.json_codec == 'orjson' and orjson is None:
+            parser.error("The orjson codec requires orjson (pip install orjson)")
+        json_codec.use(args.json_codec)
+        if args.queue_depth < 1:
+            parser.error("--queue-depth must be at least 1")
+        ttl_overrides = []
+        for rule in args.cache_ttl or []:
+            pattern, _, hours = rule.rpartition('=')
+            try:
+                ttl_overrides.append((pattern, timedelta(hours=float(hours))))
+            except ValueError:
+                pattern = ''
+            if not pattern:
+                parser.error(f"Invalid --cache-ttl rule {rule!r}, expected PATTERN=HOURS")
+        if args.replay_snapshot:
+            if not os.path.exists(args.replay_snapshot):
+                parser.error(f"Snapshot {args.replay_snapshot} not found")
+            if args.warm_cache:
+                parser.error("--warm-cache cannot be combined with --replay-snapshot")
+            # Replayed responses must not overwrite live ones in the cache
+            args.cache = 'no'
+        if args.warm_cache:
+            if args.cache == 'no':
+                parser.error("--warm-cache needs the cache")
+            args.cache = 'yes'
         
         # Enable profiler if requested
         if args.profile:
             profiler.enable()
             logger.info("Performance profiling enabled")
+        if args.trace:
+            profiler.enable_tracing()
+            logger.info(f"Tracing enabled, spans will be saved to {args.trace}")
         
         # Configure cache usage (command line arg or interactive)
         use_cache = None
@@ -1404,7 +3504,7 @@ async def async_main():
         if not use_cache:
             logger.info("Cache disabled - fetching fresh data from API")
         else:
-            logger.info("Cache enabled - using cached data if available")
+            logger.info(f"Cache enabled - using cached data if available (entries compressed with {next(iter(CACHE_CODECS))})")
         
         logger.info("Starting the Omeka data export process...")
         
@@ -1417,41 +3517,127 @@ async def async_main():
         logger.info(f"Output directory: {config.OUTPUT_DIR}")
 
         os.makedirs(config.OUTPUT_DIR, exist_ok=True)
+        error_log.open(os.path.join(config.LOG_DIR, 'processing_errors.jsonl'))
 
         # Create API client with potentially customized concurrent request limit
-        api_client = OmekaApiClient(config, use_cache=use_cache)
-        if args.concurrent_requests:
-            api_client.request_semaphore = asyncio.Semaphore(args.concurrent_requests)
-            logger.info(f"Set concurrent request limit to {args.concurrent_requests}")
+        api_client = OmekaApiClient(config, use_cache=use_cache, cache_backend=args.cache_backend)
+        api_client.cache.memory_cache.max_items = args.memory_cache_items
+        api_client.cache.memory_cache.max_bytes = args.memory_cache_mb * 1024 * 1024
+        api_client.cache.ttl_policy[:0] = ttl_overrides
+        if args.replay_snapshot:
+            api_client.snapshot = ApiSnapshot(args.replay_snapshot)
+            logger.info(
+                f"Replaying {len(api_client.snapshot.index)} responses recorded from "
+                f"{api_client.snapshot.manifest.get('api_url')} on {api_client.snapshot.manifest.get('created')}"
+            )
+        elif args.record_snapshot:
+            api_client.snapshot = ApiSnapshot(args.record_snapshot, 'w', config.API_URL)
+            logger.info(f"Recording API responses to {args.record_snapshot}")
+        profiler.register_counters('cache', api_client.cache.stats)
+        profiler.register_counters('primary_media', api_client.media_lookup_stats)
+        profiler.register_counters('requests', api_client.request_stats)
+        api_client.concurrency = AdaptiveConcurrencyLimiter(
+            initial=args.concurrent_requests, max_limit=args.max_concurrent_requests
+        )
+        logger.info(
+            f"Set concurrent request limit to {args.concurrent_requests} "
+            f"(adaptive, up to {args.max_concurrent_requests})"
+        )
+        profiler.register_counters('concurrency', api_client.concurrency.stats)
+        api_client.rate_limiter = TokenBucket(rate=args.rate_limit, burst=args.burst)
+        profiler.register_counters('rate_limiter', api_client.rate_limiter.stats)
+        profiler.register_counters('request_latency', metrics.latency_summary)
+
+        if args.warm_cache:
+            requests_before = api_client.cache.misses + api_client.cache.stale_hits
+            with profiler.span("warm_cache"):
+                warmed = await warm_cache(api_client)
+            logger.info(
+                f"Cache warm-up: {', '.join(f'{count} {endpoint}' for endpoint, count in warmed.items()) or 'nothing expiring'}, "
+                f"{api_client.cache.misses + api_client.cache.stale_hits - requests_before} requests"
+            )
+            status = 'ok'
+            return
+
+        manifest = ExportManifest(os.path.join(config.OUTPUT_DIR, 'export_manifest.json')).load()
+        delta = args.delta and manifest.exists
+        if args.delta and not delta:
+            logger.warning("No export manifest found - running a full export instead of a delta")
+        since = manifest.last_export if delta else None
+
+        # Batch runs journal their progress so that an interrupted run can be resumed
+        if args.stream and not delta:
+            if args.resume:
+                logger.warning("--resume is not supported in streaming mode - starting from the beginning")
+        else:
+            checkpoint = CheckpointJournal(os.path.join(config.OUTPUT_DIR, '.checkpoint'))
+            if args.resume:
+                checkpoint.load()
+            checkpoint.open()
+            api_client.checkpoint = checkpoint
 
         # Start profile timing for the main operations
-        profiler.start("fetch_item_set_titles")
-        item_set_titles = await api_client.fetch_item_set_titles()
-        profiler.stop("fetch_item_set_titles")
-        
-        profiler.start("fetch_all_items")
-        raw_data, item_sets, media, references = await api_client.fetch_all_items()
-        profiler.stop("fetch_all_items")
+        with profiler.span("fetch_item_sets"):
+            item_set_index = await api_client.fetch_item_set_index()
+
+        if args.stream and delta:
+            logger.info("Delta exports are small - ignoring --stream")
+        elif args.stream:
+            logger.info(f"Streaming export with a queue depth of {args.queue_depth} pages...")
+            manifest.last_export, manifest.items = None, {}
+            exporter = StreamingExporter(api_client, config, item_set_index, queue_depth=args.queue_depth,
+                                         formats=formats, mapper_backend=args.mapper_backend)
+            if args.mapper_workers:
+                exporter.processor.mapper_workers = args.mapper_workers
+            with profiler.span("stream_export"):
+                await exporter.run(manifest)
+            manifest.save()
+            status = 'ok'
+            log_run_summary(api_client)
+            if args.profile:
+                print("\n" + profiler.report())
+            return
+
+        with profiler.span("fetch_all_items"):
+            raw_data, item_sets, media, references = await api_client.fetch_all_items(since, manifest.items)
 
         if not raw_data and not item_sets and not media and not references:
-            logger.warning("No data fetched from the API. Exiting.")
+            if delta:
+                logger.info(f"No resources changed since {since}. Nothing to export.")
+            else:
+                logger.warning("No data fetched from the API. Exiting.")
+            api_client.checkpoint.remove()
+            status = 'ok'
             return
 
         logger.info("Processing fetched data...")
-        profiler.start("process_data")
         processor = DataProcessor(raw_data, item_sets, media, references, 
-                                item_set_titles, api_client, config)
-        processed_data = await processor.process()
-        profiler.stop("process_data")
+                                item_set_index, api_client, config)
+        await api_client.fetch_primary_media(raw_data + references)
+        processor.mapper_backend = args.mapper_backend
+        processor.checkpoint = api_client.checkpoint
+        if args.mapper_workers:
+            processor.mapper_workers = args.mapper_workers
+        with profiler.span("process_data"):
+            processed_data = await processor.process()
 
         logger.info(f"Processed data contains categories: {list(processed_data.keys())}")
-        logger.info("Generating CSV files...")
-        profiler.start("generate_csv_files")
-        generator = FileGenerator(processed_data, config.OUTPUT_DIR)
-        generator.generate_all_files()
-        profiler.stop("generate_csv_files")
+        logger.info(f"Generating {args.format} files...")
+        generator = FileGenerator(processed_data, config.OUTPUT_DIR, formats)
+        with profiler.span("generate_csv_files"):
+            if delta:
+                generator.patch_files()
+            else:
+                manifest.last_export, manifest.items = None, {}
+                generator.generate_all_files()
+
+        manifest.record(raw_data + item_sets + media + references)
+        manifest.save()
+        api_client.checkpoint.remove()
 
         logger.info("All files generated successfully.")
+        status = 'ok'
+        log_run_summary(api_client)
         
         # Print performance report if profiling was enabled
         if args.profile:
@@ -1459,7 +3645,27 @@ async def async_main():
             
     except Exception as e:
         logger.error(f"An unexpected error occurred: {str(e)}", exc_info=True)
+        error_log.record('run', '', type(e).__name__, str(e))
     finally:
+        if api_client is not None:
+            try:
+                write_metrics_report(args.metrics_file or os.path.join(config.OUTPUT_DIR, 'export_metrics.json'),
+                                     api_client, status)
+            except OSError as e:
+                logger.error(f"Failed to write metrics report: {str(e)}")
+        if profiler.tracing and profiler.spans:
+            profiler.save_trace(args.trace)
+        await error_log.close()
+        if api_client is not None and api_client.checkpoint is not None:
+            api_client.checkpoint.close()
+        if api_client is not None and api_client.snapshot is not None:
+            api_client.snapshot.close()
+            if api_client.snapshot.mode == 'w':
+                logger.info(f"Recorded {len(api_client.snapshot.index)} responses to {api_client.snapshot.path}")
+            else:
+                logger.info(f"Replayed {api_client.snapshot.replayed} responses from {api_client.snapshot.path}")
+        if api_client is not None:
+            await api_client.cache.close(args.cache_max_mb * 1024 * 1024 if args.cache_max_mb else None)
         # Close all connections properly
         await connection_manager.close_all()
 
@@ -0,0 +1,143 @@
+"""Versioned zip archives of Omeka S API responses, recorded during a run and replayed offline.
+
+Shared by Metadata/CSV_export.py, Visualisations/Overview/omeka_client.py and the
+Visualisations scripts, so that a snapshot recorded by one can be replayed by the others.
+
+Scripts that call the API with `requests.get` use `get` from this module instead: with
+OMEKA_RECORD_SNAPSHOT set, every response is recorded into that archive; with
+OMEKA_REPLAY_SNAPSHOT set, requests are answered from the archive without network.
+
+Usage:
+    OMEKA_RECORD_SNAPSHOT=/tmp/references.zip python Visualisations/References/references_authors.py
+    OMEKA_REPLAY_SNAPSHOT=/tmp/references.zip python Visualisations/References/references_authors.py
+"""
+
+import os
+import json
+import atexit
+import queue
+import zipfile
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode
+
+import requests
+
+SNAPSHOT_FORMAT = 'iwac-api-snapshot'
+SNAPSHOT_VERSION = 1
+
+def snapshot_key(endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Key of a request in a snapshot: the endpoint and its sorted query, without credentials."""
+    query = urlencode(sorted((name, str(value)) for name, value in (params or {}).items()
+                             if name not in ('key_identity', 'key_credential')))
+    return f"{endpoint}?{query}" if query else endpoint
+
+class ApiSnapshot:
+    """Versioned zip archive of API responses.
+
+    manifest.json holds the format name, version, API URL and creation time; index.json maps
+    each request key (see snapshot_key) to its response body file and `Omeka-S-Total-Results`.
+    Bodies are stored as received. While recording, bodies are compressed and written by a
+    writer thread, so that recording never holds up the requests of a run.
+    """
+    def __init__(self, path: str, mode: str = 'r', api_url: Optional[str] = None):
+        self.path = path
+        self.mode = mode
+        self.replayed = 0
+        if mode == 'w':
+            self.index: Dict[str, Dict[str, Any]] = {}
+            self.manifest = {
+                'format': SNAPSHOT_FORMAT,
+                'version': SNAPSHOT_VERSION,
+                'api_url': api_url,
+                'created': datetime.now().isoformat(timespec='seconds'),
+            }
+            self._zip = zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED)
+            self._queue: queue.Queue = queue.Queue()
+            self._writer = threading.Thread(target=self._write_bodies, name='api-snapshot', daemon=True)
+            self._writer.start()
+            return
+        self._zip = zipfile.ZipFile(path)
+        self.manifest = json.loads(self._zip.read('manifest.json'))
+        if self.manifest.get('format') != SNAPSHOT_FORMAT or self.manifest.get('version') != SNAPSHOT_VERSION:
+            self._zip.close()
+            raise ValueError(f"{path} is not a version {SNAPSHOT_VERSION} API snapshot")
+        self.index = json.loads(self._zip.read('index.json'))
+
+    def record(self, key: str, body: bytes, total: Optional[int] = None):
+        """Store a response body under its request key, keeping the first response of a key."""
+        if key in self.index:
+            return
+        name = f"responses/{len(self.index):06d}.json"
+        self.index[key] = {'body': name, 'total': total}
+        self._queue.put((name, body))
+
+    def _write_bodies(self):
+        while True:
+            entry = self._queue.get()
+            if entry is None:
+                return
+            self._zip.writestr(*entry)
+
+    def replay(self, key: str) -> Optional[tuple[bytes, Optional[int]]]:
+        """Return the recorded body and total of a request, or None if it was not recorded."""
+        entry = self.index.get(key)
+        if entry is None:
+            return None
+        self.replayed += 1
+        return self._zip.read(entry['body']), entry.get('total')
+
+    def close(self):
+        """Write the index and manifest of a recorded snapshot and close the archive."""
+        if self._zip is None:
+            return
+        if self.mode == 'w':
+            self._queue.put(None)
+            self._writer.join()
+            self.manifest['responses'] = len(self.index)
+            self._zip.writestr('index.json', json.dumps(self.index, sort_keys=True))
+            self._zip.writestr('manifest.json', json.dumps(self.manifest, indent=2))
+        self._zip.close()
+        self._zip = None
+
+_environment_snapshot: Optional[ApiSnapshot] = None
+
+def environment_snapshot(api_url: Optional[str] = None) -> Optional[ApiSnapshot]:
+    """Open the snapshot named by OMEKA_REPLAY_SNAPSHOT or OMEKA_RECORD_SNAPSHOT once per process."""
+    global _environment_snapshot
+    if _environment_snapshot is None:
+        if os.getenv('OMEKA_REPLAY_SNAPSHOT'):
+            _environment_snapshot = ApiSnapshot(os.environ['OMEKA_REPLAY_SNAPSHOT'])
+        elif os.getenv('OMEKA_RECORD_SNAPSHOT'):
+            _environment_snapshot = ApiSnapshot(os.environ['OMEKA_RECORD_SNAPSHOT'], 'w', api_url)
+            # Scripts exit without closing anything, so the snapshot is finalised on exit
+            atexit.register(_environment_snapshot.close)
+    return _environment_snapshot
+
+def get(url: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> requests.Response:
+    """`requests.get` for an API URL, recorded into or replayed from the environment's snapshot.
+
+    Requests are keyed by the URL path after `/api/`, as in the snapshots of the export.
+    """
+    api_url, _, endpoint = url.partition('/api/')
+    snapshot = environment_snapshot(f"{api_url}/api")
+    if snapshot is None:
+        return requests.get(url, params=params, **kwargs)
+    key = snapshot_key(endpoint, params)
+    if snapshot.mode == 'r':
+        replayed = snapshot.replay(key)
+        if replayed is None:
+            raise requests.ConnectionError(f"Request to {url} with {params} is not in snapshot {snapshot.path}")
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response._content = replayed[0]
+        if replayed[1] is not None:
+            response.headers['Omeka-S-Total-Results'] = str(replayed[1])
+        return response
+    response = requests.get(url, params=params, **kwargs)
+    if response.ok:
+        total = response.headers.get('Omeka-S-Total-Results')
+        snapshot.record(key, response.content, int(total) if total and total.isdigit() else None)
+    return response
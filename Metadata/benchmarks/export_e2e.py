@@ -0,0 +1,150 @@
+"""Benchmark a full export end to end against the mock Omeka S API.
+
+Starts Metadata/mock_omeka_server.py in a subprocess, runs the export in another and
+reports wall time, CPU time, API requests per second (counted by the mock) and the peak
+RSS of the export process. Server options such as latency, error rate and 429 injection
+are passed through so retry and throttling paths can be measured too. CPU time and peak
+RSS come from the rusage os.wait4 returns for each export process and need a Unix host.
+
+Usage:
+    python Metadata/benchmarks/export_e2e.py --scale 2 --latency-ms 30 --repeat 3
+    python Metadata/benchmarks/export_e2e.py --target omeka_client --scale 0.5
+    python Metadata/benchmarks/export_e2e.py --export-args="--stream --format parquet"
+"""
+
+import os
+import sys
+import json
+import time
+import shlex
+import socket
+import argparse
+import tempfile
+import subprocess
+import urllib.request
+from typing import List, Dict, Any
+
+METADATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+OVERVIEW_DIR = os.path.join(METADATA_DIR, '..', 'Visualisations', 'Overview')
+
+# fetch_all_data() would save items.json next to omeka_client.py; keep it in the run's directory instead
+OMEKA_CLIENT_RUNNER = (
+    "import os; from omeka_client import OmekaClient; client = OmekaClient(); "
+    "client.save_items_to_json(client.get_items(), os.path.abspath('items.json'))"
+)
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def fetch_stats(port: int) -> Dict[str, Any]:
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/__stats", timeout=5) as response:
+        return json.load(response)
+
+def start_mock(port: int, server_args: List[str]) -> subprocess.Popen:
+    mock = subprocess.Popen(
+        [sys.executable, os.path.join(METADATA_DIR, 'mock_omeka_server.py'), '--port', str(port), *server_args],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    # Large corpora take a while to generate
+    deadline = time.monotonic() + 600
+    while time.monotonic() < deadline:
+        if mock.poll() is not None:
+            raise RuntimeError(f"Mock server exited with code {mock.returncode}")
+        try:
+            fetch_stats(port)
+            return mock
+        except OSError:
+            time.sleep(0.1)
+    mock.kill()
+    raise RuntimeError("Mock server did not start within 600s")
+
+def run_once(target: str, port: int, export_args: List[str], output_dir: str) -> Dict[str, Any]:
+    env = dict(
+        os.environ,
+        OMEKA_BASE_URL=f"http://127.0.0.1:{port}/api",
+        OMEKA_KEY_IDENTITY='benchmark', OMEKA_KEY_CREDENTIAL='benchmark',
+        IWAC_KEY_IDENTITY='benchmark', IWAC_KEY_CREDENTIAL='benchmark'
+    )
+    if target == 'csv_export':
+        command = [sys.executable, os.path.join(METADATA_DIR, 'CSV_export.py'),
+                   '--cache', 'no', '--output-dir', output_dir, *export_args]
+        cwd = METADATA_DIR
+    else:
+        command = [sys.executable, '-c', OMEKA_CLIENT_RUNNER]
+        cwd = output_dir
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [os.path.abspath(OVERVIEW_DIR), env.get('PYTHONPATH')]))
+
+    before = fetch_stats(port)
+    start = time.perf_counter()
+    process = subprocess.Popen(command, cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    stderr = process.stderr.read()
+    # Reaping the process ourselves gives the resource usage of this run alone
+    _, status, usage = os.wait4(process.pid, 0)
+    wall = time.perf_counter() - start
+    process.stderr.close()
+    stats = fetch_stats(port)
+    returncode = os.waitstatus_to_exitcode(status)
+    if returncode != 0:
+        tail = '\n'.join(stderr.strip().splitlines()[-10:])
+        raise RuntimeError(f"{target} exited with code {returncode}:\n{tail}")
+
+    requests = stats['requests'] - before['requests']
+    return {
+        'wall_s': wall,
+        'cpu_s': usage.ru_utime + usage.ru_stime,
+        # ru_maxrss is in KiB on Linux
+        'peak_rss_mb': usage.ru_maxrss / 1024,
+        'requests': requests,
+        'requests_per_s': requests / wall if wall else 0.0,
+        'statuses': {status: count - before['statuses'].get(status, 0) for status, count in stats['statuses'].items()},
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a full export against the mock Omeka S API')
+    parser.add_argument('--target', choices=['csv_export', 'omeka_client'], default='csv_export')
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--export-args', type=str, default='', help='Extra arguments for CSV_export.py')
+    parser.add_argument('--scale', type=float, default=1.0, help='Synthetic corpus size relative to the collection')
+    parser.add_argument('--content-scale', type=float, default=1.0, help='Multiplier of bibo:content lengths')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    parser.add_argument('--max-concurrency', type=int, default=0)
+    parser.add_argument('--json', type=str, default=None, metavar='OUT.json', help='Also write the results as JSON')
+    args = parser.parse_args()
+
+    server_args = [
+        '--scale', str(args.scale), '--content-scale', str(args.content_scale), '--seed', str(args.seed),
+        '--latency-ms', str(args.latency_ms), '--jitter-ms', str(args.jitter_ms),
+        '--error-rate', str(args.error_rate), '--throttle-rate', str(args.throttle_rate),
+        '--max-concurrency', str(args.max_concurrency),
+    ]
+    port = free_port()
+    mock = start_mock(port, server_args)
+    runs = []
+    try:
+        for run in range(1, args.repeat + 1):
+            with tempfile.TemporaryDirectory(prefix='iwac-e2e-') as output_dir:
+                result = run_once(args.target, port, shlex.split(args.export_args), output_dir)
+            runs.append(result)
+            print(f"run {run}: {result['wall_s']:.2f}s wall, {result['cpu_s']:.2f}s CPU, {result['requests']} requests "
+                  f"({result['requests_per_s']:.1f}/s), peak RSS {result['peak_rss_mb']:.1f} MB, "
+                  f"statuses {result['statuses']}")
+    finally:
+        mock.terminate()
+        mock.wait()
+
+    walls = sorted(run['wall_s'] for run in runs)
+    print(f"\n{args.target} against the mock at scale {args.scale}: best {walls[0]:.2f}s, "
+          f"median {walls[len(walls) // 2]:.2f}s, peak RSS {max(run['peak_rss_mb'] for run in runs):.1f} MB")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'target': args.target, 'scale': args.scale, 'server_args': server_args,
+                       'export_args': args.export_args, 'runs': runs}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Benchmark the synchronous mapper backends of CSV_export.DataProcessor.
+
+Maps the same synthetic corpus with the thread, process and inline backends and reports
+throughput overall and per worker, so the --mapper-backend default can be chosen on
+measurements rather than guesses.
+
+Usage:
+    python Metadata/benchmarks/mapper_backends.py --scale 2 --workers 1 2 4
+"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+import argparse
+from functools import partial
+from typing import List, Dict, Any
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import CSV_export
+from CSV_export import Config, DataProcessor, OmekaApiClient, ItemSetIndex
+from synthetic_corpus import generate_corpus, items_by_category
+
+CATEGORIES = ['index', 'images', 'audio_visual_documents', 'references', 'item_sets', 'media']
+
+async def run_backend(backend: str, workers: int, items: Dict[str, List[Dict[str, Any]]]) -> float:
+    processor = DataProcessor([], [], [], [], ItemSetIndex(items['item_sets']),
+                              OmekaApiClient(Config(), use_cache=False), Config())
+    processor.mapper_backend = backend
+    processor.mapper_workers = workers
+    processed_data = {category: [] for category in CATEGORIES}
+    # Start the pool before timing so worker start-up is not counted against the backend
+    if backend != 'inline':
+        await processor._process_batch('media', items['media'][:workers])
+    start = time.perf_counter()
+    for category in CATEGORIES:
+        await processor._process_pool(category, items[category], processed_data)
+    elapsed = time.perf_counter() - start
+    await processor._cleanup()
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark DataProcessor mapper backends')
+    parser.add_argument('--scale', type=float, default=1.0, help='Synthetic corpus size relative to the collection')
+    parser.add_argument('--content-scale', type=float, default=1.0, help='Multiplier of bibo:content lengths')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, os.cpu_count() or 1],
+                        help='Worker counts to benchmark for the thread and process backends')
+    args = parser.parse_args()
+
+    # Progress logging and bars would dominate the measurement
+    logging.getLogger().setLevel(logging.WARNING)
+    CSV_export.tqdm = partial(CSV_export.tqdm, disable=True)
+
+    items = items_by_category(generate_corpus(args.scale, content_scale=args.content_scale))
+    total = sum(len(items[category]) for category in CATEGORIES)
+    print(f"Mapping {total} items ({', '.join(f'{len(items[c])} {c}' for c in CATEGORIES)}) on {os.cpu_count()} CPUs")
+    print(f"{'Backend':<10} | {'Workers':>7} | {'Time (s)':>8} | {'Items/s':>9} | {'Items/s/worker':>14}")
+    print("-" * 60)
+    runs = [('inline', 1)] + [(backend, w) for w in args.workers for backend in ('thread', 'process')]
+    for backend, workers in runs:
+        elapsed = asyncio.run(run_backend(backend, workers, items))
+        rate = total / elapsed
+        print(f"{backend:<10} | {workers:>7} | {elapsed:>8.2f} | {rate:>9.0f} | {rate / workers:>14.0f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,227 @@
+"""Micro-benchmarks of the CSV_export hot paths.
+
+Runs the map_* functions, get_value/join_values and FileGenerator._write_csv_in_chunks on
+sample items and reports ns/item and allocations/item: memory blocks and bytes still held
+after the run (the output rows) and the peak bytes allocated during it, both measured
+with tracemalloc. Samples come from synthetic_corpus.py with a fixed seed, or from a
+directory of recorded items.json/item_sets.json/media.json (`synthetic_corpus.py --out`
+writes one).
+
+Save a baseline on a machine, then check later runs against it; the check exits with
+status 1 when a benchmark is slower or allocates more than the tolerance allows.
+
+Usage:
+    python Metadata/benchmarks/mappers.py --scale 1 --repeat 5
+    python Metadata/benchmarks/mappers.py --save-baseline
+    python Metadata/benchmarks/mappers.py --check --tolerance 0.15
+"""
+
+import gc
+import os
+import sys
+import json
+import math
+import time
+import asyncio
+import logging
+import argparse
+import tempfile
+import tracemalloc
+from functools import partial
+from typing import List, Dict, Any, Callable, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import CSV_export
+from CSV_export import Config, OmekaApiClient, FileGenerator, get_value, join_values
+from synthetic_corpus import generate_corpus, items_by_category
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline_mappers.json')
+
+# mapper name -> (mapper, corpus category it maps)
+SYNC_MAPPERS = {
+    'map_audio_visual_document': (CSV_export.map_audio_visual_document, 'audio_visual_documents'),
+    'map_image': (CSV_export.map_image, 'images'),
+    'map_index': (CSV_export.map_index, 'index'),
+    'map_item_set': (CSV_export.map_item_set, 'item_sets'),
+    'map_media': (CSV_export.map_media, 'media'),
+    'map_reference': (CSV_export.map_reference, 'references'),
+}
+ASYNC_MAPPERS = {
+    'map_document': (CSV_export.map_document, 'documents'),
+    'map_issue': (CSV_export.map_issue, 'issues'),
+    'map_newspaper_article': (CSV_export.map_newspaper_article, 'newspaper_articles'),
+}
+# Fields covering every branch of get_value and join_values
+GET_VALUE_FIELDS = ['o:id', 'dcterms:title', 'dcterms:subject', 'dcterms:rights', 'fabio:hasURL', 'dcterms:abstract']
+JOIN_VALUES_FIELDS = ['o:item_set', 'dcterms:subject', 'dcterms:contributor']
+
+def load_samples(samples_dir: Optional[str], scale: float) -> Dict[str, List[Dict[str, Any]]]:
+    if samples_dir is None:
+        return generate_corpus(scale, seed=0)
+    corpus = {}
+    for resource in ('items', 'item_sets', 'media'):
+        with open(os.path.join(samples_dir, f"{resource}.json"), encoding='utf-8') as f:
+            corpus[resource] = json.load(f)
+    return corpus
+
+def best_of(repeat: int, run: Callable[[], Any], min_time: float = 0.05) -> float:
+    """Best time of one `run` over `repeat` timings, each looping for at least `min_time`."""
+    start = time.perf_counter()
+    run()
+    loops = max(1, math.ceil(min_time / max(time.perf_counter() - start, 1e-9)))
+    timings = []
+    gc.disable()  # Collections triggered by earlier cases would land on whichever case runs next
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(loops):
+                run()
+            timings.append((time.perf_counter() - start) / loops)
+    finally:
+        gc.enable()
+    return min(timings)
+
+def allocations(run: Callable[[], Any]) -> tuple[int, int, int]:
+    """Return the blocks and bytes still allocated after `run`, and the peak bytes during it."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        start_bytes = tracemalloc.get_traced_memory()[0]
+        result = run()
+        peak = tracemalloc.get_traced_memory()[1] - start_bytes
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    diff = after.compare_to(before, 'filename')
+    del result
+    return sum(stat.count_diff for stat in diff), sum(stat.size_diff for stat in diff), peak
+
+def build_cases(corpus: Dict[str, List[Dict[str, Any]]], output_dir: str) -> Dict[str, tuple]:
+    """Return benchmark name -> (callable returning its results, units processed)."""
+    items = items_by_category(corpus)
+    api_client = OmekaApiClient(Config(), use_cache=False)
+    api_client.register_media(corpus['media'])
+
+    # One loop for all runs; asyncio.run() per run would cost more than mapping a small category
+    loop = asyncio.new_event_loop()
+
+    async def map_all(mapper, category_items):
+        return [await mapper(item, api_client) for item in category_items]
+
+    cases = {}
+    for name, (mapper, category) in SYNC_MAPPERS.items():
+        cases[name] = (partial(lambda m, its: [m(item) for item in its], mapper, items[category]), len(items[category]))
+    for name, (mapper, category) in ASYNC_MAPPERS.items():
+        cases[name] = (partial(lambda m, its: loop.run_until_complete(map_all(m, its)), mapper, items[category]), len(items[category]))
+
+    articles = items['newspaper_articles']
+    for field in GET_VALUE_FIELDS:
+        cases[f"get_value[{field}]"] = (partial(lambda f: [get_value(item, f) for item in articles], field), len(articles))
+    for field in JOIN_VALUES_FIELDS:
+        cases[f"join_values[{field}]"] = (partial(lambda f: [join_values(item, f, 'display_title') for item in articles], field),
+                                         len(articles))
+
+    rows = cases['map_newspaper_article'][0]()
+    generator = FileGenerator({}, output_dir)
+    csv_path = os.path.join(output_dir, 'newspaper_articles.csv')
+    cases['_write_csv_in_chunks'] = (partial(generator._write_csv_in_chunks, csv_path, rows), len(rows))
+    return cases
+
+def run_cases(cases: Dict[str, tuple], repeat: int, verbose: bool = True) -> Dict[str, Dict[str, float]]:
+    results = {}
+    if verbose:
+        print(f"{'Benchmark':<36} | {'Items':>6} | {'ns/item':>10} | {'blocks/item':>11} | {'B/item':>9} | {'peak B/item':>11}")
+        print("-" * 98)
+    for name, (run, units) in cases.items():
+        elapsed = best_of(repeat, run)
+        blocks, size, peak = allocations(run)
+        results[name] = {
+            'items': units,
+            'ns_per_item': elapsed / units * 1e9,
+            'blocks_per_item': blocks / units,
+            'bytes_per_item': size / units,
+            'peak_bytes_per_item': peak / units,
+        }
+        r = results[name]
+        if verbose:
+            print(f"{name:<36} | {units:>6} | {r['ns_per_item']:>10.0f} | {r['blocks_per_item']:>11.1f} | "
+                  f"{r['bytes_per_item']:>9.0f} | {r['peak_bytes_per_item']:>11.0f}")
+    return results
+
+def check_regressions(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+                      tolerance: float) -> Dict[str, List[str]]:
+    """Return the benchmarks regressing beyond `tolerance` with a description of each regression."""
+    regressions = {}
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        for metric in ('ns_per_item', 'blocks_per_item'):
+            # Allow one block of slack so tiny counts do not flap
+            limit = reference[metric] * (1 + tolerance) + (1 if metric == 'blocks_per_item' else 0)
+            if result[metric] > limit:
+                regressions.setdefault(name, []).append(
+                    f"{name}: {metric} {result[metric]:.1f} > baseline {reference[metric]:.1f} "
+                    f"(+{(result[metric] / reference[metric] - 1) * 100:.0f}%)")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Micro-benchmark the CSV_export hot paths')
+    parser.add_argument('--scale', type=float, default=0.5, help='Synthetic corpus size relative to the collection')
+    parser.add_argument('--samples', type=str, default=None,
+                        help='Directory with recorded items.json, item_sets.json and media.json')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per benchmark (best run is reported)')
+    parser.add_argument('--only', type=str, nargs='+', default=None, help='Run only benchmarks starting with these names')
+    parser.add_argument('--baseline', type=str, default=DEFAULT_BASELINE, help='Baseline file')
+    parser.add_argument('--save-baseline', action='store_true', help='Save the results as the baseline')
+    parser.add_argument('--check', action='store_true', help='Fail when results regress against the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.15, help='Allowed relative regression for --check')
+    parser.add_argument('--confirm', type=int, default=2, help='Re-measurements of a regression before failing')
+    args = parser.parse_args()
+
+    # Progress logging and bars would dominate the measurement
+    logging.getLogger().setLevel(logging.WARNING)
+    CSV_export.tqdm = partial(CSV_export.tqdm, disable=True)
+
+    if args.check and not os.path.exists(args.baseline):
+        sys.exit(f"No baseline at {args.baseline}; run with --save-baseline first")
+
+    corpus = load_samples(args.samples, args.scale)
+    with tempfile.TemporaryDirectory(prefix='iwac-bench-') as output_dir:
+        cases = build_cases(corpus, output_dir)
+        if args.only:
+            cases = {name: case for name, case in cases.items() if name.startswith(tuple(args.only))}
+        results = run_cases(cases, args.repeat)
+
+        regressions = {}
+        if args.check:
+            with open(args.baseline, encoding='utf-8') as f:
+                baseline = json.load(f)
+            regressions = check_regressions(results, baseline, args.tolerance)
+            # Re-measure suspects before failing; a single noisy timing should not fail the check
+            for _ in range(args.confirm):
+                if not regressions:
+                    break
+                rerun = run_cases({name: cases[name] for name in regressions}, args.repeat, verbose=False)
+                for name, result in rerun.items():
+                    result['ns_per_item'] = min(result['ns_per_item'], results[name]['ns_per_item'])
+                    results[name] = result
+                regressions = check_regressions({name: results[name] for name in regressions}, baseline, args.tolerance)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nSaved baseline to {args.baseline}")
+    if args.check:
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+            for descriptions in regressions.values():
+                for description in descriptions:
+                    print(f"  {description}")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.tolerance:.0%} against {args.baseline}")
+
+if __name__ == '__main__':
+    main()
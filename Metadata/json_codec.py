@@ -0,0 +1,64 @@
+"""JSON codec shared by Metadata/CSV_export.py and Visualisations/Overview/omeka_client.py.
+
+Both use the standard library by default; orjson is used only when requested
+(CSV_export.py --json-codec, OMEKA_JSON_CODEC for omeka_client.py).
+"""
+
+import json
+from typing import Any, Dict
+
+try:
+    import orjson
+except ImportError:  # Faster JSON is optional
+    orjson = None
+
+class JsonCodec:
+    """Pluggable JSON codec on UTF-8 bytes: the standard library, or orjson on request.
+
+    `loads` accepts bytes as read from a response or cache file and `dumps` returns bytes.
+    orjson parses the bytes directly, while the standard library decodes them to a str
+    first. orjson attaches a cached UTF-8 copy to every non-ASCII string it encodes, so
+    values that stay in memory after encoding go through `dumps_retained`, which always
+    uses the standard library. End to end, orjson saves less than the run-to-run variance
+    of an export, so it is opt-in rather than the default.
+    """
+    def __init__(self, name: str = 'json'):
+        self.use(name)
+
+    def use(self, name: str):
+        if name == 'auto':
+            name = 'orjson' if orjson is not None else 'json'
+        if name == 'orjson':
+            if orjson is None:
+                raise ValueError("The orjson codec was requested but orjson is not installed")
+            self.loads = orjson.loads
+            self.dumps = orjson.dumps
+        elif name == 'json':
+            self.loads = json.loads  # Detects the encoding of bytes itself
+            self.dumps = self.dumps_retained
+        else:
+            raise ValueError(f"Unknown JSON codec: {name}")
+        self.name = name
+
+    @staticmethod
+    def dumps_retained(value: Any) -> bytes:
+        return json.dumps(value, ensure_ascii=False).encode('utf-8')
+
+    def dumps_indented(self, value: Any) -> bytes:
+        """Encode `value` indented by two spaces, for files read by people."""
+        if self.name == 'orjson':
+            return orjson.dumps(value, option=orjson.OPT_INDENT_2)
+        return json.dumps(value, ensure_ascii=False, indent=2).encode('utf-8')
+
+    def dumps_embedding(self, fields: Dict[str, Any], name: str, raw: bytes) -> bytes:
+        """Encode `fields` plus a `name` member holding the already encoded JSON `raw`.
+
+        Response bodies are embedded as received instead of being re-encoded from the decoded
+        objects, which stay in memory.
+        """
+        head = self.dumps(fields)
+        separator = b',' if len(head) > 2 else b''
+        return b''.join((head[:-1], separator, self.dumps(name), b':', raw, b'}'))
+
+# Process-wide codec for API responses, cache entries and output files
+json_codec = JsonCodec()
@@ -0,0 +1,198 @@
+"""Mock Omeka S API for load-testing the export scripts offline.
+
+Serves a synthetic_corpus.py corpus of items, item sets, media, resource templates and
+resource classes with the pagination behaviour of Omeka S (`page`/`per_page`,
+`sort_by`/`sort_order`, the `Omeka-S-Total-Results` and `Link` headers), plus injectable
+latency, server errors and 429 responses. Request counters are available at `/__stats`.
+
+Usage:
+    python Metadata/mock_omeka_server.py --scale 10 --latency-ms 40 --error-rate 0.01
+    OMEKA_BASE_URL=http://127.0.0.1:8765/api python Metadata/CSV_export.py --cache no
+"""
+
+import json
+import random
+import asyncio
+import logging
+import argparse
+from collections import Counter
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional
+
+from aiohttp import web
+
+from synthetic_corpus import generate_corpus
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+@dataclass
+class MockSettings:
+    latency_ms: float = 0.0  # Added to every response
+    jitter_ms: float = 0.0  # Uniform random extra latency
+    error_rate: float = 0.0  # Share of requests answered with HTTP 500
+    throttle_rate: float = 0.0  # Share of requests answered with HTTP 429
+    max_concurrency: int = 0  # Requests beyond this many in flight get HTTP 429 (0: unlimited)
+    retry_after: int = 1  # Retry-After header of 429 responses
+    default_per_page: int = 25  # Omeka S default page size
+
+class MockOmekaServer:
+    """aiohttp application answering Omeka S API requests from an in-memory corpus."""
+    def __init__(self, corpus: Dict[str, List[Dict[str, Any]]], settings: Optional[MockSettings] = None):
+        self.corpus = corpus
+        self.settings = settings or MockSettings()
+        self.by_id = {resource: {r['o:id']: r for r in records} for resource, records in corpus.items()}
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests = Counter()  # Requests per resource
+        self.statuses = Counter()  # Responses per status code
+        self._rng = random.Random()
+
+    def make_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._inject_faults])
+        app.router.add_get('/__stats', self.handle_stats)
+        app.router.add_get('/api/{resource}', self.handle_list)
+        app.router.add_get('/api/{resource}/{id}', self.handle_get)
+        return app
+
+    @web.middleware
+    async def _inject_faults(self, request: web.Request, handler):
+        if request.path == '/__stats':
+            return await handler(request)
+        self.requests[request.match_info.get('resource', request.path)] += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            settings = self.settings
+            delay = settings.latency_ms + self._rng.uniform(0, settings.jitter_ms)
+            if delay:
+                await asyncio.sleep(delay / 1000)
+            if ((settings.max_concurrency and self.in_flight > settings.max_concurrency)
+                    or self._rng.random() < settings.throttle_rate):
+                response = web.json_response({'errors': {'error': 'Too Many Requests'}}, status=429,
+                                             headers={'Retry-After': str(settings.retry_after)})
+            elif self._rng.random() < settings.error_rate:
+                response = web.json_response({'errors': {'error': 'Internal Server Error'}}, status=500)
+            else:
+                response = await handler(request)
+        finally:
+            self.in_flight -= 1
+        self.statuses[response.status] += 1
+        return response
+
+    def _records(self, resource: str) -> List[Dict[str, Any]]:
+        if resource not in self.corpus:
+            raise web.HTTPNotFound(text=json.dumps({'errors': {'error': f"Unknown resource {resource}"}}),
+                                   content_type='application/json')
+        return self.corpus[resource]
+
+    async def handle_list(self, request: web.Request) -> web.Response:
+        resource = request.match_info['resource']
+        query = request.query
+        records = self._records(resource)
+
+        if 'resource_class_id' in query:
+            class_id = int(query['resource_class_id'])
+            records = [r for r in records if (r.get('o:resource_class') or {}).get('o:id') == class_id]
+        if 'item_set_id' in query:
+            set_id = int(query['item_set_id'])
+            records = [r for r in records if any(s.get('o:id') == set_id for s in r.get('o:item_set', []))]
+        if 'item_id' in query:
+            item_id = int(query['item_id'])
+            records = [r for r in records if (r.get('o:item') or {}).get('o:id') == item_id]
+        if 'id[]' in query:
+            ids = {int(value) for value in query.getall('id[]')}
+            records = [r for r in records if r['o:id'] in ids]
+
+        sort_by = query.get('sort_by', 'id')
+        descending = query.get('sort_order', 'asc').lower() == 'desc'
+        if sort_by in ('created', 'modified'):
+            # Like MySQL, unset stamps sort first ascending and last descending
+            sort_key = lambda r: ((r.get(f'o:{sort_by}') or {}).get('@value') or '', r['o:id'])
+        elif sort_by == 'title':
+            sort_key = lambda r: (r.get('o:title') or r.get('o:label') or '', r['o:id'])
+        else:
+            sort_key = lambda r: r['o:id']
+        records = sorted(records, key=sort_key, reverse=descending)
+
+        total = len(records)
+        per_page = max(1, int(query.get('per_page', self.settings.default_per_page)))
+        page = max(1, int(query.get('page', 1)))
+        last_page = max(1, -(-total // per_page))
+        headers = {
+            'Omeka-S-Total-Results': str(total),
+            'Link': self._link_header(request, page, last_page),
+        }
+        if request.method == 'HEAD':
+            return web.Response(headers=headers, content_type='application/json')
+        return web.json_response(records[(page - 1) * per_page:page * per_page], headers=headers)
+
+    @staticmethod
+    def _link_header(request: web.Request, page: int, last_page: int) -> str:
+        url = lambda target: str(request.url.update_query(page=target))
+        links = [f'<{url(1)}>; rel="first"']
+        if page > 1:
+            links.append(f'<{url(page - 1)}>; rel="prev"')
+        if page < last_page:
+            links.append(f'<{url(page + 1)}>; rel="next"')
+        links.append(f'<{url(last_page)}>; rel="last"')
+        return ', '.join(links)
+
+    async def handle_get(self, request: web.Request) -> web.Response:
+        resource = request.match_info['resource']
+        self._records(resource)
+        try:
+            record = self.by_id[resource].get(int(request.match_info['id']))
+        except ValueError:
+            record = None
+        if record is None:
+            return web.json_response({'errors': {'error': 'Resource not found'}}, status=404)
+        return web.json_response(record)
+
+    async def handle_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(self.stats())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'requests': sum(self.requests.values()),
+            'by_resource': dict(self.requests),
+            'statuses': {str(status): count for status, count in self.statuses.items()},
+            'peak_in_flight': self.peak_in_flight,
+        }
+
+async def start_server(server: MockOmekaServer, host: str = '127.0.0.1', port: int = 8765) -> web.AppRunner:
+    """Start the mock in the running event loop; call `cleanup()` on the returned runner to stop it."""
+    runner = web.AppRunner(server.make_app(), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a mock Omeka S API with synthetic data')
+    parser.add_argument('--host', type=str, default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--scale', type=float, default=1.0, help='Corpus size relative to the current collection')
+    parser.add_argument('--content-scale', type=float, default=1.0, help='Multiplier of bibo:content lengths')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the synthetic corpus')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Latency added to every response')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='Uniform random extra latency')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of requests failing with HTTP 500')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Share of requests answered with HTTP 429')
+    parser.add_argument('--max-concurrency', type=int, default=0,
+                        help='Answer HTTP 429 beyond this many concurrent requests (0: unlimited)')
+    args = parser.parse_args()
+
+    settings = MockSettings(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate, max_concurrency=args.max_concurrency
+    )
+    corpus = generate_corpus(args.scale, args.seed, args.content_scale)
+    logger.info(
+        f"Serving {len(corpus['items'])} items, {len(corpus['item_sets'])} item sets and "
+        f"{len(corpus['media'])} media on http://{args.host}:{args.port}/api"
+    )
+    web.run_app(MockOmekaServer(corpus, settings).make_app(), host=args.host, port=args.port,
+                access_log=None, print=None)
+
+if __name__ == "__main__":
+    main()
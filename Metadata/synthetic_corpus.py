@@ -0,0 +1,548 @@
+"""Generate an Omeka S-shaped synthetic corpus for scale testing the export.
+
+Produces items for every resource class CSV_export handles (documents, audio-visual
+documents, images, the index classes, issues, newspaper articles and references), plus
+item sets, media, resource templates and resource classes. Fill rates, value counts and
+text lengths per property were measured on the Metadata/CSV/*.csv exports; the shares of
+articles, issues and references, which have no CSV there, are estimates. `scale=1` gives
+roughly today's 12k items, `scale=10` and `scale=100` the projected growth.
+
+The corpus feeds the mappers directly (see benchmarks/) and backs mock_omeka_server.py.
+
+Usage:
+    python Metadata/synthetic_corpus.py --scale 10 --out /tmp/corpus
+"""
+
+import os
+import math
+import json
+import itertools
+import random
+import logging
+import argparse
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional, Tuple
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+API_URL = "https://islam.zmo.de/api"
+FILES_URL = "https://islam.zmo.de/files"
+
+# term, label and item count at scale 1
+RESOURCE_CLASSES = {
+    49: ('bibo:Document', 'Document', 30),
+    38: ('bibo:AudioVisualDocument', 'Audio-Visual Document', 45),
+    58: ('bibo:Image', 'Image', 30),
+    244: ('fabio:AuthorityFile', 'Authority File', 526),
+    54: ('bibo:Event', 'Event', 242),
+    9: ('dcterms:Location', 'Location', 683),
+    96: ('foaf:Organization', 'Organization', 413),
+    94: ('foaf:Person', 'Person', 2833),
+    60: ('bibo:Issue', 'Issue', 700),
+    36: ('bibo:Article', 'Article', 6000),
+    35: ('bibo:AcademicArticle', 'Academic Article', 250),
+    43: ('bibo:Chapter', 'Chapter', 120),
+    88: ('bibo:Thesis', 'Thesis', 40),
+    40: ('bibo:Book', 'Book', 150),
+    82: ('bibo:Report', 'Report', 30),
+    178: ('fabio:BookReview', 'Book Review', 15),
+    52: ('bibo:EditedBook', 'Edited Book', 20),
+    77: ('bibo:PersonalCommunication', 'Personal Communication', 5),
+    305: ('fabio:BlogPost', 'Blog Post', 10),
+}
+ITEM_SETS_AT_SCALE_1 = 123
+
+# Resource classes of each CSV_export output category
+CATEGORY_CLASSES = {
+    'documents': [49],
+    'audio_visual_documents': [38],
+    'images': [58],
+    'index': [244, 54, 9, 96, 94],
+    'issues': [60],
+    'newspaper_articles': [36],
+    'references': [35, 43, 88, 40, 82, 178, 52, 77, 305],
+}
+
+# dcterms:identifier prefixes; item sets use 'collection'
+IDENTIFIER_PREFIXES = {
+    49: 'document', 38: 'video', 58: 'image', 60: 'issue', 36: 'article',
+    **{class_id: 'index' for class_id in CATEGORY_CLASSES['index']},
+    **{class_id: 'reference' for class_id in CATEGORY_CLASSES['references']},
+}
+
+# Property profiles: (property, kind, fill rate, mean value count, max value count, text
+# length median, text length p90). Kinds select the value generator in CorpusGenerator.
+Profile = Tuple[str, str, float, float, int, int, int]
+
+_COMMON_TAIL: List[Profile] = [
+    ('dcterms:rights', 'rights', 0.96, 1, 1, 0, 0),
+    ('dcterms:language', 'language', 1.0, 1, 1, 0, 0),
+]
+
+PROFILES: Dict[str, List[Profile]] = {
+    'documents': [
+        ('dcterms:identifier', 'identifier', 0.96, 1, 1, 0, 0),
+        ('dcterms:title', 'text', 1.0, 1, 1, 68, 138),
+        ('dcterms:creator', 'person', 0.38, 1, 1, 0, 0),
+        ('dcterms:date', 'date', 0.77, 1, 1, 0, 0),
+        ('dcterms:abstract', 'text', 0.23, 1, 1, 100, 634),
+        ('bibo:numPages', 'number', 1.0, 1, 1, 8, 40),
+        ('dcterms:subject', 'subject', 1.0, 3.23, 12, 0, 0),
+        ('dcterms:spatial', 'place', 1.0, 2.42, 11, 0, 0),
+        ('dcterms:source', 'newspaper', 0.42, 1, 1, 0, 0),
+        ('dcterms:contributor', 'name', 1.0, 1, 1, 0, 0),
+        ('bibo:content', 'content', 1.0, 1, 1, 4822, 45887),
+    ] + _COMMON_TAIL,
+    'audio_visual_documents': [
+        ('dcterms:identifier', 'identifier', 1.0, 1, 1, 0, 0),
+        ('dcterms:title', 'text', 1.0, 1, 1, 20, 44),
+        ('dcterms:creator', 'organization', 1.0, 1, 1, 0, 0),
+        ('dcterms:publisher', 'organization', 1.0, 1, 1, 0, 0),
+        ('dcterms:description', 'text', 0.22, 2.1, 3, 319, 812),
+        ('dcterms:date', 'date', 0.33, 1, 1, 0, 0),
+        ('bibo:volume', 'number', 0.04, 1, 1, 2, 5),
+        ('bibo:issue', 'number', 0.47, 2.76, 4, 20, 200),
+        ('dcterms:isPartOf', 'newspaper', 0.53, 1, 1, 0, 0),
+        ('dcterms:extent', 'duration', 1.0, 1, 1, 0, 0),
+        ('dcterms:medium', 'medium', 0.98, 1, 1, 0, 0),
+        ('dcterms:subject', 'subject', 0.51, 1.3, 3, 0, 0),
+        ('dcterms:spatial', 'place', 1.0, 2.0, 3, 0, 0),
+        ('dcterms:rights', 'rights', 1.0, 1, 1, 0, 0),
+        ('dcterms:language', 'language', 0.98, 1.75, 2, 0, 0),
+        ('dcterms:source', 'newspaper', 1.0, 1, 1, 0, 0),
+        ('dcterms:contributor', 'name', 1.0, 2, 2, 0, 0),
+        ('bibo:content', 'content', 0.02, 1, 1, 678, 678),
+    ],
+    'images': [
+        ('dcterms:identifier', 'identifier', 1.0, 1, 1, 0, 0),
+        ('dcterms:title', 'text', 1.0, 1.03, 2, 30, 54),
+        ('dcterms:creator', 'person', 1.0, 1, 1, 0, 0),
+        ('dcterms:date', 'date', 1.0, 1, 1, 0, 0),
+        ('dcterms:description', 'text', 0.07, 1.5, 2, 173, 246),
+        ('dcterms:subject', 'subject', 0.63, 1, 1, 0, 0),
+        ('dcterms:rights', 'rights', 1.0, 1, 1, 0, 0),
+        ('dcterms:spatial', 'place', 1.0, 1.47, 3, 0, 0),
+        ('curation:coordinates', 'coordinates', 0.47, 1, 1, 0, 0),
+    ],
+    'index': [
+        ('dcterms:identifier', 'identifier', 0.94, 1, 1, 0, 0),
+        ('dcterms:alternative', 'text_fr', 0.33, 1.4, 19, 15, 44),
+        ('dcterms:created', 'date', 0.02, 1, 1, 0, 0),
+        ('dcterms:date', 'date', 0.07, 1, 1, 0, 0),
+        ('dcterms:description', 'text', 0.13, 1.65, 2, 46, 119),
+        ('dcterms:relation', 'subject', 0.05, 1.52, 8, 0, 0),
+        ('dcterms:isReplacedBy', 'subject', 0.003, 1, 1, 0, 0),
+        ('dcterms:replaces', 'subject', 0.003, 1.08, 2, 0, 0),
+        ('dcterms:isPartOf', 'subject', 0.61, 1.19, 5, 0, 0),
+        ('dcterms:hasPart', 'subject', 0.01, 6.23, 47, 0, 0),
+        ('dcterms:spatial', 'place', 0.66, 1.03, 8, 0, 0),
+        ('dcterms:type', 'index_type', 1.0, 1, 1, 0, 0),
+    ],
+    'issues': [
+        ('dcterms:identifier', 'identifier', 0.96, 1, 1, 0, 0),
+        ('dcterms:title', 'text', 1.0, 1, 1, 40, 80),
+        ('dcterms:publisher', 'newspaper', 1.0, 1, 1, 0, 0),
+        ('dcterms:date', 'date', 1.0, 1, 1, 0, 0),
+        ('dcterms:type', 'literal_type', 1.0, 1, 1, 0, 0),
+        ('bibo:issue', 'number', 0.9, 1, 1, 500, 3000),
+        ('bibo:numPages', 'number', 0.9, 1, 1, 16, 32),
+        ('dcterms:subject', 'subject', 0.6, 3.23, 12, 0, 0),
+        ('dcterms:spatial', 'place', 0.8, 2.42, 11, 0, 0),
+        ('dcterms:contributor', 'name', 1.0, 1, 1, 0, 0),
+        ('fabio:hasURL', 'url', 0.3, 1, 1, 0, 0),
+        ('bibo:content', 'content', 1.0, 1, 1, 4822, 45887),
+    ] + _COMMON_TAIL,
+    'newspaper_articles': [
+        ('dcterms:identifier', 'identifier', 0.96, 1, 1, 0, 0),
+        ('dcterms:title', 'text', 1.0, 1, 1, 68, 138),
+        ('dcterms:creator', 'person', 0.6, 1.1, 4, 0, 0),
+        ('dcterms:publisher', 'newspaper', 1.0, 1, 1, 0, 0),
+        ('dcterms:date', 'date', 0.98, 1, 1, 0, 0),
+        ('dcterms:type', 'literal_type', 1.0, 1, 1, 0, 0),
+        ('dcterms:abstract', 'text', 0.1, 1, 1, 100, 634),
+        ('bibo:pages', 'number', 0.8, 1, 1, 8, 30),
+        ('bibo:numPages', 'number', 0.9, 1, 1, 1, 3),
+        ('dcterms:subject', 'subject', 0.95, 3.23, 12, 0, 0),
+        ('dcterms:spatial', 'place', 0.95, 2.42, 11, 0, 0),
+        ('dcterms:source', 'newspaper', 0.42, 1, 1, 0, 0),
+        ('dcterms:contributor', 'name', 1.0, 1, 1, 0, 0),
+        ('fabio:hasURL', 'url', 0.2, 1, 1, 0, 0),
+        ('bibo:content', 'content', 1.0, 1, 1, 4822, 45887),
+    ] + _COMMON_TAIL,
+    'references': [
+        ('dcterms:identifier', 'identifier', 0.9, 1, 1, 0, 0),
+        ('dcterms:title', 'text', 1.0, 1, 1, 68, 138),
+        ('bibo:authorList', 'person', 0.9, 1.8, 8, 0, 0),
+        ('bibo:editorList', 'person', 0.15, 1.5, 4, 0, 0),
+        ('dcterms:publisher', 'organization', 0.7, 1, 1, 0, 0),
+        ('dcterms:date', 'date', 0.95, 1, 1, 0, 0),
+        ('dcterms:type', 'literal_type', 0.3, 1, 1, 0, 0),
+        ('dcterms:alternative', 'text', 0.05, 1, 1, 40, 90),
+        ('bibo:volume', 'number', 0.3, 1, 1, 12, 60),
+        ('bibo:issue', 'number', 0.3, 1, 1, 3, 12),
+        ('dcterms:abstract', 'text', 0.4, 1, 1, 100, 634),
+        ('bibo:numPages', 'number', 0.5, 1, 1, 200, 450),
+        ('bibo:pageStart', 'number', 0.5, 1, 1, 40, 300),
+        ('bibo:pageEnd', 'number', 0.5, 1, 1, 60, 320),
+        ('dcterms:isPartOf', 'newspaper', 0.4, 1, 1, 0, 0),
+        ('dcterms:subject', 'subject', 0.8, 3, 12, 0, 0),
+        ('dcterms:spatial', 'place', 0.7, 1.5, 6, 0, 0),
+        ('dcterms:language', 'language', 1.0, 1, 1, 0, 0),
+        ('bibo:doi', 'doi', 0.2, 1, 1, 0, 0),
+        ('fabio:hasURL', 'url', 0.4, 1, 1, 0, 0),
+        ('bibo:content', 'content', 0.3, 1, 1, 4822, 45887),
+    ],
+    'item_sets': [
+        ('dcterms:identifier', 'identifier', 0.95, 1, 1, 0, 0),
+        ('dcterms:description', 'text_fr', 0.8, 1, 1, 62, 108),
+        ('dcterms:creator', 'person', 0.15, 1.11, 2, 0, 0),
+        ('dcterms:date', 'date', 0.73, 1, 1, 0, 0),
+        ('dcterms:replaces', 'subject', 0.07, 1, 1, 0, 0),
+        ('dcterms:isReplacedBy', 'subject', 0.07, 1, 1, 0, 0),
+        ('dcterms:spatial', 'country', 0.93, 1, 1, 0, 0),
+        ('dcterms:language', 'language', 0.88, 1.18, 5, 0, 0),
+        ('dcterms:rights', 'rights', 0.93, 1, 1, 0, 0),
+        ('dcterms:rightsHolder', 'organization', 0.19, 1, 1, 0, 0),
+        ('dcterms:source', 'newspaper', 0.51, 1.1, 3, 0, 0),
+        ('dcterms:contributor', 'name', 0.89, 1.07, 3, 0, 0),
+    ],
+}
+
+# Properties of single index classes: (property, kind, fill rate)
+INDEX_CLASS_PROFILES = {
+    94: [('foaf:firstName', 'first_name', 0.55), ('foaf:lastName', 'last_name', 0.55),
+         ('foaf:gender', 'gender', 0.35), ('foaf:birthday', 'date', 0.08)],
+    9: [('curation:coordinates', 'coordinates', 0.81)],
+}
+
+# Media per item: (fill rate, mean count, max count, media type)
+MEDIA_PROFILES = {
+    'documents': (1.0, 12.08, 97, 'application/pdf'),
+    'audio_visual_documents': (0.98, 5.07, 21, 'video/mp4'),
+    'images': (1.0, 1.97, 6, 'image/jpeg'),
+    'index': (0.03, 1.13, 17, 'image/jpeg'),
+    'issues': (1.0, 12.0, 64, 'application/pdf'),
+    'newspaper_articles': (1.0, 1.5, 6, 'application/pdf'),
+    'references': (0.5, 1.0, 2, 'application/pdf'),
+}
+
+COUNTRIES = ['Bénin', 'Burkina Faso', "Côte d'Ivoire", 'Niger', 'Nigeria', 'Togo']
+LANGUAGES = [('Français', 0.86), ('Anglais', 0.05), ('Arabe', 0.04), ('Haoussa', 0.03), ('Dendi', 0.01), ('Yoruba', 0.01)]
+NEWSPAPERS = [
+    'Fraternité Matin', 'Sidwaya', "L'Observateur Paalga", 'La Nation', 'Le Sahel', 'Togo-Presse',
+    'Daily Trust', 'Le Pays', 'Notre Voie', "L'Autre Quotidien", 'Le Matinal', 'Ehuzu', 'Le Républicain',
+    'Nigerian Tribune', 'Le Patriote', 'Aujourd\'hui au Faso', 'Le Nouvel Horizon', 'Soir Info',
+]
+RIGHTS = [
+    ('In Copyright - Educational Use Permitted', 'http://rightsstatements.org/vocab/InC-EDU/1.0/'),
+    ('In Copyright', 'http://rightsstatements.org/vocab/InC/1.0/'),
+    ('Copyright Not Evaluated', 'http://rightsstatements.org/vocab/CNE/1.0/'),
+]
+ARTICLE_TYPES = ['Article de presse', 'Éditorial', 'Interview', 'Reportage', 'Brève', 'Numéro de presse']
+WORDS = (
+    "islam musulmans mosquée imam prière ramadan tabaski association jeunesse islamique conseil "
+    "supérieur fédération union communauté religieuse fidèles prêche école coranique médersa "
+    "enseignement arabe pèlerinage lieux saints gouvernement ministère cultes laïcité dialogue "
+    "interreligieux chrétiens paix cohésion sociale développement femmes solidarité zakat "
+    "conférence séminaire congrès célébration fête cérémonie président secrétaire général bureau "
+    "national région quartier ville capitale marché hadj sermon vendredi construction financement "
+    "ONG aide humanitaire formation prédicateurs radio télévision presse journal déclaration"
+).split()
+SYLLABLES = "ba bou da di fa ga ka ki ko la ma mou na ni ou sa se si so ta to ya za dra kou mam sou ade ola yus".split()
+
+def _lognormal_sampler(median: int, p90: int):
+    """Return a sampler of positive lengths with the given median and 90th percentile."""
+    mu = math.log(max(median, 1))
+    sigma = math.log(max(p90, median + 1) / max(median, 1)) / 1.2816
+    return lambda rng: max(1, int(rng.lognormvariate(mu, sigma)))
+
+class CorpusGenerator:
+    """Deterministic generator of Omeka S JSON records modelled on the exported CSVs."""
+    def __init__(self, scale: float = 1.0, seed: int = 0, content_scale: float = 1.0):
+        self.scale = scale
+        self.content_scale = content_scale
+        self.rng = random.Random(seed)
+        self.next_id = 1
+        self.current_id = 0  # Id of the record being generated
+        self.base_time = datetime(2021, 1, 1, tzinfo=timezone.utc)
+        self._samplers = {}
+        # A long French-looking text; content and phrases are slices of it
+        self.text = ' '.join(self.rng.choice(WORDS) for _ in range(60000))
+        self.first_names = sorted({self._word(2, 3).capitalize() for _ in range(600)})
+        self.last_names = sorted({self._word(2, 4).capitalize() for _ in range(1200)})
+        self.places = COUNTRIES + sorted({self._word(2, 4).capitalize() for _ in range(400)})
+        self.item_set_ids: List[int] = []
+        # Vocabularies of linked index items, filled as index items are generated
+        self.vocab: Dict[str, List[Tuple[int, str]]] = {'subject': [], 'place': [], 'person': [], 'organization': []}
+        self._vocab_weights: Dict[str, List[float]] = {}
+
+    def _word(self, low: int, high: int) -> str:
+        return ''.join(self.rng.choice(SYLLABLES) for _ in range(self.rng.randint(low, high)))
+
+    def _count(self, mean: float, maximum: int) -> int:
+        if maximum <= 1 or mean <= 1:
+            return 1
+        return min(maximum, 1 + int(self.rng.expovariate(1 / (mean - 1))))
+
+    def _length(self, median: int, p90: int) -> int:
+        key = (median, p90)
+        if key not in self._samplers:
+            self._samplers[key] = _lognormal_sampler(median, p90)
+        return self._samplers[key](self.rng)
+
+    def _stamp(self, days: float) -> Dict[str, str]:
+        return {'@value': (self.base_time + timedelta(days=days)).isoformat(),
+                '@type': 'http://www.w3.org/2001/XMLSchema#dateTime'}
+
+    def _slice(self, length: int) -> str:
+        """A run of whole words of about `length` characters."""
+        length = min(length, len(self.text) // 2)
+        start = self.text.find(' ', self.rng.randrange(0, len(self.text) - length)) + 1
+        end = self.text.rfind(' ', start, start + length)
+        return self.text[start:end if end > start else start + length]
+
+    def _phrase(self, median: int, p90: int) -> str:
+        phrase = self._slice(self._length(median, p90))
+        return phrase[:1].upper() + phrase[1:]
+
+    def _content(self, median: int, p90: int) -> str:
+        return self._slice(max(1, int(self._length(median, p90) * self.content_scale)))
+
+    def _pick_vocab(self, kind: str) -> Tuple[int, str]:
+        entries = self.vocab[kind]
+        if not entries:
+            return 0, self.rng.choice(self.places)
+        if len(self._vocab_weights.get(kind, ())) != len(entries):
+            # Zipf-like popularity: a few subjects and places are used by most items
+            self._vocab_weights[kind] = list(itertools.accumulate(1 / rank for rank in range(1, len(entries) + 1)))
+        return self.rng.choices(entries, cum_weights=self._vocab_weights[kind])[0]
+
+    def _values(self, kind: str, count: int, median: int, p90: int, class_id: int) -> List[Dict[str, Any]]:
+        rng = self.rng
+        literal = lambda value, lang=None: {'type': 'literal', 'is_public': True, '@value': value,
+                                            **({'@language': lang} if lang else {})}
+        resource = lambda resource_id, title: {'type': 'resource:item', 'is_public': True,
+                                               'value_resource_id': resource_id,
+                                               '@id': f"{API_URL}/items/{resource_id}",
+                                               'display_title': title}
+        if kind == 'text':
+            return [literal(self._phrase(median, p90)) for _ in range(count)]
+        if kind == 'text_fr':
+            return [literal(self._phrase(median, p90), 'fr') for _ in range(count)]
+        if kind == 'content':
+            return [literal(self._content(median, p90))]
+        if kind == 'number':
+            return [literal(str(self._length(median, p90))) for _ in range(count)]
+        if kind == 'date':
+            return [literal(f"{rng.randint(1960, 2023)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}")]
+        if kind == 'identifier':
+            return [literal(f"iwac-{IDENTIFIER_PREFIXES.get(class_id, 'collection')}-{self.current_id:07d}")]
+        if kind in ('subject', 'place', 'person', 'organization'):
+            return [resource(*self._pick_vocab(kind)) for _ in range(count)]
+        if kind == 'country':
+            return [resource(0, rng.choice(COUNTRIES))]
+        if kind == 'language':
+            languages = rng.choices([l for l, _ in LANGUAGES], [w for _, w in LANGUAGES], k=count)
+            return [resource(0, language) for language in dict.fromkeys(languages)]
+        if kind == 'newspaper':
+            return [resource(0, rng.choice(NEWSPAPERS)) for _ in range(count)]
+        if kind == 'rights':
+            label, uri = rng.choice(RIGHTS)
+            return [{'type': 'uri', 'is_public': True, '@id': uri, 'o:label': label}]
+        if kind == 'url':
+            return [{'type': 'uri', 'is_public': True, '@id': f"https://example.org/{self._word(2, 4)}/{self.current_id}"}]
+        if kind == 'doi':
+            return [literal(f"10.{rng.randint(1000, 9999)}/{self._word(2, 3)}.{rng.randint(1, 99999)}")]
+        if kind == 'name':
+            return [literal(f"{rng.choice(self.first_names)} {rng.choice(self.last_names)}") for _ in range(count)]
+        if kind == 'first_name':
+            return [literal(rng.choice(self.first_names))]
+        if kind == 'last_name':
+            return [literal(rng.choice(self.last_names))]
+        if kind == 'gender':
+            return [literal(rng.choices(['Homme', 'Femme'], [0.85, 0.15])[0])]
+        if kind == 'coordinates':
+            return [literal(f"{rng.uniform(4.0, 16.0):.5f}, {rng.uniform(-8.0, 14.0):.5f}")]
+        if kind == 'duration':
+            return [literal(f"{rng.randint(0, 2)}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}")]
+        if kind == 'medium':
+            return [literal(rng.choices(['MP4', 'MP3'], [0.8, 0.2])[0])]
+        if kind == 'index_type':
+            return [resource(0, RESOURCE_CLASSES[class_id][1])]
+        if kind == 'literal_type':
+            return [literal(rng.choice(ARTICLE_TYPES))]
+        raise ValueError(f"Unknown value kind: {kind}")
+
+    def _properties(self, profiles: List[Profile], class_id: int) -> Dict[str, List[Dict[str, Any]]]:
+        properties = {}
+        for prop, kind, fill, mean, maximum, median, p90 in profiles:
+            if fill >= 1.0 or self.rng.random() < fill:
+                properties[prop] = self._values(kind, self._count(mean, maximum), median, p90, class_id)
+        return properties
+
+    def _record_base(self, resource_type: str, extra_type: Optional[str] = None) -> Dict[str, Any]:
+        created = self.rng.uniform(0, 1500)
+        resource_id = self.current_id = self.next_id
+        self.next_id += 1
+        return {
+            '@id': f"{API_URL}/{resource_type}/{resource_id}",
+            '@type': ['o:Item', extra_type] if extra_type else 'o:ItemSet',
+            'o:id': resource_id,
+            'o:is_public': self.rng.random() > 0.02,
+            'o:created': self._stamp(created),
+            # Omeka S leaves o:modified unset until a resource is first edited
+            'o:modified': self._stamp(created + self.rng.uniform(0, 300)) if self.rng.random() < 0.6 else None,
+        }
+
+    def item_sets(self) -> List[Dict[str, Any]]:
+        records = []
+        for _ in range(max(1, round(ITEM_SETS_AT_SCALE_1 * self.scale))):
+            record = self._record_base('item_sets')
+            title = self._phrase(13, 25)
+            record['o:title'] = title
+            record['dcterms:title'] = [{'type': 'literal', 'is_public': True, '@value': title}]
+            record.update(self._properties(PROFILES['item_sets'], 0))
+            records.append(record)
+        self.item_set_ids = [record['o:id'] for record in records]
+        return records
+
+    def items(self, category: str, class_id: int, count: int) -> List[Dict[str, Any]]:
+        term = RESOURCE_CLASSES[class_id][0]
+        profiles = PROFILES[category]
+        class_profiles = INDEX_CLASS_PROFILES.get(class_id, [])
+        # Each category is spread over its own handful of item sets, as in the collection
+        offset = list(CATEGORY_CLASSES).index(category)
+        set_pool = self.item_set_ids[offset::len(CATEGORY_CLASSES)] or self.item_set_ids
+        records = []
+        for _ in range(count):
+            item = self._record_base('items', term)
+            item['o:resource_class'] = {'@id': f"{API_URL}/resource_classes/{class_id}", 'o:id': class_id}
+            item['o:resource_template'] = {'@id': f"{API_URL}/resource_templates/{class_id}", 'o:id': class_id}
+            item_set_id = self.rng.choice(set_pool)
+            item['o:item_set'] = [{'@id': f"{API_URL}/item_sets/{item_set_id}", 'o:id': item_set_id}]
+            if category == 'index':
+                title = self._index_title(class_id)
+                item['dcterms:title'] = [{'type': 'literal', 'is_public': True, '@value': title, '@language': 'fr'}]
+            item.update(self._properties(profiles, class_id))
+            for prop, kind, fill in class_profiles:
+                if self.rng.random() < fill:
+                    item[prop] = self._values(kind, 1, 0, 0, class_id)
+            title_values = item.get('dcterms:title')
+            item['o:title'] = title_values[0]['@value'] if title_values else None
+            records.append(item)
+        if category == 'index':
+            self._add_vocab(class_id, records)
+        return records
+
+    def _index_title(self, class_id: int) -> str:
+        if class_id == 94:
+            return f"{self.rng.choice(self.first_names)} {self.rng.choice(self.last_names)}"
+        if class_id == 9:
+            return self.rng.choice(self.places)
+        return self._phrase(15, 32)
+
+    def _add_vocab(self, class_id: int, records: List[Dict[str, Any]]):
+        entries = [(record['o:id'], record['o:title']) for record in records]
+        kind = {9: 'place', 94: 'person', 96: 'organization'}.get(class_id, 'subject')
+        self.vocab[kind].extend(entries)
+        # Persons and organisations are subjects too
+        if kind != 'place' and kind != 'subject':
+            self.vocab['subject'].extend(entries)
+
+    def media(self, category: str, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        fill, mean, maximum, media_type = MEDIA_PROFILES[category]
+        extension = media_type.split('/')[-1]
+        records = []
+        for item in items:
+            if fill < 1.0 and self.rng.random() >= fill:
+                item['o:media'] = []
+                continue
+            links = []
+            for position in range(1, self._count(mean, maximum) + 1):
+                media_id = self.next_id
+                self.next_id += 1
+                digest = f"{self.rng.getrandbits(160):040x}"
+                records.append({
+                    '@id': f"{API_URL}/media/{media_id}",
+                    '@type': 'o:Media',
+                    'o:id': media_id,
+                    'o:is_public': item['o:is_public'],
+                    'o:item': {'@id': f"{API_URL}/items/{item['o:id']}", 'o:id': item['o:id']},
+                    'o:position': position,
+                    'o:media_type': media_type,
+                    'o:source': f"{self._word(2, 4)}.{extension}",
+                    'o:original_url': f"{FILES_URL}/original/{digest}.{extension}",
+                    'o:thumbnail_urls': {'large': f"{FILES_URL}/large/{digest}.jpg"},
+                    'o:created': item['o:created'],
+                    'o:modified': None,
+                })
+                links.append({'@id': f"{API_URL}/media/{media_id}", 'o:id': media_id})
+            item['o:media'] = links
+            item['o:primary_media'] = links[0]
+        return records
+
+    def generate(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Generate the whole corpus keyed by API resource name."""
+        corpus = {
+            'item_sets': self.item_sets(),
+            'items': [],
+            'media': [],
+            'resource_classes': [
+                {'@id': f"{API_URL}/resource_classes/{class_id}", 'o:id': class_id, 'o:term': term, 'o:label': label}
+                for class_id, (term, label, _) in RESOURCE_CLASSES.items()
+            ],
+            'resource_templates': [
+                {'@id': f"{API_URL}/resource_templates/{class_id}", 'o:id': class_id, 'o:label': label,
+                 'o:resource_class': {'o:id': class_id},
+                 'o:resource_template_property': [
+                     {'o:property': {'o:id': property_id}, 'o:alternate_label': None, 'o:is_required': property_id == 1}
+                     for property_id in range(1, 8)
+                 ]}
+                for class_id, (_, label, _) in RESOURCE_CLASSES.items()
+            ],
+        }
+        # Index items first so the other categories can link to them
+        for category in ['index'] + [c for c in CATEGORY_CLASSES if c != 'index']:
+            for class_id in CATEGORY_CLASSES[category]:
+                count = max(1, round(RESOURCE_CLASSES[class_id][2] * self.scale))
+                items = self.items(category, class_id, count)
+                corpus['media'].extend(self.media(category, items))
+                corpus['items'].extend(items)
+        return corpus
+
+def generate_corpus(scale: float = 1.0, seed: int = 0, content_scale: float = 1.0) -> Dict[str, List[Dict[str, Any]]]:
+    """Generate a synthetic corpus; `content_scale` shrinks bibo:content for very large scales."""
+    return CorpusGenerator(scale, seed, content_scale).generate()
+
+def items_by_category(corpus: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Group corpus items by CSV_export output category, adding item sets and media."""
+    category_of_class = {class_id: category for category, class_ids in CATEGORY_CLASSES.items() for class_id in class_ids}
+    grouped = {category: [] for category in CATEGORY_CLASSES}
+    for item in corpus['items']:
+        grouped[category_of_class[item['o:resource_class']['o:id']]].append(item)
+    grouped['item_sets'] = corpus['item_sets']
+    grouped['media'] = corpus['media']
+    return grouped
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic Omeka S corpus')
+    parser.add_argument('--scale', type=float, default=1.0, help='Corpus size relative to the current collection')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--content-scale', type=float, default=1.0, help='Multiplier of bibo:content lengths')
+    parser.add_argument('--out', type=str, default=None, help='Directory for one JSON file per resource')
+    args = parser.parse_args()
+
+    corpus = generate_corpus(args.scale, args.seed, args.content_scale)
+    for category, records in items_by_category(corpus).items():
+        size = sum(len(json.dumps(record, ensure_ascii=False)) for record in records)
+        logger.info(f"{category}: {len(records)} records, {size / 1024 / 1024:.1f} MB of JSON")
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+        for resource, records in corpus.items():
+            with open(os.path.join(args.out, f"{resource}.json"), 'w', encoding='utf-8') as f:
+                json.dump(records, f, ensure_ascii=False)
+        logger.info(f"Wrote the corpus to {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -48,7 +48,8 @@ def main() -> None:
         # Verify all required environment variables are present
         required_vars: list[str] = ['OMEKA_BASE_URL', 'IWAC_KEY_IDENTITY', 'IWAC_KEY_CREDENTIAL']
         missing_vars: list[str] = [var for var in required_vars if not os.getenv(var)]
-        if missing_vars:
+        # A recorded snapshot can be replayed without API access
+        if missing_vars and not os.getenv('OMEKA_REPLAY_SNAPSHOT'):
             raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}")
             
         logger.info("Environment variables verified successfully")
@@ -6,6 +6,7 @@ including data fetching, caching, and error handling capabilities.
 
 import os
 import json
+import atexit
 import logging
 from enum import Enum
 import requests
@@ -15,6 +16,12 @@ from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional, Iterator, Tuple
 from pathlib import Path
 from datetime import datetime
+import sys
+
+# Snapshots and the JSON codec are shared with the export scripts in Metadata/
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'Metadata'))
+from api_snapshot import ApiSnapshot, snapshot_key
+from json_codec import json_codec
 
 # Set up logging
 def setup_logging(log_file='omeka_client.log'):
@@ -193,10 +200,14 @@ class OmekaConfig:
     base_url: str = field(default_factory=lambda: os.getenv('OMEKA_BASE_URL', ''))
     key_identity: str = field(default_factory=lambda: os.getenv('IWAC_KEY_IDENTITY', ''))
     key_credential: str = field(default_factory=lambda: os.getenv('IWAC_KEY_CREDENTIAL', ''))
+    record_snapshot: str = field(default_factory=lambda: os.getenv('OMEKA_RECORD_SNAPSHOT', ''))
+    replay_snapshot: str = field(default_factory=lambda: os.getenv('OMEKA_REPLAY_SNAPSHOT', ''))
+    json_codec: str = field(default_factory=lambda: os.getenv('OMEKA_JSON_CODEC', 'json'))
 
     def __post_init__(self):
         """Validate configuration after initialization"""
-        if not all([self.base_url, self.key_identity, self.key_credential]):
+        # Replaying a snapshot needs no API access
+        if not self.replay_snapshot and not all([self.base_url, self.key_identity, self.key_credential]):
             raise ValueError("Missing required environment variables")
         
         # Ensure base_url doesn't end with trailing slash
@@ -237,6 +248,16 @@ class OmekaClient:
         load_dotenv()
         self.config = config or OmekaConfig()
         self.session = self._create_session()
+        json_codec.use(self.config.json_codec)
+        self.snapshot = None
+        if self.config.replay_snapshot:
+            self.snapshot = ApiSnapshot(self.config.replay_snapshot)
+            logger.info(f"Replaying {len(self.snapshot.index)} API responses from {self.config.replay_snapshot}")
+        elif self.config.record_snapshot:
+            self.snapshot = ApiSnapshot(self.config.record_snapshot, 'w', self.config.base_url)
+            # Scripts do not close the client, so the snapshot is finalised on exit
+            atexit.register(self.snapshot.close)
+            logger.info(f"Recording API responses to {self.config.record_snapshot}")
         self.resource_class_labels = {}
         self.item_set_titles = {}
         self.item_set_countries = {}
@@ -265,9 +286,16 @@ class OmekaClient:
         Returns:
             int: Total number of items, or 0 if count cannot be determined
         """
+        key = f"HEAD {snapshot_key(resource_type.value)}"
+        if self.snapshot is not None and self.snapshot.mode == 'r':
+            replayed = self.snapshot.replay(key)
+            return (replayed[1] or 0) if replayed else 0
         try:
             response = self.session.head(f"{self.config.base_url}/{resource_type.value}")
-            return int(response.headers.get('Omeka-S-Total-Results', 0))
+            total = int(response.headers.get('Omeka-S-Total-Results', 0))
+            if self.snapshot is not None:
+                self.snapshot.record(key, b'', total)
+            return total
         except Exception as e:
             logger.warning(f"Could not get total items count: {str(e)}")
             return 0
@@ -276,6 +304,8 @@ class OmekaClient:
         """
         Make an API request with retry logic and error handling.
         
+        With a snapshot configured, the response is replayed from it or recorded into it.
+        
         Args:
             endpoint (str): API endpoint to request
             params (Optional[Dict[str, Any]]): Query parameters for the request
@@ -289,13 +319,24 @@ class OmekaClient:
         url = f"{self.config.base_url}/{endpoint}"
         params = params or {}
         
+        if self.snapshot is not None and self.snapshot.mode == 'r':
+            replayed = self.snapshot.replay(snapshot_key(endpoint, params))
+            if replayed is None:
+                raise ApiError(f"Request to {url} with {params} is not in snapshot {self.snapshot.path}")
+            return json_codec.loads(replayed[0])
+        
         max_retries = 3
         for attempt in range(max_retries):
             try:
                 response = self.session.get(url, params=params, timeout=30)
                 response.raise_for_status()
-                return response.json()
-            except requests.RequestException as e:
+                data = json_codec.loads(response.content)
+                if self.snapshot is not None:
+                    total = response.headers.get('Omeka-S-Total-Results')
+                    self.snapshot.record(snapshot_key(endpoint, params), response.content,
+                                         int(total) if total and total.isdigit() else None)
+                return data
+            except (requests.RequestException, ValueError) as e:
                 if attempt == max_retries - 1:
                     raise ApiError(f"Failed to fetch data from {url}: {str(e)}")
                 logger.warning(f"Attempt {attempt + 1} failed, retrying...")
@@ -481,8 +522,8 @@ class OmekaClient:
                 }
                 items_data.append(item_data)
             
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(items_data, f, ensure_ascii=False, indent=2)
+            with open(file_path, 'wb') as f:
+                f.write(json_codec.dumps_indented(items_data))
                 
             logger.info(f"Successfully saved {len(items)} items to {file_path}")
         except Exception as e:
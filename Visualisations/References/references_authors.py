@@ -1,4 +1,3 @@
-import requests
 from collections import defaultdict
 from tqdm import tqdm
 import plotly.graph_objects as go
@@ -6,6 +5,11 @@ import os
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 import logging
+import sys
+
+# API responses can be recorded into or replayed from a snapshot, see Metadata/api_snapshot.py
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Metadata'))
+import api_snapshot
 
 # API URL and item set identifiers
 @dataclass
@@ -50,7 +54,7 @@ class APIClient:
         pbar = tqdm(total=total_pages, desc=f"Fetching items for ID {item_set_id}")
         
         while page <= total_pages:
-            response = requests.get(
+            response = api_snapshot.get(
                 f"{self.api_url}/items",
                 params={"item_set_id": item_set_id, "page": page, "per_page": 50}
             )
@@ -78,7 +82,7 @@ class APIClient:
             "property[0][type]": "eq",
             "property[0][text]": author_name
         }
-        response = requests.get(f"{self.api_url}/items", params=params)
+        response = api_snapshot.get(f"{self.api_url}/items", params=params)
         data = response.json()
         return data[0].get('o:id') if data else None
 
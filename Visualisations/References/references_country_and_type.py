@@ -1,8 +1,13 @@
-import requests
 from collections import defaultdict
 import plotly.express as px
 from tqdm import tqdm
 from typing import Dict, List, Any, Tuple, Set
+import os
+import sys
+
+# API responses can be recorded into or replayed from a snapshot, see Metadata/api_snapshot.py
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Metadata'))
+import api_snapshot
 
 API_URL = "https://islam.zmo.de/api"
 ITEM_SET_IDS = [2193, 2212, 2217, 2222, 2225, 2228]
@@ -24,7 +29,7 @@ FRENCH_LABELS = {
 def fetch_resource_class_labels() -> Dict[int, Dict[str, str]]:
     labels = {}
     for class_id in RESOURCE_CLASSES:
-        response = requests.get(f"{API_URL}/resource_classes/{class_id}")
+        response = api_snapshot.get(f"{API_URL}/resource_classes/{class_id}")
         if response.status_code == 200:
             class_data = response.json()
             labels[class_id] = {
@@ -42,7 +47,7 @@ def fetch_items() -> Tuple[List[Dict[str, Any]], int]:
     for item_set_id in tqdm(ITEM_SET_IDS, desc="Fetching items from all sets"):
         page = 1
         while True:
-            response = requests.get(f"{API_URL}/items",
+            response = api_snapshot.get(f"{API_URL}/items",
                                     params={"item_set_id": item_set_id, "page": page, "per_page": 50})
             if response.status_code != 200:
                 break
@@ -61,7 +66,7 @@ def fetch_items() -> Tuple[List[Dict[str, Any]], int]:
 def get_countries_for_item_sets() -> Dict[int, str]:
     countries = {}
     for item_set_id in ITEM_SET_IDS:
-        response = requests.get(f"{API_URL}/item_sets/{item_set_id}")
+        response = api_snapshot.get(f"{API_URL}/item_sets/{item_set_id}")
         if response.status_code == 200:
             item_set_data = response.json()
             country = item_set_data.get('dcterms:spatial', [{}])[0].get('display_title', 'Unknown')
@@ -1,9 +1,14 @@
-import requests
 from collections import defaultdict
 import plotly.express as px
 from tqdm import tqdm
 import pandas as pd
 from typing import Dict, List, Any
+import os
+import sys
+
+# API responses can be recorded into or replayed from a snapshot, see Metadata/api_snapshot.py
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Metadata'))
+import api_snapshot
 
 API_URL = "https://islam.zmo.de/api"
 ITEM_SET_IDS = [2193, 2212, 2217, 2222, 2225, 2228]
@@ -24,7 +29,7 @@ FRENCH_LABELS = {
 def fetch_resource_class_labels() -> Dict[int, Dict[str, str]]:
     labels = {}
     for class_id in RESOURCE_CLASSES:
-        response = requests.get(f"{API_URL}/resource_classes/{class_id}")
+        response = api_snapshot.get(f"{API_URL}/resource_classes/{class_id}")
         if response.status_code == 200:
             class_data = response.json()
             labels[class_id] = {
@@ -39,7 +44,7 @@ def fetch_items(item_set_id: int, seen_ids: set) -> List[Dict[str, Any]]:
     items = []
     page = 1
     while True:
-        response = requests.get(f"{API_URL}/items", params={"item_set_id": item_set_id, "page": page, "per_page": 50})
+        response = api_snapshot.get(f"{API_URL}/items", params={"item_set_id": item_set_id, "page": page, "per_page": 50})
         if response.status_code != 200:
             break
         data = response.json()
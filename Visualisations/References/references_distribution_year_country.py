@@ -1,8 +1,12 @@
-import requests
 import plotly.graph_objects as go
 from collections import defaultdict, OrderedDict
 from tqdm import tqdm
 import os
+import sys
+
+# API responses can be recorded into or replayed from a snapshot, see Metadata/api_snapshot.py
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Metadata'))
+import api_snapshot
 
 api_url = "https://islam.zmo.de/api"
 item_set_id = 2193
@@ -32,7 +36,7 @@ def fetch_items(item_set_id):
     total_pages = 1
     pbar = tqdm(total=total_pages, desc=f"Fetching items for ID {item_set_id}")
     while page <= total_pages:
-        response = requests.get(f"{api_url}/items", params={"item_set_id": item_set_id, "page": page, "per_page": 50})
+        response = api_snapshot.get(f"{api_url}/items", params={"item_set_id": item_set_id, "page": page, "per_page": 50})
         data = response.json()
         if not data:
             break
@@ -1,8 +1,13 @@
-import requests
 from collections import defaultdict
 from tqdm import tqdm
 import plotly.graph_objs as go
 import networkx as nx
+import os
+import sys
+
+# API responses can be recorded into or replayed from a snapshot, see Metadata/api_snapshot.py
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Metadata'))
+import api_snapshot
 
 # API URL and item set identifiers
 api_url = "https://iwac.frederickmadore.com/api"
@@ -22,7 +27,7 @@ def fetch_items(item_set_id):
     total_pages = 1  # Initially assumed to be 1
     pbar = tqdm(total=total_pages, desc=f"Fetching items for ID {item_set_id}")
     while page <= total_pages:
-        response = requests.get(f"{api_url}/items", params={"item_set_id": item_set_id, "page": page, "per_page": 50})
+        response = api_snapshot.get(f"{api_url}/items", params={"item_set_id": item_set_id, "page": page, "per_page": 50})
         data = response.json()
         if not data:
             break